@@ -3,12 +3,15 @@
 This package provides the core orchestration components for H-Conductor:
 - Task queue models and validation
 - Git worktree isolation for safe worker execution
+- Serialized merge queue for parallel workers
+- Worker mode for multi-node fleets (local mirror, push to coordinator)
 - Disk space safety checks
 - Logging configuration
 - DNA drift check (NorthStar traceability validation)
 - Proxy configuration for model hierarchy
 - Prompt templates for model interactions
 - Model dispatcher for routing tasks to appropriate proxies
+- Execution simulator for sizing parallelism
 """
 
 __version__ = "0.1.0"
@@ -34,7 +37,7 @@ from orchestrator.dispatcher import (
 from orchestrator.models import TaskModel, QueueModel, TaskStatus
 from orchestrator.validator import validate_queue
 from orchestrator.logging_config import setup_logging
-from orchestrator.disk_check import check_disk_space, DiskSpaceError
+from orchestrator.disk_check import check_disk_space, DiskBudget, DiskSpaceError
 from orchestrator.worktree import (
     WorktreeManager,
     WorktreeCreateError,
@@ -45,6 +48,13 @@ from orchestrator.worktree import (
     cleanup_orphaned_worktrees,
     startup_recovery,
 )
+from orchestrator.worktree_pool import WorktreePool
+from orchestrator.reaper import WorktreeReaper
+from orchestrator.cow_clone import CowCloner
+from orchestrator.worktree_registry import WorktreeRecord, WorktreeRegistry
+from orchestrator.git_plumbing import GitCommandError, GitSession, MergeTreeResult, fork_count
+from orchestrator.merge_queue import MergeQueue, MergeRequest
+from orchestrator.fleet import FleetMirror, FleetWorktreeManager
 from orchestrator.dna_check import (
     parse_northstar,
     normalize_goal,
@@ -61,7 +71,17 @@ from orchestrator.pytest_runner import (
     PytestRunner,
     PytestResult,
     TestStatus,
+    TestOutcome,
+    TestCaseResult,
+    parse_junit_xml,
+    ForkServer,
+    ForkServerError,
+    OutputLimits,
+    merge_results,
 )
+from orchestrator.regression import ImportGraph, RegressionRunner, RegressionResult
+from orchestrator.result_cache import ResultCache, CacheStats
+from orchestrator.sandbox import ResourceLimits, ResourceUsage, CgroupSandbox
 from orchestrator.tdd_cycle import (
     TDDCycle,
     CycleState,
@@ -74,6 +94,7 @@ from orchestrator.tdd_cycle import (
     InvalidTransitionError,
     InvalidTestError,
     NeedsRetryError,
+    PreflightError,
     DispatchError,
     MaxRetriesExceeded,
 )
@@ -84,6 +105,13 @@ from orchestrator.validate_test import (
     ValidationResult,
     TestValidator,
 )
+from orchestrator.preflight import preflight, PreflightResult
+from orchestrator.refactor_policy import (
+    RefactorDecision,
+    RefactorOutcome,
+    RefactorPolicy,
+    RefactorStats,
+)
 from orchestrator.qa_agent import (
     QAAgent,
     ReviewResult,
@@ -100,6 +128,9 @@ from orchestrator.memory_agent import (
 )
 from orchestrator.task_selector import TaskSelector
 from orchestrator.queue_manager import QueueManager
+from orchestrator.tracing import Span, Tracer, get_tracer, set_tracer, task_context
+from orchestrator.cancellation import CancellationToken, OperationCancelled, current_token
+from orchestrator.checkpoint import CheckpointStore, PipelineCheckpoint
 from orchestrator.execution import (
     ExecutionContext,
     ExecutionResult,
@@ -114,6 +145,14 @@ from orchestrator.execution import (
     stage_cleanup,
     StageError,
 )
+from orchestrator.simulator import (
+    LatencyModel,
+    SimulationReport,
+    SimulationResult,
+    Simulator,
+    StageLatency,
+    simulate,
+)
 from orchestrator.cli import (
     cli_main,
     status_command,
@@ -152,6 +191,7 @@ __all__ = [
     "setup_logging",
     # Disk check
     "check_disk_space",
+    "DiskBudget",
     "DiskSpaceError",
     # Worktree management
     "WorktreeManager",
@@ -162,6 +202,21 @@ __all__ = [
     "find_orphaned_worktrees",
     "cleanup_orphaned_worktrees",
     "startup_recovery",
+    "WorktreePool",
+    "WorktreeReaper",
+    "CowCloner",
+    "WorktreeRecord",
+    "WorktreeRegistry",
+    # Merge queue (git plumbing)
+    "GitCommandError",
+    "GitSession",
+    "fork_count",
+    "MergeTreeResult",
+    "MergeQueue",
+    "MergeRequest",
+    # Multi-node worker fleet
+    "FleetMirror",
+    "FleetWorktreeManager",
     # DNA drift check
     "parse_northstar",
     "normalize_goal",
@@ -177,6 +232,21 @@ __all__ = [
     "PytestRunner",
     "PytestResult",
     "TestStatus",
+    "TestOutcome",
+    "TestCaseResult",
+    "parse_junit_xml",
+    "ForkServer",
+    "ForkServerError",
+    "OutputLimits",
+    "merge_results",
+    "ImportGraph",
+    "RegressionRunner",
+    "RegressionResult",
+    "ResultCache",
+    "CacheStats",
+    "ResourceLimits",
+    "ResourceUsage",
+    "CgroupSandbox",
     # TDDCycle (T003-T009)
     "TDDCycle",
     "CycleState",
@@ -189,6 +259,7 @@ __all__ = [
     "InvalidTransitionError",
     "InvalidTestError",
     "NeedsRetryError",
+    "PreflightError",
     "DispatchError",
     "MaxRetriesExceeded",
     # RetryPolicy (T007)
@@ -200,6 +271,12 @@ __all__ = [
     "validate",
     "ValidationResult",
     "TestValidator",
+    "preflight",
+    "PreflightResult",
+    "RefactorPolicy",
+    "RefactorDecision",
+    "RefactorOutcome",
+    "RefactorStats",
     # QA Agent (PHASE-007)
     "QAAgent",
     "ReviewResult",
@@ -227,6 +304,25 @@ __all__ = [
     "stage_update_memory",
     "stage_cleanup",
     "StageError",
+    "CheckpointStore",
+    "PipelineCheckpoint",
+    # Tracing
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "set_tracer",
+    "task_context",
+    # Cancellation
+    "CancellationToken",
+    "OperationCancelled",
+    "current_token",
+    # Simulator
+    "LatencyModel",
+    "SimulationReport",
+    "SimulationResult",
+    "Simulator",
+    "StageLatency",
+    "simulate",
     # CLI (PHASE-010)
     "cli_main",
     "status_command",
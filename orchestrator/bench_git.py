@@ -0,0 +1,164 @@
+"""Benchmark of the git command layer used by WorktreeManager.
+
+Runs the create -> commit -> merge -> cleanup lifecycle for a number of
+tasks in a scratch repository and reports the git processes started
+(fork_count()) and wall time per phase. The lifecycle runs twice:
+
+- batched: WorktreeManager as shipped (GitSession: branch lookups through
+  a long-lived cat-file process, one update-ref --stdin transaction to
+  delete a task's branches)
+- per-command: the same lifecycle with `git rev-parse` for the committed
+  tip, one `git branch --list` plus one `git branch -D` per branch, as
+  before GitSession existed
+
+Usage:
+    python -m orchestrator.bench_git --tasks 100
+    python -m orchestrator.bench_git --tasks 100 --files 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from orchestrator.git_plumbing import fork_count, reset_fork_count, run_git
+from orchestrator.worktree import WorktreeManager
+
+PHASES = ("create", "commit", "merge", "cleanup")
+
+# Identity for the scratch repository's commits
+_GIT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "hc-bench",
+    "GIT_AUTHOR_EMAIL": "hc-bench@localhost",
+    "GIT_COMMITTER_NAME": "hc-bench",
+    "GIT_COMMITTER_EMAIL": "hc-bench@localhost",
+}
+
+
+class PerCommandWorktreeManager(WorktreeManager):
+    """WorktreeManager that runs one git process per ref lookup or deletion."""
+
+    def _branch_tip(self, task_id: str, worktree_path: Path) -> Optional[str]:
+        head = run_git(worktree_path, ["rev-parse", "HEAD"], check=False)
+        return head.stdout.strip() or None
+
+    def _delete_task_branches(self, task_id: str) -> None:
+        result = run_git(
+            self.repo_path,
+            ["branch", "--list", f"feature/{task_id}_attempt_*"],
+            check=False,
+        )
+        for branch in result.stdout.strip().split("\n"):
+            branch = branch.strip()
+            if branch:
+                run_git(self.repo_path, ["branch", "-D", branch], check=False)
+
+
+def _make_repo(path: Path, files: int) -> None:
+    """Create a scratch repository with the given number of tracked files."""
+    run_git(path.parent, ["init", "--quiet", "-b", "main", str(path)])
+    for i in range(files):
+        package = path / f"pkg{i // 100}"
+        package.mkdir(exist_ok=True)
+        (package / f"mod{i}.py").write_text(f"VALUE = {i}\n")
+    run_git(path, ["add", "-A"])
+    run_git(path, ["commit", "--quiet", "-m", "initial"])
+
+
+def run_lifecycle(manager: WorktreeManager, tasks: int) -> dict[str, tuple[int, float]]:
+    """Run create/commit/merge/cleanup for each task.
+
+    merge() cleans up after a successful merge, so the cleanup phase only
+    does work for tasks whose merge failed.
+
+    Args:
+        manager: WorktreeManager to exercise.
+        tasks: Number of tasks.
+
+    Returns:
+        Dict of phase -> (git processes started, seconds).
+    """
+    totals = {phase: [0, 0.0] for phase in PHASES}
+
+    def timed(phase: str, fn, *args, **kwargs):
+        forks = fork_count()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        totals[phase][0] += fork_count() - forks
+        totals[phase][1] += time.perf_counter() - start
+        return result
+
+    for i in range(tasks):
+        task_id = f"BENCH{i:04d}"
+        worktree = Path(timed("create", manager.create, task_id))
+        (worktree / f"task_{i}.py").write_text(f"RESULT = {i}\n")
+        timed("commit", manager.commit_changes, task_id, f"{task_id}: bench")
+        timed("merge", manager.merge, task_id)
+        timed("cleanup", manager.cleanup, task_id)
+
+    return {phase: (forks, seconds) for phase, (forks, seconds) in totals.items()}
+
+
+def run_benchmark(tasks: int = 100, files: int = 200, workdir: Optional[str] = None) -> dict:
+    """Run the lifecycle with both managers in fresh scratch repositories.
+
+    Args:
+        tasks: Number of tasks per run.
+        files: Tracked files in the scratch repository.
+        workdir: Directory for scratch repositories (default: a temp dir).
+
+    Returns:
+        Dict of variant name -> phase results (see run_lifecycle()).
+    """
+    os.environ.update(_GIT_IDENTITY)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=workdir, prefix="hc_bench_") as tmp:
+        for name, cls in (("per-command", PerCommandWorktreeManager), ("batched", WorktreeManager)):
+            root = Path(tmp) / name
+            root.mkdir()
+            repo = root / "repo"
+            _make_repo(repo, files)
+            manager = cls(str(repo), worktree_base=str(root), disk_threshold=100.0)
+            reset_fork_count()
+            try:
+                results[name] = run_lifecycle(manager, tasks)
+            finally:
+                manager.close()
+    return results
+
+
+def format_results(results: dict, tasks: int) -> str:
+    """Format benchmark results as a table."""
+    lines = [f"{'variant':<12} {'phase':<8} {'forks':>7} {'per task':>9} {'seconds':>9}"]
+    for name, phases in results.items():
+        total_forks = sum(forks for forks, _ in phases.values())
+        total_seconds = sum(seconds for _, seconds in phases.values())
+        for phase, (forks, seconds) in phases.items():
+            lines.append(
+                f"{name:<12} {phase:<8} {forks:>7} {forks / tasks:>9.1f} {seconds:>9.2f}"
+            )
+        lines.append(
+            f"{name:<12} {'total':<8} {total_forks:>7} {total_forks / tasks:>9.1f} "
+            f"{total_seconds:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the git command layer")
+    parser.add_argument("--tasks", type=int, default=100, help="Tasks per run")
+    parser.add_argument("--files", type=int, default=200, help="Files in the scratch repo")
+    parser.add_argument("--workdir", help="Directory for scratch repositories")
+    parsed = parser.parse_args(args)
+
+    results = run_benchmark(parsed.tasks, parsed.files, parsed.workdir)
+    print(format_results(results, parsed.tasks))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
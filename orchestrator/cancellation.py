@@ -0,0 +1,208 @@
+"""Deadlines and cooperative cancellation for pipeline work.
+
+This module provides the CancellationToken class which carries a deadline
+and an explicit cancel flag through blocking operations:
+- ModelDispatcher bounds each HTTP attempt and backoff by the remaining time
+- PytestRunner kills the test process when the token fires
+- Git subprocesses (worktree operations, merges) refuse to start or are
+  killed once the token has fired
+
+Tokens form a tree: a per-stage token is a child of the per-task token,
+so it fires at whichever deadline comes first or when the task is
+cancelled explicitly.
+
+Code deep in the call stack picks up the active token through
+current_token(), so it does not need to be threaded through every
+signature. TaskPipeline activates the token only while a stage runs, so
+cleanup is never blocked by an expired deadline.
+
+Example:
+    token = CancellationToken(timeout=600, name="task T001")
+    with token.child(timeout=120, name="stage tdd").activate():
+        run_stage()
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+_current_token: contextvars.ContextVar[Optional["CancellationToken"]] = (
+    contextvars.ContextVar("hc_cancel_token", default=None)
+)
+
+# Polling interval used while waiting on a token with a parent
+_POLL_INTERVAL = 0.05
+
+
+class OperationCancelled(Exception):
+    """Raised when work is aborted because its token fired.
+
+    Attributes:
+        reason: Why the token fired (deadline name or explicit reason).
+    """
+
+    def __init__(self, reason: str) -> None:
+        self.reason = reason
+        super().__init__(reason)
+
+
+class CancellationToken:
+    """A cancel flag with an optional deadline and parent token.
+
+    Attributes:
+        name: Label used in cancellation reasons (e.g. 'stage tdd').
+        deadline: Monotonic time after which the token counts as cancelled,
+            or None for no deadline of its own.
+        parent: Token whose cancellation also cancels this one.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        parent: Optional["CancellationToken"] = None,
+        name: str = "operation",
+    ) -> None:
+        """Initialize CancellationToken.
+
+        Args:
+            timeout: Seconds from now until the deadline (None for no deadline).
+            parent: Optional parent token.
+            name: Label for cancellation reasons.
+        """
+        self.name = name
+        self.parent = parent
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._event = threading.Event()
+        self._reason: Optional[str] = None
+
+    def cancel(self, reason: Optional[str] = None) -> None:
+        """Cancel the token (and therefore all of its children).
+
+        Args:
+            reason: Optional description of why work was cancelled.
+        """
+        self._reason = reason or f"{self.name} cancelled"
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token, its deadline, or any ancestor has fired."""
+        return self.reason is not None
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the token fired, or None if it has not."""
+        if self._event.is_set():
+            return self._reason
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return f"{self.name} exceeded its deadline"
+        if self.parent is not None:
+            return self.parent.reason
+        return None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the nearest deadline in the chain.
+
+        Returns:
+            Remaining seconds (never negative), or None if unbounded.
+        """
+        remaining = None
+        if self.deadline is not None:
+            remaining = max(0.0, self.deadline - time.monotonic())
+        if self.parent is not None:
+            parent_remaining = self.parent.remaining()
+            if parent_remaining is not None:
+                remaining = (
+                    parent_remaining if remaining is None else min(remaining, parent_remaining)
+                )
+        return remaining
+
+    def bound(self, timeout: Optional[float]) -> Optional[float]:
+        """Clamp a timeout to the time remaining on the token.
+
+        Args:
+            timeout: Requested timeout in seconds (None for unbounded).
+
+        Returns:
+            The smaller of timeout and remaining(), or None if both unbounded.
+        """
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise OperationCancelled if the token has fired."""
+        reason = self.reason
+        if reason is not None:
+            raise OperationCancelled(reason)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep for up to the given time, waking early on cancellation.
+
+        Args:
+            seconds: Maximum time to sleep.
+
+        Returns:
+            True if the token fired, False if the full time elapsed.
+        """
+        end = time.monotonic() + seconds
+        while not self.cancelled:
+            left = end - time.monotonic()
+            if left <= 0:
+                return False
+            remaining = self.remaining()
+            step = min(left, _POLL_INTERVAL if self.parent else left)
+            if remaining is not None:
+                step = min(step, remaining)
+            self._event.wait(step)
+        return True
+
+    def child(self, timeout: Optional[float] = None, name: str = "operation") -> "CancellationToken":
+        """Create a child token with its own (optional) deadline.
+
+        Args:
+            timeout: Seconds until the child's own deadline.
+            name: Label for the child.
+
+        Returns:
+            New CancellationToken that also fires when this one does.
+        """
+        return CancellationToken(timeout=timeout, parent=self, name=name)
+
+    @contextmanager
+    def activate(self) -> Iterator["CancellationToken"]:
+        """Make this the current token for code running inside the block."""
+        reset = _current_token.set(self)
+        try:
+            yield self
+        finally:
+            _current_token.reset(reset)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Get the token activated by the enclosing pipeline stage, if any."""
+    return _current_token.get()
+
+
+def sleep(seconds: float, token: Optional[CancellationToken] = None) -> None:
+    """Sleep that aborts early when the (current) token fires.
+
+    Args:
+        seconds: Time to sleep.
+        token: Token to honour (defaults to current_token()).
+
+    Raises:
+        OperationCancelled: If the token fires before or during the sleep.
+    """
+    token = token or current_token()
+    if token is None:
+        time.sleep(seconds)
+        return
+    token.raise_if_cancelled()
+    if token.wait(seconds):
+        token.raise_if_cancelled()
@@ -0,0 +1,213 @@
+"""Per-task pipeline checkpoints for crash recovery.
+
+This module provides the PipelineCheckpoint dataclass and the
+CheckpointStore which persists it as one small JSON file per task.
+
+TaskPipeline records a checkpoint after every completed stage. If the
+orchestrator dies mid-task, startup recovery keeps the task's worktree
+and the pipeline resumes from the last completed stage instead of
+regenerating RED/GREEN work through the proxies.
+
+Stage order:
+    worktree -> red -> green -> tdd -> regression -> qa -> dna -> merge
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from orchestrator.tdd_cycle import (
+    CycleResult,
+    CycleState,
+    GreenResult,
+    RedResult,
+    RefactorResult,
+)
+
+logger = logging.getLogger(__name__)
+
+# Checkpointed stages, in pipeline order
+CHECKPOINT_STAGES: tuple[str, ...] = (
+    "worktree", "red", "green", "tdd", "regression", "qa", "dna", "merge"
+)
+
+
+@dataclass
+class PipelineCheckpoint:
+    """Progress of one task through the pipeline.
+
+    Attributes:
+        task_id: ID of the task.
+        stage: Last stage that completed (one of CHECKPOINT_STAGES).
+        worktree_path: Path to the task's worktree.
+        branch_name: Git branch name for the task.
+        target_file: Implementation file the TDD cycle targets.
+        red_result: RED phase result (once 'red' completed).
+        green_result: GREEN phase result (once 'green' completed).
+        cycle_result: Full TDD cycle result (once 'tdd' completed).
+        updated_at: ISO timestamp of the last save.
+    """
+
+    task_id: str
+    stage: str
+    worktree_path: Optional[str] = None
+    branch_name: str = ""
+    target_file: Optional[str] = None
+    red_result: Optional[RedResult] = None
+    green_result: Optional[GreenResult] = None
+    cycle_result: Optional[CycleResult] = None
+    updated_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+    @property
+    def test_path(self) -> Optional[str]:
+        """Path to the generated test file, if RED completed."""
+        return self.red_result.test_path if self.red_result else None
+
+    @property
+    def impl_path(self) -> Optional[str]:
+        """Path to the implementation file, if GREEN completed."""
+        return self.green_result.impl_path if self.green_result else None
+
+    def reached(self, stage: str) -> bool:
+        """Check whether a stage has already completed.
+
+        Args:
+            stage: Stage name from CHECKPOINT_STAGES.
+
+        Returns:
+            True if the checkpoint is at or past the given stage.
+        """
+        return CHECKPOINT_STAGES.index(self.stage) >= CHECKPOINT_STAGES.index(stage)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        data = asdict(self)
+        # GreenResult.pytest_result is only kept in memory
+        cycle = data.get("cycle_result") or {}
+        for green in (data.get("green_result"), cycle.get("green_result")):
+            if green:
+                green.pop("pytest_result", None)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "PipelineCheckpoint":
+        """Create a checkpoint from a dictionary produced by to_dict()."""
+        red = data.get("red_result")
+        green = data.get("green_result")
+        cycle = data.get("cycle_result")
+
+        cycle_result = None
+        if cycle:
+            refactor = cycle.get("refactor_result")
+            cycle_result = CycleResult(
+                state=CycleState(cycle["state"]),
+                red_result=RedResult(**cycle["red_result"]) if cycle.get("red_result") else None,
+                green_result=GreenResult(**cycle["green_result"]) if cycle.get("green_result") else None,
+                refactor_result=RefactorResult(**refactor) if refactor else None,
+                retry_count=cycle.get("retry_count", 0),
+                failure_reason=cycle.get("failure_reason"),
+            )
+
+        return cls(
+            task_id=data["task_id"],
+            stage=data["stage"],
+            worktree_path=data.get("worktree_path"),
+            branch_name=data.get("branch_name", ""),
+            target_file=data.get("target_file"),
+            red_result=RedResult(**red) if red else None,
+            green_result=GreenResult(**green) if green else None,
+            cycle_result=cycle_result,
+            updated_at=data.get("updated_at", ""),
+        )
+
+
+class CheckpointStore:
+    """Persists PipelineCheckpoints as JSON files in a directory.
+
+    Writes are atomic (temp file + os.replace), so a crash mid-save leaves
+    the previous checkpoint intact.
+
+    Example:
+        store = CheckpointStore(".hc/checkpoints")
+        store.save(PipelineCheckpoint(task_id="T001", stage="worktree"))
+        checkpoint = store.load("T001")
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize CheckpointStore.
+
+        Args:
+            directory: Directory holding checkpoint files (created if missing).
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, task_id: str) -> Path:
+        """Get the checkpoint file path for a task."""
+        return self.directory / f"{task_id}.json"
+
+    def save(self, checkpoint: PipelineCheckpoint) -> None:
+        """Persist a checkpoint, replacing any previous one for the task.
+
+        Args:
+            checkpoint: Checkpoint to save.
+        """
+        checkpoint.updated_at = datetime.now(timezone.utc).isoformat()
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            dir=self.directory,
+            suffix=".tmp",
+            delete=False,
+        ) as tmp_file:
+            json.dump(checkpoint.to_dict(), tmp_file, indent=2)
+            tmp_path = tmp_file.name
+        os.replace(tmp_path, self._path(checkpoint.task_id))
+        logger.debug(f"Checkpoint saved for '{checkpoint.task_id}' at stage '{checkpoint.stage}'")
+
+    def load(self, task_id: str) -> Optional[PipelineCheckpoint]:
+        """Load the checkpoint for a task.
+
+        Args:
+            task_id: Task identifier.
+
+        Returns:
+            PipelineCheckpoint, or None if missing or unreadable.
+        """
+        path = self._path(task_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                return PipelineCheckpoint.from_dict(json.load(f))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {e}")
+            return None
+
+    def delete(self, task_id: str) -> None:
+        """Remove the checkpoint for a task (idempotent).
+
+        Args:
+            task_id: Task identifier.
+        """
+        self._path(task_id).unlink(missing_ok=True)
+
+    def list(self) -> list[PipelineCheckpoint]:
+        """Load all readable checkpoints in the store.
+
+        Returns:
+            List of checkpoints, ordered by task ID.
+        """
+        checkpoints = []
+        for path in sorted(self.directory.glob("*.json")):
+            checkpoint = self.load(path.stem)
+            if checkpoint is not None:
+                checkpoints.append(checkpoint)
+        return checkpoints
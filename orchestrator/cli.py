@@ -4,6 +4,7 @@ Provides unified CLI interface for H-Conductor operations:
 - hc status: Show queue status summary
 - hc queue: Manage task queue
 - hc run: Execute orchestration loop
+- hc simulate: Project makespan/utilisation for a queue without executing
 - hc scan: Scan NORTHSTAR for activated items (HD Interface)
 - hc validate: Validate file against Definition of Ready (HD Interface)
 - hc inbox: Display INBOX.md contents (HD Interface)
@@ -12,6 +13,7 @@ Usage:
     python -m orchestrator.cli status --queue queue.json
     python -m orchestrator.cli queue list --queue queue.json
     python -m orchestrator.cli run --queue queue.json
+    python -m orchestrator.cli simulate --queue queue.json --workers 4 --trace trace.json
     python -m orchestrator.cli scan --northstar .claude/PM/SSoT/NORTHSTAR.md
 """
 
@@ -355,6 +357,49 @@ def _validate_queue_command(queue_path: str, output_path: Optional[str] = None)
     return 0 if result.blocked_count == 0 and result.error_count == 0 else 1
 
 
+def _simulate_command(parsed: argparse.Namespace) -> int:
+    """Run the execution simulator and print its report.
+
+    Args:
+        parsed: Parsed 'simulate' arguments.
+
+    Returns:
+        Exit code: 0 (success), 1 (error).
+    """
+    from orchestrator.simulator import LatencyModel, format_report, simulate
+
+    if not Path(parsed.queue).exists():
+        print(f"Error: Queue file not found: {parsed.queue}")
+        return 1
+
+    try:
+        if parsed.trace:
+            latency = LatencyModel.from_trace(*parsed.trace)
+        elif parsed.latency:
+            latency = LatencyModel.from_file(parsed.latency)
+        else:
+            latency = LatencyModel()
+        if parsed.conflict_rate is not None:
+            latency.conflict_rate = parsed.conflict_rate
+
+        report = simulate(
+            parsed.queue,
+            latency,
+            workers=parsed.workers,
+            rate_limit=parsed.rate_limit,
+            merge_policy=parsed.merge_policy,
+            runs=parsed.runs,
+            seed=parsed.seed,
+            qa=not parsed.no_qa,
+        )
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(format_report(report))
+    return 0
+
+
 def cli_main(args: Optional[list[str]] = None) -> int:
     """Unified CLI entry point for H-Conductor.
 
@@ -455,6 +500,66 @@ def cli_main(args: Optional[list[str]] = None) -> int:
         help="Skip ticket validation entirely",
     )
 
+    # simulate command (execution dry-run with modelled latencies)
+    simulate_parser = subparsers.add_parser(
+        "simulate",
+        help="Project makespan, utilisation and critical path for a queue",
+    )
+    simulate_parser.add_argument(
+        "--queue", "-q",
+        default="queue.json",
+        help="Path to queue.json file",
+    )
+    simulate_parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=1,
+        help="Number of parallel workers",
+    )
+    simulate_parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Model calls per minute across all workers (default: unlimited)",
+    )
+    simulate_parser.add_argument(
+        "--merge-policy",
+        choices=["queue", "concurrent"],
+        default="queue",
+        help="Serialized merge queue or concurrent merges",
+    )
+    simulate_parser.add_argument(
+        "--conflict-rate",
+        type=float,
+        help="Probability that a merge conflicts with each task merged since "
+        "its worktree was created (overrides the latency model)",
+    )
+    latency_group = simulate_parser.add_mutually_exclusive_group()
+    latency_group.add_argument(
+        "--trace",
+        action="append",
+        help="Trace file (HC_TRACE_FILE) to derive latencies from (repeatable)",
+    )
+    latency_group.add_argument(
+        "--latency",
+        help="JSON file with configured stage latencies",
+    )
+    simulate_parser.add_argument(
+        "--runs",
+        type=int,
+        default=20,
+        help="Number of Monte Carlo runs",
+    )
+    simulate_parser.add_argument(
+        "--seed",
+        type=int,
+        help="Random seed for reproducible results",
+    )
+    simulate_parser.add_argument(
+        "--no-qa",
+        action="store_true",
+        help="Simulate without the QA review stage",
+    )
+
     # validate-queue command (batch ticket validation)
     validate_queue_parser = subparsers.add_parser(
         "validate-queue",
@@ -528,6 +633,9 @@ def cli_main(args: Optional[list[str]] = None) -> int:
 
         return run_main(run_args)
 
+    elif parsed.command == "simulate":
+        return _simulate_command(parsed)
+
     elif parsed.command == "validate-queue":
         return _validate_queue_command(parsed.queue, parsed.output)
 
@@ -0,0 +1,367 @@
+"""Copy-on-write worktree cloning from pristine template checkouts.
+
+This module provides the CowCloner class which lets WorktreeManager.create
+materialise a task worktree without writing the repository's files:
+
+- a template is a regular detached worktree checked out at a commit
+  ({template_base}/hc_template_{oid}); it is never modified while in use
+- reflink strategy: the template's files are copied with
+  `cp --reflink=always`, so the clone shares the template's data blocks
+  (btrfs, XFS, bcachefs, ...)
+- overlay strategy: the worktree is an overlay mount with the template as
+  read-only lower layer and a per-task upper directory receiving all
+  writes (fuse-overlayfs when installed, the kernel overlay driver when
+  running as root)
+
+The new worktree is registered with `git worktree add --no-checkout` and
+gets a copy of the template's index, so git sees a checked-out tree.
+Either way creation costs a constant number of operations plus, for
+reflinks, one metadata clone per file; the disk footprint is only what
+the task writes.
+
+When the target head moves, the next clone builds a template for the new
+commit from the previous one (hardlinked files plus an incremental
+`git checkout`). Templates no longer current are removed once no overlay
+uses them.
+
+Strategies are probed once: 'auto' picks reflink if the template base
+supports it, else overlay if available, else none. With 'none' (or on
+any failure) clone() returns False and the caller falls back to a plain
+`git worktree add`.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from orchestrator.git_plumbing import GitCommandError, GitSession, run_git
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_PREFIX = "hc_template_"
+
+COW_STRATEGIES: tuple[str, ...] = ("auto", "reflink", "overlay", "none")
+
+# Suffixes of the per-task overlay directories next to the worktree
+_UPPER_SUFFIX = ".hc_upper"
+_WORK_SUFFIX = ".hc_work"
+
+
+def reflink_supported(directory: str) -> bool:
+    """Check whether files in a directory can be cloned with reflinks.
+
+    Args:
+        directory: Directory on the filesystem to probe.
+
+    Returns:
+        True if `cp --reflink=always` works there.
+    """
+    if shutil.which("cp") is None:
+        return False
+    try:
+        with tempfile.TemporaryDirectory(dir=directory, prefix=".hc_reflink_") as tmp:
+            source = Path(tmp) / "probe"
+            source.write_bytes(b"reflink probe\n")
+            result = subprocess.run(
+                ["cp", "--reflink=always", str(source), str(Path(tmp) / "clone")],
+                capture_output=True,
+            )
+            return result.returncode == 0
+    except OSError:
+        return False
+
+
+def overlay_driver() -> Optional[str]:
+    """Find a usable overlay implementation.
+
+    Returns:
+        'fuse' if fuse-overlayfs and /dev/fuse are available, 'kernel' if
+        running as root, else None.
+    """
+    if shutil.which("fuse-overlayfs") and os.path.exists("/dev/fuse"):
+        if shutil.which("fusermount3") or shutil.which("fusermount"):
+            return "fuse"
+    if os.geteuid() == 0 and shutil.which("mount") and shutil.which("umount"):
+        return "kernel"
+    return None
+
+
+def _gitdir(worktree: Path) -> Path:
+    """Administrative directory of a linked worktree (from its .git file)."""
+    content = (worktree / ".git").read_text().strip()
+    if not content.startswith("gitdir: "):
+        raise OSError(f"{worktree} is not a linked worktree")
+    gitdir = Path(content[len("gitdir: "):])
+    return gitdir if gitdir.is_absolute() else (worktree / gitdir).resolve()
+
+
+def copy_tree(source: Path, target: Path, cp_args: list[str]) -> None:
+    """Copy the contents of a checkout (except .git) into a directory with cp.
+
+    Args:
+        source: Directory whose entries to copy.
+        target: Existing directory to copy them into.
+        cp_args: cp options (e.g. ['-a', '--reflink=auto'] for a
+            copy-on-write copy where the filesystem supports it).
+
+    Raises:
+        subprocess.CalledProcessError: If cp fails.
+    """
+    entries = [str(p) for p in source.iterdir() if p.name != ".git"]
+    if entries:
+        subprocess.run(
+            ["cp", *cp_args, *entries, str(target)],
+            check=True, capture_output=True, text=True,
+        )
+
+
+class CowCloner:
+    """Creates task worktrees as copy-on-write clones of a template.
+
+    Attributes:
+        repo_path: Path to the main git repository.
+        template_base: Directory holding the template checkouts (for
+            reflinks it must be on the same filesystem as the worktrees).
+        strategy: Resolved strategy: 'reflink', 'overlay' or 'none'.
+    """
+
+    def __init__(
+        self, repo_path: str, template_base: str = "/tmp", strategy: str = "auto"
+    ) -> None:
+        """Initialize CowCloner.
+
+        Args:
+            repo_path: Path to the main git repository.
+            template_base: Directory for template checkouts.
+            strategy: One of COW_STRATEGIES.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+        if strategy not in COW_STRATEGIES:
+            raise ValueError(f"Unknown clone strategy '{strategy}', expected {COW_STRATEGIES}")
+        self.repo_path = Path(repo_path).resolve()
+        self.template_base = Path(template_base)
+        self.template_base.mkdir(parents=True, exist_ok=True)
+
+        self._overlay = overlay_driver()
+        if strategy == "auto":
+            if reflink_supported(str(self.template_base)):
+                strategy = "reflink"
+            elif self._overlay is not None:
+                strategy = "overlay"
+            else:
+                strategy = "none"
+        elif strategy == "reflink" and not reflink_supported(str(self.template_base)):
+            logger.warning(f"Reflinks not supported under {self.template_base}")
+            strategy = "none"
+        elif strategy == "overlay" and self._overlay is None:
+            logger.warning("No overlay filesystem available")
+            strategy = "none"
+        self.strategy = strategy
+
+        self._lock = threading.Lock()
+        self._git = GitSession(self.repo_path)
+        # Template path -> commit, the current template, and overlay users
+        self._templates: dict[Path, str] = {}
+        self._current: Optional[Path] = None
+        self._users: dict[Path, int] = {}
+        # Overlay-mounted worktree -> template it uses
+        self._mounts: dict[Path, Path] = {}
+
+    @property
+    def available(self) -> bool:
+        """Whether clone() can create copy-on-write worktrees."""
+        return self.strategy != "none"
+
+    def owns(self, worktree_path: str | Path) -> bool:
+        """Whether a worktree is overlay-mounted by this cloner."""
+        with self._lock:
+            return Path(os.path.abspath(worktree_path)) in self._mounts
+
+    def clone(self, worktree_path: str | Path, branch_name: str) -> bool:
+        """Create a worktree on a new branch at HEAD from the template.
+
+        Args:
+            worktree_path: Path for the new worktree (must not exist).
+            branch_name: Branch to create at HEAD.
+
+        Returns:
+            True if the worktree was created; False if the caller should
+            create it the regular way (nothing is left behind).
+        """
+        if not self.available:
+            return False
+        path = Path(os.path.abspath(worktree_path))
+        commit = self._git.rev_parse("HEAD")
+        if commit is None:
+            return False
+
+        try:
+            with self._lock:
+                template = self._template(commit)
+                self._users[template] = self._users.get(template, 0) + 1
+        except (GitCommandError, OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Could not prepare template for {commit[:12]}: {e}")
+            return False
+
+        mounted = False
+        try:
+            run_git(
+                self.repo_path,
+                ["worktree", "add", "--quiet", "--no-checkout", "-b", branch_name,
+                 str(path), commit],
+            )
+            shutil.copyfile(_gitdir(template) / "index", _gitdir(path) / "index")
+            if self.strategy == "reflink":
+                copy_tree(template, path, ["-a", "--reflink=always"])
+            else:
+                self._mount(template, path)
+                mounted = True
+        except (GitCommandError, OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"Copy-on-write clone of {path} failed: {e}")
+            self._undo(path, branch_name)
+            return False
+        finally:
+            if not mounted:
+                self._unuse(template)
+
+        logger.info(f"Cloned {path} from template {template.name} ({self.strategy})")
+        return True
+
+    def release(self, worktree_path: str | Path) -> None:
+        """Unmount an overlay worktree, leaving a plain (empty) worktree dir.
+
+        The task's upper layer is dropped; the directory keeps its .git file
+        so it can be removed like any other worktree. No-op for worktrees
+        that are not overlay-mounted.
+
+        Args:
+            worktree_path: Worktree returned by clone().
+        """
+        path = Path(os.path.abspath(worktree_path))
+        with self._lock:
+            template = self._mounts.pop(path, None)
+        if template is None:
+            return
+        self._unmount(path)
+        upper = path.parent / f"{path.name}{_UPPER_SUFFIX}"
+        if (upper / ".git").exists():
+            os.replace(upper / ".git", path / ".git")
+        for directory in (upper, path.parent / f"{path.name}{_WORK_SUFFIX}"):
+            shutil.rmtree(directory, ignore_errors=True)
+        self._unuse(template)
+
+    def close(self) -> None:
+        """Unmount all overlays and remove all templates."""
+        with self._lock:
+            mounted = list(self._mounts)
+        for path in mounted:
+            self.release(path)
+        with self._lock:
+            templates = list(self._templates)
+            self._templates.clear()
+            self._users.clear()
+            self._current = None
+        for template in templates:
+            self._remove_template(template)
+        self._git.close()
+
+    def _template(self, commit: str) -> Path:
+        """Get (building if needed) the template for a commit. Lock held."""
+        if self._current is not None and self._templates.get(self._current) == commit:
+            return self._current
+
+        path = self.template_base / f"{TEMPLATE_PREFIX}{commit[:12]}"
+        if path.exists():
+            # Left behind by a previous run; its state is unknown
+            self._remove_template(path)
+
+        previous = self._current
+        if previous is None:
+            run_git(self.repo_path, ["worktree", "add", "--quiet", "--detach", str(path), commit])
+        else:
+            # Start from the previous template's files and index so that the
+            # checkout only rewrites what changed between the two commits
+            run_git(
+                self.repo_path,
+                ["worktree", "add", "--quiet", "--no-checkout", "--detach", str(path),
+                 self._templates[previous]],
+            )
+            copy_tree(previous, path, ["-al"])
+            shutil.copyfile(_gitdir(previous) / "index", _gitdir(path) / "index")
+            run_git(path, ["checkout", "--quiet", "-f", "--detach", commit])
+
+        self._templates[path] = commit
+        self._current = path
+        if previous is not None:
+            self._retire(previous)
+        return path
+
+    def _unuse(self, template: Path) -> None:
+        """Drop one use of a template and remove it if it is stale."""
+        with self._lock:
+            self._users[template] = max(0, self._users.get(template, 0) - 1)
+            self._retire(template)
+
+    def _retire(self, template: Path) -> None:
+        """Remove a template that is neither current nor in use. Lock held."""
+        if template == self._current or self._users.get(template, 0) > 0:
+            return
+        self._templates.pop(template, None)
+        self._users.pop(template, None)
+        self._remove_template(template)
+
+    def _remove_template(self, template: Path) -> None:
+        """Delete a template checkout and its registration."""
+        result = run_git(
+            self.repo_path, ["worktree", "remove", "--force", str(template)], check=False
+        )
+        if result.returncode != 0 and template.exists():
+            shutil.rmtree(template, ignore_errors=True)
+            run_git(self.repo_path, ["worktree", "prune"], check=False)
+
+    def _mount(self, template: Path, path: Path) -> None:
+        """Mount an overlay of the template at path, keeping path's .git file."""
+        upper = path.parent / f"{path.name}{_UPPER_SUFFIX}"
+        work = path.parent / f"{path.name}{_WORK_SUFFIX}"
+        upper.mkdir()
+        work.mkdir()
+        os.replace(path / ".git", upper / ".git")
+        options = f"lowerdir={template},upperdir={upper},workdir={work}"
+        if self._overlay == "fuse":
+            cmd = ["fuse-overlayfs", "-o", options, str(path)]
+        else:
+            cmd = ["mount", "-t", "overlay", "overlay", "-o", options, str(path)]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True, text=True)
+        except (OSError, subprocess.CalledProcessError):
+            os.replace(upper / ".git", path / ".git")
+            shutil.rmtree(upper, ignore_errors=True)
+            shutil.rmtree(work, ignore_errors=True)
+            raise
+        with self._lock:
+            self._mounts[path] = template
+
+    def _unmount(self, path: Path) -> None:
+        """Unmount an overlay worktree."""
+        if self._overlay == "fuse":
+            cmd = [shutil.which("fusermount3") or "fusermount", "-u", str(path)]
+        else:
+            cmd = ["umount", str(path)]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.warning(f"Unmounting {path} failed: {result.stderr.strip()}")
+
+    def _undo(self, path: Path, branch_name: str) -> None:
+        """Remove a partially created clone and its branch."""
+        run_git(self.repo_path, ["worktree", "remove", "--force", str(path)], check=False)
+        if path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+        run_git(self.repo_path, ["worktree", "prune"], check=False)
+        run_git(self.repo_path, ["update-ref", "-d", f"refs/heads/{branch_name}"], check=False)
@@ -6,10 +6,24 @@ other disk-intensive operations, we must verify sufficient space exists.
 
 CRITICAL SAFETY: Per CLAUDE.md Resource Safety rules, operations should
 fail if disk usage exceeds 80% to prevent system instability.
+
+DiskBudget extends the check for parallel workers: each worktree reserves
+its estimated size until it is cleaned up, so concurrent creations cannot
+jointly overrun the threshold between two checks.
 """
 
+import fnmatch
+import os
 import shutil
+import threading
+import time
 from pathlib import Path
+from typing import Optional
+
+from orchestrator.git_plumbing import run_git
+
+# Allocation unit assumed for size estimates
+_BLOCK_SIZE = 4096
 
 
 class DiskSpaceError(Exception):
@@ -51,3 +65,209 @@ def check_disk_space(path: str, threshold: float = 80.0) -> float:
         raise DiskSpaceError(current_usage=usage_percent, threshold=threshold)
 
     return usage_percent
+
+
+def directory_size(path: str) -> int:
+    """Measure the space a directory tree occupies on disk.
+
+    Counts allocated blocks (not apparent size), so sparse files and
+    filesystem overhead are reflected. Symlinks are not followed and
+    files that disappear during the walk are skipped.
+
+    Args:
+        path: Directory to measure.
+
+    Returns:
+        Size in bytes (0 if the directory does not exist).
+    """
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            try:
+                st = os.lstat(os.path.join(root, name))
+            except OSError:
+                continue
+            total += st.st_blocks * 512
+    return total
+
+
+class DiskBudget:
+    """Disk space accounting shared by everything that creates worktrees.
+
+    check_disk_space() only sees bytes already written, so parallel
+    workers that check at the same time can jointly fill the disk. A
+    DiskBudget keeps a reservation for each live worktree: a new worktree
+    is admitted only if current usage plus all outstanding reservations
+    plus its own estimated size stays within the threshold.
+
+    Filesystem usage (statvfs) is cached per filesystem for `ttl` seconds,
+    and checkout size estimates (from `git ls-tree -r -l`) for
+    `estimate_ttl` seconds, so admitting a worktree usually costs no
+    system call and no git process.
+
+    Reservations are held until release(), i.e. they also count bytes
+    that have since been written; the budget errs on the side of refusing.
+
+    Attributes:
+        threshold: Maximum allowed disk usage percentage, reservations included.
+        ttl: Seconds a statvfs result is reused.
+        estimate_ttl: Seconds a checkout size estimate is reused.
+    """
+
+    def __init__(
+        self, threshold: float = 80.0, ttl: float = 2.0, estimate_ttl: float = 60.0
+    ) -> None:
+        """Initialize DiskBudget.
+
+        Args:
+            threshold: Maximum allowed disk usage percentage.
+            ttl: Seconds to cache filesystem usage.
+            estimate_ttl: Seconds to cache checkout size estimates.
+        """
+        self.threshold = threshold
+        self.ttl = ttl
+        self.estimate_ttl = estimate_ttl
+        self._lock = threading.Lock()
+        # st_dev -> (sampled at, total bytes, used bytes)
+        self._usage: dict[int, tuple[float, int, int]] = {}
+        # key -> (st_dev, bytes)
+        self._reservations: dict[str, tuple[int, int]] = {}
+        # (repo, rev, patterns) -> (estimated at, bytes)
+        self._estimates: dict[tuple, tuple[float, int]] = {}
+
+    def _device(self, path: str) -> int:
+        """Filesystem ID of a path (of its nearest existing ancestor)."""
+        probe = Path(path)
+        while not probe.exists() and probe != probe.parent:
+            probe = probe.parent
+        return os.stat(probe).st_dev
+
+    def _disk_usage(self, path: str, device: int) -> tuple[int, int]:
+        """Total and used bytes of a filesystem, cached for ttl seconds."""
+        now = time.monotonic()
+        cached = self._usage.get(device)
+        if cached is not None and now - cached[0] < self.ttl:
+            return cached[1], cached[2]
+        usage = shutil.disk_usage(path)
+        self._usage[device] = (now, usage.total, usage.used)
+        return usage.total, usage.used
+
+    def reserved(self, path: Optional[str] = None) -> int:
+        """Bytes reserved in total, or on the filesystem containing path."""
+        with self._lock:
+            if path is None:
+                return sum(size for _, size in self._reservations.values())
+            device = self._device(path)
+            return sum(size for dev, size in self._reservations.values() if dev == device)
+
+    def check(self, path: str, nbytes: int = 0) -> float:
+        """Check that nbytes more would fit on path's filesystem.
+
+        Args:
+            path: Path on the filesystem to check.
+            nbytes: Bytes about to be written.
+
+        Returns:
+            Projected usage percentage (usage + reservations + nbytes).
+
+        Raises:
+            DiskSpaceError: If the projected usage exceeds the threshold.
+            OSError: If the path is inaccessible.
+        """
+        with self._lock:
+            return self._check(path, self._device(path), nbytes)
+
+    def _check(self, path: str, device: int, nbytes: int) -> float:
+        """check() with the lock held."""
+        total, used = self._disk_usage(path, device)
+        reserved = sum(size for dev, size in self._reservations.values() if dev == device)
+        usage_percent = (used + reserved + nbytes) / total * 100
+        if usage_percent > self.threshold:
+            raise DiskSpaceError(current_usage=usage_percent, threshold=self.threshold)
+        return usage_percent
+
+    def reserve(self, key: str, path: str, nbytes: int) -> float:
+        """Admit a worktree and hold its estimated size until release().
+
+        Re-reserving an existing key replaces its reservation.
+
+        Args:
+            key: Reservation key (e.g. the task ID).
+            path: Directory the worktree will be created in.
+            nbytes: Estimated size of the worktree.
+
+        Returns:
+            Projected usage percentage including this reservation.
+
+        Raises:
+            DiskSpaceError: If the reservation does not fit under the threshold.
+        """
+        with self._lock:
+            device = self._device(path)
+            self._reservations.pop(key, None)
+            usage_percent = self._check(path, device, nbytes)
+            self._reservations[key] = (device, nbytes)
+            return usage_percent
+
+    def release(self, key: str) -> None:
+        """Drop a reservation (no-op for unknown keys)."""
+        with self._lock:
+            self._reservations.pop(key, None)
+
+    def estimate(
+        self, repo_path: str, rev: str = "HEAD", patterns: Optional[list[str]] = None
+    ) -> int:
+        """Estimate the on-disk size of a checkout.
+
+        Sums the blob sizes listed by `git ls-tree -r -l`, each rounded up
+        to whole filesystem blocks like directory_size() counts them.
+
+        Args:
+            repo_path: Repository path.
+            rev: Revision to check out.
+            patterns: Optional sparse-checkout patterns (gitignore-style,
+                as written by WorktreeManager); only matching files count.
+
+        Returns:
+            Estimated size in bytes.
+        """
+        key = (str(repo_path), rev, tuple(patterns) if patterns else None)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._estimates.get(key)
+            if cached is not None and now - cached[0] < self.estimate_ttl:
+                return cached[1]
+
+        result = run_git(repo_path, ["ls-tree", "-r", "-l", "--full-tree", rev], check=False)
+        total = 0
+        for line in result.stdout.splitlines():
+            meta, _, name = line.partition("\t")
+            fields = meta.split()
+            if len(fields) != 4 or fields[1] != "blob" or not fields[3].isdigit():
+                continue
+            if patterns and not _matches_sparse(name, patterns):
+                continue
+            total += -(-int(fields[3]) // _BLOCK_SIZE) * _BLOCK_SIZE
+
+        with self._lock:
+            self._estimates[key] = (now, total)
+        return total
+
+
+def _matches_sparse(name: str, patterns: list[str]) -> bool:
+    """Approximate non-cone sparse-checkout matching for size estimates.
+
+    '/dir/' matches everything below dir, '/path' matches from the root,
+    and a pattern without a leading slash matches the file name anywhere.
+    """
+    for pattern in patterns:
+        if pattern.startswith("/"):
+            anchored = pattern[1:]
+            if anchored.endswith("/"):
+                if name.startswith(anchored):
+                    return True
+            elif fnmatch.fnmatchcase(name, anchored):
+                return True
+        elif fnmatch.fnmatchcase(name.rsplit("/", 1)[-1], pattern.rstrip("/")):
+            return True
+    return False
@@ -16,8 +16,10 @@ from typing import Optional
 
 import httpx
 
+from orchestrator.cancellation import CancellationToken, current_token, sleep
 from orchestrator.config import get_proxy_config, ConfigError
 from orchestrator.prompts import get_prompt, TemplateNotFoundError
+from orchestrator.tracing import get_tracer
 
 
 class UnknownTaskTypeError(Exception):
@@ -243,17 +245,29 @@ class ModelDispatcher:
         task_type: str,
         prompt_vars: dict[str, str],
         max_retries: int = 2,
+        cancel_token: Optional[CancellationToken] = None,
+        temperature: Optional[float] = None,
     ) -> DispatchResult:
         """Send a request to the appropriate model proxy.
 
+        When a cancellation token is active, each attempt's HTTP timeout is
+        capped to the time remaining and the backoff between retries wakes
+        up as soon as the token fires.
+
         Args:
             task_type: The type of task (determines model and prompt).
             prompt_vars: Variables to format the prompt template.
             max_retries: Maximum retries on transient failures.
+            cancel_token: Token bounding the request (defaults to current_token()).
+            temperature: Sampling temperature (default: the proxy's default).
 
         Returns:
             DispatchResult with success status, response, and timing.
+
+        Raises:
+            OperationCancelled: If the token fires before a response arrives.
         """
+        token = cancel_token or current_token()
         # Get model and prompt
         model_name = self.route_to_model(task_type)
         config = get_proxy_config(model_name)
@@ -278,41 +292,60 @@ class ModelDispatcher:
             ],
             "model": model_name,
         }
+        if temperature is not None:
+            payload["temperature"] = temperature
 
-        # Send with retries
+        # Send with retries (each attempt is a 'dispatch' tracing span)
+        tracer = get_tracer()
         last_error = None
         for attempt in range(max_retries + 1):
+            timeout = self.timeout
+            if token is not None:
+                token.raise_if_cancelled()
+                timeout = token.bound(self.timeout)
             start = time.time()
-            try:
-                with httpx.Client(timeout=self.timeout) as client:
-                    response = client.post(
-                        f"{config.base_url}/v1/chat/completions",
-                        json=payload,
-                    )
-                    latency_ms = int((time.time() - start) * 1000)
-
-                    if response.status_code == 200:
-                        data = response.json()
-                        content = data["choices"][0]["message"]["content"]
-                        return DispatchResult(
-                            success=True,
-                            response=content,
-                            latency_ms=latency_ms,
-                            error=None,
+            with tracer.span(
+                "dispatch", "dispatch",
+                task_type=task_type, model=model_name, attempt=attempt + 1,
+            ) as span:
+                try:
+                    with httpx.Client(timeout=timeout) as client:
+                        response = client.post(
+                            f"{config.base_url}/v1/chat/completions",
+                            json=payload,
                         )
-                    else:
-                        last_error = f"HTTP {response.status_code}: {response.text}"
-
-            except httpx.TimeoutException:
-                last_error = f"Request timeout to {model_name} proxy"
-            except httpx.ConnectError as e:
-                last_error = f"Connection failed to {model_name} proxy: {e}"
-            except Exception as e:
-                last_error = f"Request error: {e}"
+                        latency_ms = int((time.time() - start) * 1000)
+                        span.set_attribute("status_code", response.status_code)
+
+                        if response.status_code == 200:
+                            data = response.json()
+                            content = data["choices"][0]["message"]["content"]
+                            return DispatchResult(
+                                success=True,
+                                response=content,
+                                latency_ms=latency_ms,
+                                error=None,
+                            )
+                        else:
+                            last_error = f"HTTP {response.status_code}: {response.text}"
+
+                except httpx.TimeoutException:
+                    last_error = f"Request timeout to {model_name} proxy"
+                except httpx.ConnectError as e:
+                    last_error = f"Connection failed to {model_name} proxy: {e}"
+                except Exception as e:
+                    last_error = f"Request error: {e}"
+
+                span.set_outcome("error")
+                span.set_attribute("error", last_error)
+
+            # A timeout caused by the deadline is a cancellation, not a failure
+            if token is not None:
+                token.raise_if_cancelled()
 
             # Exponential backoff before retry
             if attempt < max_retries:
-                time.sleep(0.5 * (2 ** attempt))
+                sleep(0.5 * (2 ** attempt), token)
 
         latency_ms = int((time.time() - start) * 1000)
         return DispatchResult(
@@ -17,9 +17,20 @@ from typing import Callable, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from orchestrator.dispatcher import ModelDispatcher
+    from orchestrator.pytest_runner import PytestResult
 
 logger = logging.getLogger(__name__)
 
+# Exception types the recommendations react to
+_KNOWN_ERROR_TYPES = (
+    "ImportError",
+    "ModuleNotFoundError",
+    "TypeError",
+    "AssertionError",
+    "AttributeError",
+    "SyntaxError",
+)
+
 
 @dataclass
 class EscalationResult:
@@ -87,6 +98,7 @@ class EscalationPolicy:
         task_id: str,
         error_history: list[str],
         last_output: str,
+        last_result: Optional["PytestResult"] = None,
     ) -> EscalationResult:
         """Handle a blocked task.
 
@@ -94,6 +106,8 @@ class EscalationPolicy:
             task_id: ID of the blocked task.
             error_history: List of errors from retry attempts.
             last_output: Final test/execution output.
+            last_result: Optional final PytestResult; its per-test exception
+                types are used instead of scanning last_output.
 
         Returns:
             EscalationResult with diagnostic information.
@@ -105,7 +119,9 @@ class EscalationPolicy:
         )
 
         # Generate recommendations based on error patterns
-        recommendations = self._generate_recommendations(error_history, last_output)
+        recommendations = self._generate_recommendations(
+            error_history, last_output, last_result
+        )
 
         # Optional Pro diagnosis
         diagnosis = None
@@ -136,39 +152,47 @@ class EscalationPolicy:
         self,
         error_history: list[str],
         last_output: str,
+        last_result: Optional["PytestResult"] = None,
     ) -> list[str]:
         """Generate recommendations based on error patterns.
 
         Args:
             error_history: List of errors.
-            last_output: Final output.
+            last_output: Final output (scanned only without last_result).
+            last_result: Optional final PytestResult.
 
         Returns:
             List of recommendation strings.
         """
         recommendations = []
-        combined = " ".join(error_history) + " " + last_output
+        texts = list(error_history)
+        if last_result is not None and last_result.tests:
+            found = set(last_result.exception_types)
+        else:
+            texts.append(last_output)
+            found = set()
+        found.update(name for name in _KNOWN_ERROR_TYPES if any(name in t for t in texts))
 
         # Check for common error patterns
-        if "ImportError" in combined or "ModuleNotFoundError" in combined:
+        if "ImportError" in found or "ModuleNotFoundError" in found:
             recommendations.append(
                 "Check if required dependencies are installed in the worktree"
             )
             recommendations.append("Verify import statements match actual module paths")
 
-        if "TypeError" in combined:
+        if "TypeError" in found:
             recommendations.append("Review type annotations and function signatures")
             recommendations.append("Check for mismatched argument types")
 
-        if "AssertionError" in combined:
+        if "AssertionError" in found:
             recommendations.append("Review test assertions and expected values")
             recommendations.append("Check if implementation logic is correct")
 
-        if "AttributeError" in combined:
+        if "AttributeError" in found:
             recommendations.append("Verify object attributes and method names")
             recommendations.append("Check for typos in attribute access")
 
-        if "SyntaxError" in combined:
+        if "SyntaxError" in found:
             recommendations.append("Check generated code for syntax errors")
             recommendations.append("Review code formatting and indentation")
 
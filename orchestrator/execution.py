@@ -3,27 +3,44 @@
 This module provides the core execution components:
 - ExecutionContext: Context passed through pipeline stages
 - ExecutionResult: Result from task execution
-- Stage functions: Individual pipeline stages
+- Stage functions: Individual pipeline stages (including a regression
+  run of the existing tests affected by the task, see RegressionRunner)
+  and REFACTOR skipped where it rarely pays off (see RefactorPolicy)
 - TaskPipeline: Orchestrates stages for a single task
 - execution_loop: Main loop that processes queue
 
+With a CheckpointStore configured, TaskPipeline records progress after
+each stage so an interrupted task can resume where it stopped.
+
+Per-stage and per-task time budgets are enforced with a CancellationToken
+that stage code (dispatcher, pytest, git) picks up cooperatively; a task
+that exceeds its budget is aborted, cleaned up and reported as failed.
+
 PHASE-009: Main Loop Integration
 """
 
 import logging
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Callable, Optional, TYPE_CHECKING
 
+from orchestrator.cancellation import CancellationToken, OperationCancelled
 from orchestrator.models import TaskModel, TaskStatus
+from orchestrator.refactor_policy import refactor_task_type
+from orchestrator.tracing import get_tracer, task_context
 from orchestrator.task_selector import TaskSelector
 from orchestrator.queue_manager import QueueManager
 
 if TYPE_CHECKING:
     from orchestrator.dispatcher import ModelDispatcher
     from orchestrator.worktree import WorktreeManager, MergeResult
+    from orchestrator.merge_queue import MergeQueue
+    from orchestrator.checkpoint import CheckpointStore, PipelineCheckpoint
     from orchestrator.tdd_cycle import TDDFullCycleRunner, CycleResult
     from orchestrator.qa_agent import QAAgent, ReviewResult
+    from orchestrator.regression import RegressionResult, RegressionRunner
+    from orchestrator.refactor_policy import RefactorPolicy
     from orchestrator.memory_agent import MemoryAgent, MemoryUpdateResult
     from orchestrator.dna_check import MergeGateResult
 
@@ -54,6 +71,11 @@ class ExecutionContext:
         tdd_runner: TDDFullCycleRunner instance.
         qa_agent: QAAgent instance.
         memory_agent: MemoryAgent instance.
+        merge_queue: Optional MergeQueue used instead of a direct merge.
+        regression_runner: Optional RegressionRunner for the existing tests.
+        refactor_policy: Optional RefactorPolicy deciding whether to refactor.
+        checkpoint_store: Optional CheckpointStore for crash recovery.
+        checkpoint: Current checkpoint for the task (set once the worktree exists).
     """
 
     task: TaskModel
@@ -67,6 +89,11 @@ class ExecutionContext:
     tdd_runner: Optional["TDDFullCycleRunner"] = None
     qa_agent: Optional["QAAgent"] = None
     memory_agent: Optional["MemoryAgent"] = None
+    merge_queue: Optional["MergeQueue"] = None
+    regression_runner: Optional["RegressionRunner"] = None
+    refactor_policy: Optional["RefactorPolicy"] = None
+    checkpoint_store: Optional["CheckpointStore"] = None
+    checkpoint: Optional["PipelineCheckpoint"] = None
 
 
 @dataclass
@@ -76,11 +103,14 @@ class ExecutionResult:
     Attributes:
         success: Whether the task completed successfully.
         task_id: ID of the executed task.
-        stage_reached: Last stage that completed ('worktree', 'tdd', 'qa', 'dna', 'merge', 'memory', 'cleanup').
+        stage_reached: Last stage that completed ('worktree', 'tdd', 'regression', 'qa', 'dna', 'merge', 'memory', 'cleanup').
         error: Error message if failed.
         tdd_result: Result from TDD cycle (if reached).
+        regression_result: Result of the existing tests affected by the task (if run).
         qa_result: Result from QA review (if reached).
         merge_result: Result from merge (if reached).
+        stage_durations: Wall time in seconds spent in each stage that ran.
+        cancelled: Whether the task was aborted by a deadline or cancel().
     """
 
     success: bool
@@ -88,8 +118,84 @@ class ExecutionResult:
     stage_reached: str
     error: Optional[str] = None
     tdd_result: Optional["CycleResult"] = None
+    regression_result: Optional["RegressionResult"] = None
     qa_result: Optional["ReviewResult"] = None
     merge_result: Optional["MergeResult"] = None
+    stage_durations: dict[str, float] = field(default_factory=dict)
+    cancelled: bool = False
+
+
+def _record_stage(ctx: ExecutionContext, stage: str, **updates: Any) -> None:
+    """Advance the task checkpoint to a completed stage and persist it.
+
+    Checkpointing is best-effort: a failed save is logged and the pipeline
+    continues.
+
+    Args:
+        ctx: Execution context holding the checkpoint.
+        stage: Stage that just completed.
+        **updates: Checkpoint fields to set (e.g. red_result=...).
+    """
+    if ctx.checkpoint is None:
+        return
+
+    for name, value in updates.items():
+        setattr(ctx.checkpoint, name, value)
+    ctx.checkpoint.stage = stage
+
+    if ctx.checkpoint_store is not None:
+        try:
+            ctx.checkpoint_store.save(ctx.checkpoint)
+        except Exception as e:
+            logger.warning(f"Checkpoint save failed for {ctx.task.id} (continuing): {e}")
+
+
+def _timed_stage(
+    name: str,
+    durations: dict[str, float],
+    stage_fn: Callable[..., Any],
+    *args: Any,
+    token: Optional[CancellationToken] = None,
+) -> Any:
+    """Run a stage function inside a 'stage.<name>' tracing span.
+
+    The wall time is added to durations[name]. A stage returning a
+    (result, error) tuple with an error gets an 'error' span outcome.
+
+    With a token, the token is active while the stage runs. Stages turn
+    exceptions into error strings, so a stage that failed after the token
+    fired is reported as a cancellation rather than an ordinary error.
+
+    Args:
+        name: Stage name.
+        durations: Per-stage duration accumulator.
+        stage_fn: Stage function to call.
+        *args: Arguments for stage_fn.
+        token: Optional cancellation token bounding the stage.
+
+    Returns:
+        Whatever stage_fn returns.
+
+    Raises:
+        OperationCancelled: If the token fired before or during the stage.
+    """
+    start = time.perf_counter()
+    try:
+        with get_tracer().span(f"stage.{name}", "stage") as span:
+            if token is None:
+                result = stage_fn(*args)
+            else:
+                token.raise_if_cancelled()
+                with token.activate():
+                    result = stage_fn(*args)
+            if isinstance(result, tuple) and len(result) == 2 and result[1]:
+                if token is not None:
+                    token.raise_if_cancelled()
+                span.set_outcome("error")
+                span.set_attribute("error", result[1])
+            return result
+    finally:
+        durations[name] = durations.get(name, 0.0) + time.perf_counter() - start
 
 
 def stage_create_worktree(
@@ -111,21 +217,15 @@ def stage_create_worktree(
         return None, "WorktreeManager not configured"
 
     try:
-        worktree_path = ctx.worktree_manager.create(task_id=ctx.task.id)
+        worktree_path = ctx.worktree_manager.create(
+            task_id=ctx.task.id, attempt=attempt, files=list(ctx.task.files)
+        )
 
         # Create updated context with worktree path
-        new_ctx = ExecutionContext(
-            task=ctx.task,
+        new_ctx = replace(
+            ctx,
             worktree_path=Path(worktree_path),
             branch_name=f"feature/{ctx.task.id}_attempt_{attempt}",
-            dispatcher=ctx.dispatcher,
-            config=ctx.config,
-            queue_path=ctx.queue_path,
-            northstar_path=ctx.northstar_path,
-            worktree_manager=ctx.worktree_manager,
-            tdd_runner=ctx.tdd_runner,
-            qa_agent=ctx.qa_agent,
-            memory_agent=ctx.memory_agent,
         )
 
         logger.info(f"Created worktree at {worktree_path} (attempt {attempt})")
@@ -138,11 +238,14 @@ def stage_create_worktree(
 
 def stage_run_tdd(
     ctx: ExecutionContext,
+    resume_from: Optional["PipelineCheckpoint"] = None,
 ) -> tuple[Optional["CycleResult"], Optional[str]]:
     """Pipeline stage: Run TDD cycle (Red -> Green -> Refactor).
 
     Args:
         ctx: Execution context with tdd_runner.
+        resume_from: Checkpoint whose completed RED/GREEN phases are
+            restored instead of being generated again.
 
     Returns:
         Tuple of (CycleResult, error).
@@ -158,16 +261,44 @@ def stage_run_tdd(
             raise ValueError(f"Task {ctx.task.id} has no files specified")
         target_file = ctx.task.files[0]
 
-        # Run TDD cycle
+        # Run TDD cycle in the pipeline's worktree
         ctx.tdd_runner.start_cycle(
             task_id=ctx.task.id,
             task_description=ctx.task.description,
             target_file=target_file,
+            worktree_path=str(ctx.worktree_path) if ctx.worktree_path else None,
         )
 
-        ctx.tdd_runner.run_red_phase()
-        ctx.tdd_runner.run_green_phase()
-        result = ctx.tdd_runner.finish_cycle(skip_refactor=False)
+        if resume_from and resume_from.red_result:
+            ctx.tdd_runner.restore_phases(
+                resume_from.red_result, resume_from.green_result
+            )
+
+        if not (resume_from and resume_from.reached("red")):
+            red_result = ctx.tdd_runner.run_red_phase()
+            _record_stage(ctx, "red", red_result=red_result)
+
+        if not (resume_from and resume_from.reached("green")):
+            green_result = ctx.tdd_runner.run_green_phase()
+            _record_stage(ctx, "green", green_result=green_result)
+
+        skip_refactor = False
+        task_type = refactor_task_type(target_file)
+        green_result = ctx.tdd_runner.green_result
+        if ctx.refactor_policy is not None and green_result is not None:
+            try:
+                impl_code = Path(green_result.impl_path).read_text()
+            except OSError:
+                impl_code = ""
+            decision = ctx.refactor_policy.decide(task_type, impl_code)
+            skip_refactor = not decision.run
+            if skip_refactor:
+                logger.info(f"Skipping REFACTOR for {ctx.task.id}: {decision.reason}")
+
+        # Merge happens in the pipeline's own merge stage
+        result = ctx.tdd_runner.finish_cycle(skip_refactor=skip_refactor, merge=False)
+        if ctx.refactor_policy is not None and result.refactor_result is not None:
+            ctx.refactor_policy.record(task_type, result.refactor_result)
 
         logger.info(f"TDD cycle complete for {ctx.task.id}")
         return result, None
@@ -183,15 +314,68 @@ def stage_run_tdd(
         return None, f"TDD failed after max retries: {e}"
 
 
+def stage_run_regression(
+    ctx: ExecutionContext,
+    tdd_result: "CycleResult",
+) -> tuple[Optional["RegressionResult"], Optional[str]]:
+    """Pipeline stage: Run the existing tests affected by the task's changes.
+
+    The task's own test file already ran in the TDD cycle and is skipped.
+    Failures block the task here only without a QA agent; otherwise they
+    are passed to the QA review, which rejects regressions.
+
+    Args:
+        ctx: Execution context with regression_runner and worktree_path.
+        tdd_result: Result from TDD cycle.
+
+    Returns:
+        Tuple of (RegressionResult, error).
+        On success: (result, None)
+        On failure: (result or None, error_message)
+    """
+    if ctx.regression_runner is None or ctx.worktree_path is None:
+        return None, None
+
+    try:
+        exclude = []
+        if tdd_result.red_result:
+            test_path = Path(tdd_result.red_result.test_path)
+            if test_path.is_absolute():
+                test_path = test_path.relative_to(ctx.worktree_path)
+            exclude.append(test_path.as_posix())
+
+        result = ctx.regression_runner.run(
+            ctx.worktree_path,
+            fallback=list(ctx.task.files),
+            exclude=exclude,
+            worktree_manager=ctx.worktree_manager,
+            task_id=ctx.task.id,
+        )
+        logger.info(
+            f"Regression run for {ctx.task.id}: {len(result.selected_tests)} test files, "
+            f"{'passed' if result.passed else 'FAILED'} in {result.duration:.1f}s"
+        )
+        if not result.passed and ctx.qa_agent is None:
+            summary = result.result.failure_summary() or result.result.status.value
+            return result, f"Regression: existing tests fail: {summary}"
+        return result, None
+
+    except Exception as e:
+        logger.error(f"Regression run failed: {e}")
+        return None, f"Regression run error: {e}"
+
+
 def stage_qa_review(
     ctx: ExecutionContext,
     tdd_result: "CycleResult",
+    regression_result: Optional["RegressionResult"] = None,
 ) -> tuple[Optional["ReviewResult"], Optional[str]]:
     """Pipeline stage: Run QA review on completed code.
 
     Args:
         ctx: Execution context with qa_agent.
         tdd_result: Result from TDD cycle.
+        regression_result: Result of the affected existing tests, if run.
 
     Returns:
         Tuple of (ReviewResult, error).
@@ -213,12 +397,15 @@ def stage_qa_review(
 
         test_results = ""
         if tdd_result.green_result:
-            test_results = tdd_result.green_result.test_output
+            # Prefer the structured result; resumed tasks only have the text
+            green = tdd_result.green_result
+            test_results = green.pytest_result or green.test_output
 
         result = ctx.qa_agent.review(
             task={"description": ctx.task.description},
             code=code,
             test_results=test_results,
+            existing_test_results=regression_result.result if regression_result else None,
         )
 
         if result.decision == "REJECTED":
@@ -272,11 +459,18 @@ def stage_dna_check(
 
 def stage_merge(
     ctx: ExecutionContext,
+    tdd_result: Optional["CycleResult"] = None,
 ) -> tuple[Optional["MergeResult"], Optional[str]]:
     """Pipeline stage: Merge worktree changes to main.
 
+    Commits the worktree's changes to the task branch, then lands the
+    branch either through the configured MergeQueue (rebase + atomic
+    fast-forward) or via WorktreeManager.merge.
+
     Args:
         ctx: Execution context with worktree_manager.
+        tdd_result: Result from TDD cycle, used to tell the merge queue
+            which tests to re-run after a rebase.
 
     Returns:
         Tuple of (MergeResult, error).
@@ -287,7 +481,31 @@ def stage_merge(
         return None, "WorktreeManager not configured"
 
     try:
-        result = ctx.worktree_manager.merge(task_id=ctx.task.id)
+        ctx.worktree_manager.commit_changes(
+            ctx.task.id, f"{ctx.task.id}: {ctx.task.description}"
+        )
+
+        if ctx.merge_queue is not None:
+            from orchestrator.merge_queue import MergeRequest
+
+            test_paths = []
+            if tdd_result and tdd_result.red_result and ctx.worktree_path:
+                test_path = Path(tdd_result.red_result.test_path)
+                if test_path.is_relative_to(ctx.worktree_path):
+                    test_paths.append(str(test_path.relative_to(ctx.worktree_path)))
+
+            result = ctx.merge_queue.submit(
+                MergeRequest(
+                    task_id=ctx.task.id,
+                    branch=ctx.branch_name,
+                    target_branch=ctx.config.get("target_branch", "main"),
+                    test_paths=test_paths,
+                    files=list(ctx.task.files),
+                    worktree_path=str(ctx.worktree_path) if ctx.worktree_path else None,
+                )
+            )
+        else:
+            result = ctx.worktree_manager.merge(task_id=ctx.task.id)
 
         if not result.success:
             return result, f"Merge failed/conflict: {result.message}"
@@ -343,9 +561,20 @@ def stage_update_memory(
 def stage_cleanup(ctx: ExecutionContext) -> None:
     """Pipeline stage: Clean up worktree (always runs).
 
+    Stops the pytest fork servers running in the worktree first.
+
     Args:
         ctx: Execution context with worktree_manager.
     """
+    if ctx.worktree_path is not None:
+        for owner in (ctx.tdd_runner, ctx.regression_runner):
+            pytest_runner = getattr(owner, "pytest_runner", None)
+            if pytest_runner is not None:
+                try:
+                    pytest_runner.close_server(str(ctx.worktree_path))
+                except Exception as e:
+                    logger.debug(f"Closing fork servers failed (non-fatal): {e}")
+
     if ctx.worktree_manager is None:
         return
 
@@ -362,11 +591,20 @@ class TaskPipeline:
     Runs stages in order:
     1. worktree - Create isolated worktree
     2. tdd - Run TDD cycle (Red -> Green -> Refactor)
-    3. qa - QA review (optional, blocks on rejection)
-    4. dna - DNA drift check (optional, blocks on drift)
-    5. merge - Merge to main
-    6. memory - Update context.yaml (non-blocking)
-    7. cleanup - Always runs
+    3. regression - Run the existing tests affected by the task (optional;
+       failures are reported to QA, or block the task without QA)
+    4. qa - QA review (optional, blocks on rejection)
+    5. dna - DNA drift check (optional, blocks on drift)
+    6. merge - Merge to main
+    7. memory - Update context.yaml (non-blocking)
+    8. cleanup - Always runs
+
+    With a checkpoint_store, progress is saved after every stage and
+    resume() continues an interrupted task from its last completed stage.
+
+    stage_timeouts and task_timeout bound how long a stage or the whole
+    task may run; cancel() aborts a running task from another thread.
+    Cleanup always runs outside these budgets.
 
     Example:
         pipeline = TaskPipeline(worktree_manager, dispatcher)
@@ -383,6 +621,12 @@ class TaskPipeline:
         queue_path: Optional[str] = None,
         northstar_path: Optional[str] = None,
         config: Optional[dict[str, Any]] = None,
+        merge_queue: Optional["MergeQueue"] = None,
+        checkpoint_store: Optional["CheckpointStore"] = None,
+        stage_timeouts: Optional[dict[str, float]] = None,
+        task_timeout: Optional[float] = None,
+        regression_runner: Optional["RegressionRunner"] = None,
+        refactor_policy: Optional["RefactorPolicy"] = None,
     ) -> None:
         """Initialize TaskPipeline.
 
@@ -395,6 +639,21 @@ class TaskPipeline:
             queue_path: Optional path to queue.json for DNA check.
             northstar_path: Optional path to NORTHSTAR.md for DNA check.
             config: Optional configuration dict.
+            merge_queue: Optional MergeQueue for serialized merges when
+                several pipelines run in parallel.
+            checkpoint_store: Optional CheckpointStore for per-stage
+                checkpoints and resume after a crash.
+            stage_timeouts: Optional per-stage time budgets in seconds,
+                keyed by stage name ('worktree', 'tdd', 'regression', 'qa',
+                'dna', 'merge', 'memory').
+            task_timeout: Optional time budget in seconds for the whole
+                task up to its merge (memory update and cleanup run after
+                the task has landed and are not cancelled by it).
+            regression_runner: Optional RegressionRunner; runs the existing
+                tests affected by each task before QA and merge.
+            refactor_policy: Optional RefactorPolicy; skips the REFACTOR
+                phase of tasks where it is unlikely to be accepted. Without
+                one, every task is refactored.
         """
         self.worktree_manager = worktree_manager
         self.dispatcher = dispatcher
@@ -404,22 +663,100 @@ class TaskPipeline:
         self.queue_path = queue_path
         self.northstar_path = northstar_path
         self.config = config or {}
+        self.merge_queue = merge_queue
+        self.checkpoint_store = checkpoint_store
+        self.stage_timeouts = stage_timeouts or {}
+        self.task_timeout = task_timeout
+        self.regression_runner = regression_runner
+        self.refactor_policy = refactor_policy
+        self._tokens: dict[str, CancellationToken] = {}
+
+    def cancel(self, task_id: str, reason: Optional[str] = None) -> bool:
+        """Abort a running task at its next cancellation point.
+
+        Args:
+            task_id: ID of the task to cancel.
+            reason: Optional reason reported in the ExecutionResult.
+
+        Returns:
+            True if the task was running, False otherwise.
+        """
+        token = self._tokens.get(task_id)
+        if token is None:
+            return False
+        token.cancel(reason)
+        return True
 
-    def execute(self, task: TaskModel) -> ExecutionResult:
+    def _stage_token(self, task_token: CancellationToken, stage: str) -> CancellationToken:
+        """Create the token bounding one stage of a task."""
+        return task_token.child(self.stage_timeouts.get(stage), name=f"stage '{stage}'")
+
+    def resume(self, task: TaskModel, checkpoint: "PipelineCheckpoint") -> ExecutionResult:
+        """Resume an interrupted task from its last completed stage.
+
+        Args:
+            task: TaskModel to resume.
+            checkpoint: Checkpoint recorded before the interruption. Its
+                worktree must still exist.
+
+        Returns:
+            ExecutionResult with success status and details.
+        """
+        logger.info(
+            f"Resuming task {task.id} after stage '{checkpoint.stage}' "
+            f"in {checkpoint.worktree_path}"
+        )
+        return self.execute(task, resume_from=checkpoint)
+
+    def execute(
+        self,
+        task: TaskModel,
+        resume_from: Optional["PipelineCheckpoint"] = None,
+    ) -> ExecutionResult:
         """Execute all pipeline stages for a task.
 
+        The task and each stage are recorded as tracing spans linked by
+        the task ID, and per-stage wall times are returned in
+        ExecutionResult.stage_durations.
+
         Args:
             task: TaskModel to execute.
+            resume_from: Optional checkpoint; stages it already completed
+                are skipped and its worktree is reused.
 
         Returns:
             ExecutionResult with success status and details.
         """
+        with task_context(task.id):
+            with get_tracer().span(
+                "task", "task", resumed=resume_from is not None
+            ) as span:
+                result = self._execute(task, resume_from)
+                span.set_attribute("stage_reached", result.stage_reached)
+                if not result.success:
+                    span.set_outcome("error")
+                return result
+
+    def _execute(
+        self,
+        task: TaskModel,
+        resume_from: Optional["PipelineCheckpoint"],
+    ) -> ExecutionResult:
+        """Run the pipeline stages for a task (see execute())."""
         ctx: Optional[ExecutionContext] = None
+        durations: dict[str, float] = {}
         tdd_result = None
+        regression_result = None
         qa_result = None
         merge_result = None
         stage_reached = "init"
         error_msg = None
+        preserve_worktree = False
+        task_token = CancellationToken(self.task_timeout, name=f"task {task.id}")
+        self._tokens[task.id] = task_token
+
+        def completed(stage: str) -> bool:
+            return resume_from is not None and resume_from.reached(stage)
 
         try:
             # Create initial context
@@ -442,50 +779,121 @@ class TaskPipeline:
                 tdd_runner=tdd_runner,
                 qa_agent=self.qa_agent,
                 memory_agent=self.memory_agent,
+                merge_queue=self.merge_queue,
+                regression_runner=self.regression_runner,
+                refactor_policy=self.refactor_policy,
+                checkpoint_store=self.checkpoint_store,
             )
 
-            # Stage 1: Create worktree
+            # Stage 1: Create worktree (or reuse the checkpointed one)
             stage_reached = "worktree"
-            ctx, error = stage_create_worktree(ctx)
-            if error:
-                error_msg = error
-                raise StageError(error)
+            if resume_from is not None:
+                self.worktree_manager.adopt(task.id, resume_from.worktree_path)
+                ctx = replace(
+                    ctx,
+                    worktree_path=Path(resume_from.worktree_path),
+                    branch_name=resume_from.branch_name,
+                    checkpoint=resume_from,
+                )
+            else:
+                ctx, error = _timed_stage(
+                    "worktree", durations, stage_create_worktree, ctx,
+                    token=self._stage_token(task_token, "worktree"),
+                )
+                if error:
+                    error_msg = error
+                    raise StageError(error)
+
+                from orchestrator.checkpoint import PipelineCheckpoint
+
+                ctx.checkpoint = PipelineCheckpoint(
+                    task_id=task.id,
+                    stage="worktree",
+                    worktree_path=str(ctx.worktree_path),
+                    branch_name=ctx.branch_name,
+                    target_file=task.files[0] if task.files else None,
+                )
+                _record_stage(ctx, "worktree")
 
             # Stage 2: Run TDD
             stage_reached = "tdd"
-            tdd_result, error = stage_run_tdd(ctx)
-            if error:
-                error_msg = error
-                raise StageError(error)
+            if completed("tdd") and resume_from.cycle_result is not None:
+                tdd_result = resume_from.cycle_result
+            else:
+                tdd_result, error = _timed_stage(
+                    "tdd", durations, stage_run_tdd, ctx, resume_from,
+                    token=self._stage_token(task_token, "tdd"),
+                )
+                if error:
+                    error_msg = error
+                    raise StageError(error)
+                _record_stage(ctx, "tdd", cycle_result=tdd_result)
+
+            # Stage 3: Regression run of affected existing tests (optional)
+            if self.regression_runner and tdd_result and not completed("regression"):
+                stage_reached = "regression"
+                regression_result, error = _timed_stage(
+                    "regression", durations, stage_run_regression, ctx, tdd_result,
+                    token=self._stage_token(task_token, "regression"),
+                )
+                if error:
+                    error_msg = error
+                    raise StageError(error)
+                if regression_result is None or regression_result.passed:
+                    # Failures are only final once QA has seen them
+                    _record_stage(ctx, "regression")
 
-            # Stage 3: QA Review (optional)
-            if self.qa_agent and tdd_result:
+            # Stage 4: QA Review (optional)
+            if self.qa_agent and tdd_result and not completed("qa"):
                 stage_reached = "qa"
-                qa_result, error = stage_qa_review(ctx, tdd_result)
+                qa_result, error = _timed_stage(
+                    "qa", durations, stage_qa_review, ctx, tdd_result, regression_result,
+                    token=self._stage_token(task_token, "qa"),
+                )
                 if error:
                     error_msg = error
                     raise StageError(error)
+                _record_stage(ctx, "qa")
 
-            # Stage 4: DNA Check (optional)
-            if self.queue_path and self.northstar_path:
+            # Stage 5: DNA Check (optional)
+            if self.queue_path and self.northstar_path and not completed("dna"):
                 stage_reached = "dna"
-                _, error = stage_dna_check(ctx)
+                _, error = _timed_stage(
+                    "dna", durations, stage_dna_check, ctx,
+                    token=self._stage_token(task_token, "dna"),
+                )
                 if error:
                     error_msg = error
                     raise StageError(error)
+                _record_stage(ctx, "dna")
 
-            # Stage 5: Merge
+            # Stage 6: Merge
             stage_reached = "merge"
-            merge_result, error = stage_merge(ctx)
-            if error:
-                error_msg = error
-                raise StageError(error)
+            if not completed("merge"):
+                merge_result, error = _timed_stage(
+                    "merge", durations, stage_merge, ctx, tdd_result,
+                    token=self._stage_token(task_token, "merge"),
+                )
+                if error:
+                    error_msg = error
+                    raise StageError(error)
+                _record_stage(ctx, "merge")
 
-            # Stage 6: Update Memory (non-blocking)
+            # Stage 7: Update Memory (non-blocking). The task is on the
+            # target branch now, so the task deadline no longer applies;
+            # only the memory stage's own budget does
             stage_reached = "memory"
-            stage_update_memory(ctx)
+            try:
+                _timed_stage(
+                    "memory", durations, stage_update_memory, ctx,
+                    token=CancellationToken(
+                        self.stage_timeouts.get("memory"), name="stage 'memory'"
+                    ),
+                )
+            except OperationCancelled as e:
+                logger.warning(f"Memory update for {task.id} skipped: {e.reason}")
 
-            # Stage 7: Cleanup
+            # Stage 8: Cleanup
             stage_reached = "cleanup"
 
             return ExecutionResult(
@@ -493,8 +901,10 @@ class TaskPipeline:
                 task_id=task.id,
                 stage_reached=stage_reached,
                 tdd_result=tdd_result,
+                regression_result=regression_result,
                 qa_result=qa_result,
                 merge_result=merge_result,
+                stage_durations=durations,
             )
 
         except StageError:
@@ -504,7 +914,23 @@ class TaskPipeline:
                 stage_reached=stage_reached,
                 error=error_msg,
                 tdd_result=tdd_result,
+                regression_result=regression_result,
                 qa_result=qa_result,
+                stage_durations=durations,
+            )
+
+        except OperationCancelled as e:
+            logger.warning(f"Task {task.id} aborted in stage '{stage_reached}': {e.reason}")
+            return ExecutionResult(
+                success=False,
+                task_id=task.id,
+                stage_reached=stage_reached,
+                error=f"Cancelled: {e.reason}",
+                tdd_result=tdd_result,
+                regression_result=regression_result,
+                qa_result=qa_result,
+                stage_durations=durations,
+                cancelled=True,
             )
 
         except Exception as e:
@@ -514,12 +940,77 @@ class TaskPipeline:
                 task_id=task.id,
                 stage_reached=stage_reached,
                 error=str(e),
+                stage_durations=durations,
             )
 
+        except BaseException:
+            # Interrupted (e.g. KeyboardInterrupt): keep the worktree and
+            # checkpoint so the task can be resumed on the next run
+            preserve_worktree = self.checkpoint_store is not None
+            raise
+
         finally:
-            # Cleanup always runs
-            if ctx:
-                stage_cleanup(ctx)
+            self._tokens.pop(task.id, None)
+            # Cleanup always runs unless the task is resumable
+            if ctx and not preserve_worktree:
+                _timed_stage("cleanup", durations, stage_cleanup, ctx)
+                if self.checkpoint_store is not None:
+                    self.checkpoint_store.delete(task.id)
+
+
+def _resume_checkpointed_tasks(
+    queue_manager: QueueManager,
+    pipeline: TaskPipeline,
+    max_tasks: Optional[int] = None,
+) -> list[ExecutionResult]:
+    """Resume in-progress tasks that have a checkpoint from a previous run.
+
+    Checkpoints for tasks that are no longer in progress are discarded.
+    If a checkpoint's worktree is gone, the task is reopened so it runs
+    again from the start, unless it had already merged (merging removes
+    the worktree); such a task is marked complete.
+
+    Args:
+        queue_manager: QueueManager for the queue being processed.
+        pipeline: TaskPipeline with a checkpoint_store.
+        max_tasks: Optional limit on tasks to resume.
+
+    Returns:
+        List of ExecutionResult for each resumed task.
+    """
+    store = pipeline.checkpoint_store
+    tasks = {task.id: task for task in queue_manager.load().tasks}
+    results: list[ExecutionResult] = []
+
+    for checkpoint in store.list():
+        if max_tasks and len(results) >= max_tasks:
+            break
+
+        task = tasks.get(checkpoint.task_id)
+        if task is None or task.status != TaskStatus.IN_PROGRESS:
+            store.delete(checkpoint.task_id)
+            continue
+
+        if not checkpoint.worktree_path or not Path(checkpoint.worktree_path).exists():
+            if checkpoint.reached("merge"):
+                logger.info(f"Task {task.id} merged before the interruption, marking complete")
+                store.delete(checkpoint.task_id)
+                queue_manager.update_task_status(task.id, TaskStatus.COMPLETE)
+                continue
+            logger.warning(f"Worktree for {task.id} is gone, reopening task")
+            store.delete(checkpoint.task_id)
+            queue_manager.update_task_status(task.id, TaskStatus.OPEN)
+            continue
+
+        result = pipeline.resume(task, checkpoint)
+        results.append(result)
+
+        if result.success:
+            queue_manager.update_task_status(task.id, TaskStatus.COMPLETE)
+        else:
+            queue_manager.update_task_status(task.id, TaskStatus.BLOCKED)
+
+    return results
 
 
 def execution_loop(
@@ -536,7 +1027,8 @@ def execution_loop(
     - Interrupted
 
     Note: Caller (main.py) is responsible for calling startup_recovery() before
-    invoking execution_loop if recovery is desired.
+    invoking execution_loop if recovery is desired. If the pipeline has a
+    checkpoint store, in-progress tasks with a checkpoint are resumed first.
 
     Args:
         queue_path: Path to queue.json file.
@@ -553,6 +1045,11 @@ def execution_loop(
     results: list[ExecutionResult] = []
     tasks_processed = 0
 
+    if pipeline is not None and pipeline.checkpoint_store is not None:
+        for result in _resume_checkpointed_tasks(queue_manager, pipeline, max_tasks):
+            results.append(result)
+            tasks_processed += 1
+
     while True:
         if max_tasks and tasks_processed >= max_tasks:
             logger.info(f"Reached max_tasks limit: {max_tasks}")
@@ -0,0 +1,295 @@
+"""Worker mode for running pipelines on several build machines.
+
+This module provides the FleetMirror and FleetWorktreeManager classes
+which let a TaskPipeline run on a node that does not hold the main
+repository. The main repository lives on a coordinator (any git URL; a
+local bare repository works for tests), and each node keeps:
+
+- a local bare mirror of the coordinator's target branch, created once
+  with `git clone --bare`; with a reference repository (e.g. a shared
+  object store on the node or a read-only network snapshot) the mirror
+  borrows its objects through alternates instead of copying the history
+- a fetch of only the missing objects before each task, so the task's
+  base commit is the coordinator's current target tip
+- task worktrees created from the mirror, as with a local repository
+
+Instead of merging locally, a finished task branch is pushed to the
+coordinator under the same name, where a MergeQueue (or
+WorktreeManager.merge) running next to the coordinator repository lands
+it. Only new objects cross the network in either direction, so adding a
+node adds throughput without re-cloning the full history.
+
+A pushed branch is not yet landed. merge() therefore waits until the
+coordinator's target branch contains the work (the pushed commit, or the
+commit the coordinator's MergeQueue rebased it to and recorded on the
+branch) before reporting success. Dependents are gated on that: the
+execution loop only marks a task complete, and so only unblocks its
+dependents, after a successful merge, and the dependents' worktrees are
+created from the freshly synced target tip that contains it. A branch
+that has not landed within land_timeout gives a failed MergeResult with
+pending=True; the task is then blocked, even though the coordinator may
+still land the branch later.
+
+Example:
+    mirror = FleetMirror("ssh://coordinator/srv/repo.git", "/var/cache/hc/repo.git",
+                         reference="/var/cache/hc/objects.git")
+    manager = FleetWorktreeManager(mirror)
+    pipeline = TaskPipeline(worktree_manager=manager, ...)
+"""
+
+import fcntl
+import logging
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from orchestrator.cancellation import current_token, sleep
+from orchestrator.git_plumbing import GitCommandError, is_ancestor, rev_parse, run_git
+from orchestrator.worktree import MergeResult, WorktreeManager
+
+logger = logging.getLogger(__name__)
+
+
+class FleetMirror:
+    """Local bare mirror of a coordinator repository.
+
+    Attributes:
+        coordinator_url: Git URL of the coordinator repository.
+        path: Path of the local bare mirror.
+        reference: Optional repository whose objects the mirror borrows
+            (via objects/info/alternates) instead of fetching them.
+        target_branch: Branch tasks are based on.
+        filter: Optional partial-clone filter (e.g. 'blob:none'); blobs are
+            then fetched on demand when worktrees are checked out.
+    """
+
+    def __init__(
+        self,
+        coordinator_url: str,
+        path: str,
+        reference: Optional[str] = None,
+        target_branch: str = "main",
+        filter: Optional[str] = None,
+    ) -> None:
+        """Initialize FleetMirror.
+
+        Args:
+            coordinator_url: Git URL (or path) of the coordinator repository.
+            path: Where to keep the local bare mirror.
+            reference: Optional reference repository for alternates.
+            target_branch: Branch tasks are based on.
+            filter: Optional partial-clone filter spec.
+        """
+        self.coordinator_url = coordinator_url
+        self.path = Path(path).resolve()
+        self.reference = reference
+        self.target_branch = target_branch
+        self.filter = filter
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by all workers using this mirror."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lock_path = self.path.parent / f"{self.path.name}.hc_lock"
+        with open(lock_path, "w") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def ensure(self) -> Path:
+        """Create the mirror if it does not exist yet.
+
+        Returns:
+            Path of the mirror.
+
+        Raises:
+            GitCommandError: If cloning fails.
+        """
+        with self._lock():
+            if (self.path / "HEAD").exists():
+                return self.path
+
+            logger.info(f"Creating mirror of {self.coordinator_url} at {self.path}")
+            args = [
+                "clone", "--bare", "--quiet", "--no-local", "--no-tags",
+                "--single-branch", "--branch", self.target_branch,
+            ]
+            if self.reference:
+                args.extend(["--reference-if-able", self.reference])
+            if self.filter:
+                args.append(f"--filter={self.filter}")
+            args.extend([self.coordinator_url, str(self.path)])
+            run_git(self.path.parent, args)
+
+            # A bare clone has no fetch refspec; track only the target branch
+            run_git(
+                self.path,
+                [
+                    "config", "remote.origin.fetch",
+                    f"+refs/heads/{self.target_branch}:refs/heads/{self.target_branch}",
+                ],
+            )
+        return self.path
+
+    def sync(self, base: Optional[str] = None) -> str:
+        """Bring the target branch (and optionally a base commit) up to date.
+
+        Fetches only the objects the mirror does not have yet. A base
+        commit that is already present costs no network round trip.
+
+        Args:
+            base: Optional commit the next task must be based on.
+
+        Returns:
+            OID of the mirror's target branch after the fetch.
+
+        Raises:
+            GitCommandError: If the fetch fails or the target branch is missing.
+        """
+        self.ensure()
+        with self._lock():
+            if base is not None and rev_parse(self.path, base) is not None:
+                tip = rev_parse(self.path, f"refs/heads/{self.target_branch}")
+                if tip is not None:
+                    return tip
+
+            run_git(self.path, ["fetch", "--quiet", "--no-tags", "origin"])
+            if base is not None and rev_parse(self.path, base) is None:
+                run_git(self.path, ["fetch", "--quiet", "--no-tags", "origin", base])
+
+        tip = rev_parse(self.path, f"refs/heads/{self.target_branch}")
+        if tip is None:
+            raise GitCommandError(
+                ["rev-parse", self.target_branch], 1,
+                f"Target branch '{self.target_branch}' missing in mirror",
+            )
+        return tip
+
+    def push(self, branch: str) -> str:
+        """Push a result branch to the coordinator under the same name.
+
+        Args:
+            branch: Branch name in the mirror (e.g. 'feature/T001_attempt_1').
+
+        Returns:
+            OID that was pushed.
+
+        Raises:
+            GitCommandError: If the branch is missing or the push fails.
+        """
+        tip = rev_parse(self.path, f"refs/heads/{branch}")
+        if tip is None:
+            raise GitCommandError(["push", branch], 1, f"Branch '{branch}' not found")
+        run_git(
+            self.path,
+            ["push", "--quiet", "origin", f"+refs/heads/{branch}:refs/heads/{branch}"],
+        )
+        logger.info(f"Pushed '{branch}' ({tip[:12]}) to {self.coordinator_url}")
+        return tip
+
+    def landed(self, branch: str, tip: str) -> Optional[str]:
+        """Check whether the coordinator has landed a pushed branch.
+
+        The branch counts as landed once the coordinator's target branch
+        contains the pushed tip, or the commit the coordinator moved the
+        branch to (MergeQueue points it at the rebased commit it landed).
+
+        Args:
+            branch: Branch name that was pushed.
+            tip: OID that was pushed.
+
+        Returns:
+            The coordinator's target tip if the branch has landed, else None.
+
+        Raises:
+            GitCommandError: If fetching from the coordinator fails.
+        """
+        target_tip = self.sync()
+        if is_ancestor(self.path, tip, target_tip):
+            return target_tip
+        remote = run_git(
+            self.path, ["ls-remote", "origin", f"refs/heads/{branch}"], check=False
+        ).stdout.split()
+        if (
+            remote
+            and remote[0] != tip
+            and rev_parse(self.path, remote[0]) is not None
+            and is_ancestor(self.path, remote[0], target_tip)
+        ):
+            return target_tip
+        return None
+
+
+class FleetWorktreeManager(WorktreeManager):
+    """WorktreeManager for a worker node backed by a FleetMirror.
+
+    create() syncs the mirror first, so every task starts from the
+    coordinator's current target tip. merge() pushes the task branch to
+    the coordinator instead of merging locally, then waits until the
+    coordinator has landed it; the worktree is cleaned up once it has.
+    """
+
+    def __init__(
+        self,
+        mirror: FleetMirror,
+        land_timeout: float = 600.0,
+        poll_interval: float = 5.0,
+        **kwargs,
+    ) -> None:
+        """Initialize FleetWorktreeManager.
+
+        Args:
+            mirror: Mirror of the coordinator repository.
+            land_timeout: Seconds to wait for the coordinator to land a
+                pushed branch before reporting it as pending.
+            poll_interval: Seconds between checks of the coordinator.
+            **kwargs: Passed on to WorktreeManager (worktree_base, pool, ...).
+        """
+        self.mirror = mirror
+        self.land_timeout = land_timeout
+        self.poll_interval = poll_interval
+        super().__init__(str(mirror.ensure()), **kwargs)
+
+    def create(
+        self, task_id: str, attempt: int = 1, files: Optional[list[str]] = None
+    ) -> str:
+        """Sync the mirror, then create the task's worktree from it.
+
+        See WorktreeManager.create for arguments and errors.
+        """
+        self.mirror.sync()
+        return super().create(task_id, attempt=attempt, files=files)
+
+    def _land(self, task_id: str, branch_name: str, target_branch: str) -> MergeResult:
+        """Push the task branch to the coordinator and wait until it has landed."""
+        try:
+            tip = self.mirror.push(branch_name)
+        except GitCommandError as e:
+            return MergeResult(success=False, message=f"Push to coordinator failed: {e}")
+
+        deadline = time.monotonic() + self.land_timeout
+        while True:
+            try:
+                target_tip = self.mirror.landed(branch_name, tip)
+            except GitCommandError as e:
+                logger.warning(f"Cannot check whether '{branch_name}' landed: {e}")
+                target_tip = None
+            if target_tip is not None:
+                return MergeResult(
+                    success=True,
+                    message=f"Coordinator landed '{branch_name}' on '{target_branch}'",
+                    commit=target_tip,
+                )
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return MergeResult(
+                    success=False,
+                    message=f"Pushed '{branch_name}' to coordinator, but it did not "
+                    f"land on '{target_branch}' within {self.land_timeout:.0f}s",
+                    commit=tip,
+                    pending=True,
+                )
+            sleep(min(self.poll_interval, left), current_token())
@@ -0,0 +1,623 @@
+"""Git plumbing helpers for ref-level operations.
+
+This module wraps the low-level git commands used to compute merges and
+move refs without checking anything out:
+- merge-tree --write-tree: three-way merge computed purely on trees
+- commit-tree: create a commit object from a tree
+- update-ref: move a ref atomically, optionally guarded by its old value
+
+None of these helpers touch a working tree or index, so they are safe to
+call against the main repository while the user (or other workers) have
+it checked out. The one exception is land_ref(): when the branch it moves
+is checked out in a worktree, that (clean) checkout is moved along with
+the ref, so its index and files do not silently revert the landed work.
+
+GitSession batches the frequent, cheap operations to avoid one fork per
+call: revisions are resolved through a long-lived `cat-file --batch-check`
+process, objects are read through `cat-file --batch`, refs are listed with
+a single `for-each-ref` and deleted/updated in one `update-ref --stdin`
+transaction. Every git process started by this module is counted (see
+fork_count()).
+"""
+
+import logging
+import os
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from orchestrator.cancellation import CancellationToken, OperationCancelled, current_token
+from orchestrator.tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+_fork_lock = threading.Lock()
+_fork_count = 0
+
+
+def _count_fork() -> None:
+    """Record that a git process was started."""
+    global _fork_count
+    with _fork_lock:
+        _fork_count += 1
+
+
+def fork_count() -> int:
+    """Number of git processes started by this module since the last reset."""
+    with _fork_lock:
+        return _fork_count
+
+
+def reset_fork_count() -> None:
+    """Reset the git process counter (e.g. at the start of a benchmark)."""
+    global _fork_count
+    with _fork_lock:
+        _fork_count = 0
+
+
+class GitCommandError(Exception):
+    """Raised when a git plumbing command fails unexpectedly.
+
+    Attributes:
+        git_args: The git arguments that were run.
+        returncode: Exit code of the git process.
+        stderr: Captured stderr output.
+    """
+
+    def __init__(self, args: list[str], returncode: int, stderr: str) -> None:
+        self.git_args = args
+        self.returncode = returncode
+        self.stderr = stderr
+        super().__init__(
+            f"git {' '.join(args)} failed with exit code {returncode}: {stderr.strip()}"
+        )
+
+
+class CheckedOutTargetError(Exception):
+    """Raised when a branch cannot be moved because of its checkout.
+
+    The branch is checked out in a worktree with uncommitted changes, or
+    the checkout could not be updated to the new commit.
+    """
+
+    pass
+
+
+@dataclass
+class MergeTreeResult:
+    """Result of a tree-level three-way merge.
+
+    Attributes:
+        tree: OID of the merged tree (contains conflict markers if not clean).
+        clean: Whether the merge completed without conflicts.
+        conflicts: Paths that could not be merged automatically.
+    """
+
+    tree: str
+    clean: bool
+    conflicts: list[str] = field(default_factory=list)
+
+
+def run_git(
+    repo_path: str | Path,
+    args: list[str],
+    check: bool = True,
+    input: Optional[str] = None,
+    env: Optional[dict[str, str]] = None,
+    cancel_token: Optional[CancellationToken] = None,
+) -> subprocess.CompletedProcess:
+    """Run a git command in a repository and capture its output.
+
+    Git runs with LC_ALL=C, so callers can match its (untranslated) error
+    messages. Each invocation is recorded as a 'git' tracing span. If a
+    cancellation token is active (passed explicitly or via current_token()), the command
+    is not started once the token has fired and is killed when the token's
+    deadline passes.
+
+    Args:
+        repo_path: Repository (or worktree) to run the command in.
+        args: Arguments passed to git (without the leading 'git').
+        check: Raise GitCommandError on a non-zero exit code.
+        input: Optional text passed on stdin.
+        env: Optional full environment for the git process (LC_ALL is
+            still set to C).
+        cancel_token: Token bounding the command (defaults to current_token()).
+
+    Returns:
+        CompletedProcess with text stdout/stderr.
+
+    Raises:
+        GitCommandError: If check is True and git exits non-zero.
+        OperationCancelled: If the token fired before or during the command.
+    """
+    token = cancel_token or current_token()
+    timeout = None
+    if token is not None:
+        token.raise_if_cancelled()
+        timeout = token.remaining()
+
+    env = {**(os.environ if env is None else env), "LC_ALL": "C"}
+
+    _count_fork()
+    with get_tracer().span("git", "git", command=args[0] if args else "") as span:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=str(repo_path),
+                capture_output=True,
+                text=True,
+                input=input,
+                env=env,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            span.set_outcome("cancelled")
+            raise OperationCancelled(
+                token.reason or f"git {args[0] if args else ''} exceeded its deadline"
+            )
+        span.set_attribute("returncode", result.returncode)
+        if result.returncode != 0:
+            span.set_outcome("error")
+    if check and result.returncode != 0:
+        raise GitCommandError(args, result.returncode, result.stderr)
+    return result
+
+
+def rev_parse(repo_path: str | Path, rev: str) -> Optional[str]:
+    """Resolve a revision to a commit OID.
+
+    Args:
+        repo_path: Repository path.
+        rev: Revision name (branch, ref, or OID).
+
+    Returns:
+        Full commit OID, or None if the revision does not exist.
+    """
+    result = run_git(
+        repo_path, ["rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"], check=False
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def is_ancestor(repo_path: str | Path, ancestor: str, descendant: str) -> bool:
+    """Check whether one commit is an ancestor of another.
+
+    Args:
+        repo_path: Repository path.
+        ancestor: Candidate ancestor commit.
+        descendant: Candidate descendant commit.
+
+    Returns:
+        True if ancestor is reachable from descendant (or they are equal).
+    """
+    result = run_git(
+        repo_path, ["merge-base", "--is-ancestor", ancestor, descendant], check=False
+    )
+    return result.returncode == 0
+
+
+def merge_base(repo_path: str | Path, a: str, b: str) -> Optional[str]:
+    """Find the best common ancestor of two commits.
+
+    Args:
+        repo_path: Repository path.
+        a: First commit.
+        b: Second commit.
+
+    Returns:
+        Merge base OID, or None if the histories are unrelated.
+    """
+    result = run_git(repo_path, ["merge-base", a, b], check=False)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def merge_tree(repo_path: str | Path, ours: str, theirs: str) -> MergeTreeResult:
+    """Compute a three-way merge of two commits without a working tree.
+
+    Uses ``git merge-tree --write-tree`` (git >= 2.38). The merge base is
+    computed by git from the two commits.
+
+    Args:
+        repo_path: Repository path.
+        ours: Commit the result should be based on (e.g. the target branch).
+        theirs: Commit whose changes are merged in.
+
+    Returns:
+        MergeTreeResult with the merged tree and any conflicted paths.
+
+    Raises:
+        GitCommandError: If merge-tree fails for a reason other than conflicts.
+    """
+    result = run_git(
+        repo_path,
+        ["merge-tree", "--write-tree", "--name-only", "--no-messages", ours, theirs],
+        check=False,
+    )
+    # Exit code 1 means conflicts; anything else non-zero is a real error
+    if result.returncode not in (0, 1):
+        raise GitCommandError(
+            ["merge-tree", "--write-tree", ours, theirs],
+            result.returncode,
+            result.stderr,
+        )
+
+    lines = [line for line in result.stdout.split("\n") if line]
+    tree = lines[0] if lines else ""
+    conflicts = lines[1:] if result.returncode == 1 else []
+    return MergeTreeResult(tree=tree, clean=result.returncode == 0, conflicts=conflicts)
+
+
+def commit_identity(repo_path: str | Path, rev: str) -> tuple[dict[str, str], str]:
+    """Read the author identity and message of a commit.
+
+    Args:
+        repo_path: Repository path.
+        rev: Commit to read.
+
+    Returns:
+        Tuple of (author environment variables, commit message). The
+        environment contains GIT_AUTHOR_NAME, GIT_AUTHOR_EMAIL and
+        GIT_AUTHOR_DATE so that commit_tree can preserve authorship.
+    """
+    result = run_git(repo_path, ["log", "-1", "--format=%an%x00%ae%x00%ad%x00%B", rev])
+    name, email, date, message = result.stdout.split("\x00", 3)
+    author_env = {
+        "GIT_AUTHOR_NAME": name,
+        "GIT_AUTHOR_EMAIL": email,
+        "GIT_AUTHOR_DATE": date,
+    }
+    return author_env, message.rstrip("\n") + "\n"
+
+
+def commit_tree(
+    repo_path: str | Path,
+    tree: str,
+    parents: list[str],
+    message: str,
+    author_env: Optional[dict[str, str]] = None,
+) -> str:
+    """Create a commit object from a tree.
+
+    Args:
+        repo_path: Repository path.
+        tree: Tree OID for the commit.
+        parents: Parent commit OIDs.
+        message: Commit message.
+        author_env: Optional GIT_AUTHOR_* variables to preserve authorship.
+
+    Returns:
+        OID of the new commit.
+    """
+    env = None
+    if author_env:
+        env = {**os.environ, **author_env}
+
+    args = ["commit-tree", tree]
+    for parent in parents:
+        args.extend(["-p", parent])
+
+    result = run_git(repo_path, args, input=message, env=env)
+    return result.stdout.strip()
+
+
+def update_ref(
+    repo_path: str | Path,
+    ref: str,
+    new_value: str,
+    old_value: Optional[str] = None,
+    reason: Optional[str] = None,
+) -> bool:
+    """Move a ref atomically, optionally guarded by its expected old value.
+
+    Args:
+        repo_path: Repository path.
+        ref: Full ref name (e.g. 'refs/heads/main').
+        new_value: OID the ref should point to.
+        old_value: Expected current OID. If the ref has moved, nothing is
+            written and False is returned.
+        reason: Optional reflog message.
+
+    Returns:
+        True if the ref was updated, False if the old value did not match.
+    """
+    args = ["update-ref"]
+    if reason:
+        args.extend(["-m", reason])
+    args.extend([ref, new_value])
+    if old_value is not None:
+        args.append(old_value)
+
+    result = run_git(repo_path, args, check=False)
+    if result.returncode != 0:
+        logger.info(f"update-ref {ref} rejected: {result.stderr.strip()}")
+        return False
+    return True
+
+
+def checked_out_worktree(repo_path: str | Path, ref: str) -> Optional[Path]:
+    """Find the non-bare worktree that has a branch checked out.
+
+    Args:
+        repo_path: Repository path.
+        ref: Full branch ref name (e.g. 'refs/heads/main').
+
+    Returns:
+        Path of the worktree, or None if the branch is not checked out.
+    """
+    result = run_git(repo_path, ["worktree", "list", "--porcelain"], check=False)
+    for entry in result.stdout.split("\n\n"):
+        lines = entry.splitlines()
+        if f"branch {ref}" in lines and "bare" not in lines:
+            for line in lines:
+                if line.startswith("worktree "):
+                    return Path(line[len("worktree "):])
+    return None
+
+
+def land_ref(
+    repo_path: str | Path,
+    ref: str,
+    new_value: str,
+    old_value: str,
+    reason: Optional[str] = None,
+) -> bool:
+    """Move a branch like update_ref(), keeping a checkout of it consistent.
+
+    If the branch is checked out in a worktree, the worktree must be clean;
+    its index and files are then moved from old_value to new_value with
+    `read-tree -m -u`. If that fails, the ref is moved back.
+
+    Args:
+        repo_path: Repository path.
+        ref: Full branch ref name.
+        new_value: OID the branch should point to.
+        old_value: Expected current OID.
+        reason: Optional reflog message.
+
+    Returns:
+        True if the branch was moved, False if it no longer pointed at
+        old_value.
+
+    Raises:
+        CheckedOutTargetError: If the branch is checked out with
+            uncommitted changes, or its checkout could not be updated.
+    """
+    worktree = checked_out_worktree(repo_path, ref)
+    if worktree is not None:
+        status = run_git(
+            worktree, ["status", "--porcelain", "--untracked-files=no"], check=False
+        )
+        if status.returncode != 0 or status.stdout.strip():
+            raise CheckedOutTargetError(
+                f"'{ref}' is checked out in {worktree} with uncommitted changes; "
+                f"commit or stash them before merging"
+            )
+
+    if not update_ref(repo_path, ref, new_value, old_value, reason=reason):
+        return False
+
+    if worktree is not None:
+        result = run_git(
+            worktree, ["read-tree", "-m", "-u", old_value, new_value], check=False
+        )
+        if result.returncode != 0:
+            update_ref(repo_path, ref, old_value, new_value, reason="revert: checkout not updated")
+            raise CheckedOutTargetError(
+                f"Cannot update the checkout of '{ref}' in {worktree}: "
+                f"{result.stderr.strip()}"
+            )
+    return True
+
+
+def diff_names(repo_path: str | Path, a: str, b: str) -> set[str]:
+    """List paths that differ between two commits.
+
+    Args:
+        repo_path: Repository path.
+        a: Old commit.
+        b: New commit.
+
+    Returns:
+        Set of repository-relative paths changed between a and b.
+    """
+    result = run_git(repo_path, ["diff", "--name-only", "--no-renames", a, b])
+    return {line for line in result.stdout.split("\n") if line}
+
+
+class GitSession:
+    """Long-lived git helper processes for one repository.
+
+    The cat-file processes are started on first use and shared by all
+    threads (each request/response is serialized by a lock). Ref lookups
+    are always fresh: cat-file re-reads refs for every request.
+
+    Example:
+        with GitSession("/path/to/repo") as git:
+            tip = git.rev_parse("refs/heads/main")
+            git.delete_refs(git.list_refs("refs/heads/feature/T001_attempt_*"))
+    """
+
+    def __init__(self, repo_path: str | Path) -> None:
+        """Initialize GitSession.
+
+        Args:
+            repo_path: Repository (or worktree) path.
+        """
+        self.repo_path = Path(repo_path)
+        self._lock = threading.Lock()
+        self._check: Optional[subprocess.Popen] = None
+        self._batch: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "GitSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _start(self, mode: str) -> subprocess.Popen:
+        """Start a cat-file process in the given batch mode."""
+        _count_fork()
+        return subprocess.Popen(
+            ["git", "cat-file", mode],
+            cwd=str(self.repo_path),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    @staticmethod
+    def _ask(process: subprocess.Popen, request: str) -> Optional[list[str]]:
+        """Send one request line and parse the header line of the reply."""
+        process.stdin.write(request.encode() + b"\n")
+        process.stdin.flush()
+        header = process.stdout.readline().decode().split()
+        if not header:
+            raise GitCommandError(["cat-file", "--batch"], -1, "cat-file process exited")
+        if len(header) != 3 or header[1] in ("missing", "ambiguous"):
+            return None
+        return header
+
+    def object_info(self, rev: str) -> Optional[tuple[str, str, int]]:
+        """Resolve a revision expression without forking.
+
+        Args:
+            rev: Any revision expression cat-file accepts (e.g. 'main',
+                'HEAD:path/to/file', 'abc123^{tree}').
+
+        Returns:
+            Tuple of (oid, object type, size), or None if it does not resolve.
+        """
+        if "\n" in rev:
+            return None
+        with self._lock:
+            if self._check is None or self._check.poll() is not None:
+                self._check = self._start("--batch-check")
+            header = self._ask(self._check, rev)
+        if header is None:
+            return None
+        return header[0], header[1], int(header[2])
+
+    def rev_parse(self, rev: str) -> Optional[str]:
+        """Resolve a revision to a commit OID (like rev_parse()) without forking.
+
+        Args:
+            rev: Revision name (branch, ref, or OID).
+
+        Returns:
+            Full commit OID, or None if the revision does not exist.
+        """
+        info = self.object_info(f"{rev}^{{commit}}")
+        return info[0] if info else None
+
+    def read_object(self, rev: str) -> Optional[bytes]:
+        """Read an object's raw content through the shared cat-file process.
+
+        Args:
+            rev: Revision expression for the object (e.g. 'HEAD:setup.py').
+
+        Returns:
+            Object content, or None if it does not resolve.
+        """
+        if "\n" in rev:
+            return None
+        with self._lock:
+            if self._batch is None or self._batch.poll() is not None:
+                self._batch = self._start("--batch")
+            header = self._ask(self._batch, rev)
+            if header is None:
+                return None
+            content = self._batch.stdout.read(int(header[2]))
+            self._batch.stdout.read(1)  # trailing newline
+        return content
+
+    def list_refs(self, *patterns: str) -> dict[str, str]:
+        """List refs matching patterns with a single for-each-ref.
+
+        Args:
+            *patterns: for-each-ref patterns (e.g. 'refs/heads/feature/T1_*').
+
+        Returns:
+            Dict mapping full ref name to OID.
+        """
+        result = run_git(
+            self.repo_path,
+            ["for-each-ref", "--format=%(objectname) %(refname)", *patterns],
+        )
+        refs = {}
+        for line in result.stdout.splitlines():
+            oid, _, ref = line.partition(" ")
+            if ref:
+                refs[ref] = oid
+        return refs
+
+    def update_refs(
+        self,
+        updates: dict[str, Optional[str]],
+        old_values: Optional[dict[str, str]] = None,
+    ) -> bool:
+        """Update and delete several refs in one atomic update-ref transaction.
+
+        Args:
+            updates: Ref name -> new OID, or None to delete the ref.
+            old_values: Optional expected current OIDs; the whole
+                transaction fails if any ref has moved.
+
+        Returns:
+            True if the transaction was committed, False if it was rejected
+            (e.g. an expected old value did not match).
+        """
+        if not updates:
+            return True
+        old_values = old_values or {}
+        lines = ["start"]
+        for ref, new in updates.items():
+            old = old_values.get(ref, "")
+            if new is None:
+                lines.append(f"delete {ref} {old}".rstrip())
+            else:
+                lines.append(f"update {ref} {new} {old}".rstrip())
+        lines += ["prepare", "commit"]
+        result = run_git(
+            self.repo_path,
+            ["update-ref", "--stdin"],
+            check=False,
+            input="\n".join(lines) + "\n",
+        )
+        if result.returncode != 0:
+            logger.debug(f"update-ref transaction rejected: {result.stderr.strip()}")
+            return False
+        return True
+
+    def delete_refs(self, refs: dict[str, str] | list[str]) -> bool:
+        """Delete refs in one transaction.
+
+        Args:
+            refs: Ref names, or a dict of ref name -> expected OID (as
+                returned by list_refs) to guard against concurrent updates.
+
+        Returns:
+            True if all refs were deleted.
+        """
+        if isinstance(refs, dict):
+            return self.update_refs(dict.fromkeys(refs), old_values=refs)
+        return self.update_refs(dict.fromkeys(refs))
+
+    def close(self) -> None:
+        """Stop the helper processes."""
+        with self._lock:
+            for process in (self._check, self._batch):
+                if process is not None and process.poll() is None:
+                    process.stdin.close()
+                    try:
+                        process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+                        process.wait()
+            self._check = None
+            self._batch = None
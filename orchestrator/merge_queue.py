@@ -0,0 +1,328 @@
+"""Serialized merge queue for parallel workers.
+
+This module provides the MergeQueue class which lands completed task
+branches on a target branch one at a time, in submission order.
+
+For each branch the queue:
+- Rebases the branch onto the current target tip with tree-level plumbing
+  (merge-tree/commit-tree), never checking anything out in the main repo
+- Re-runs the task's tests only if the commits it was rebased over touched
+  files the tests depend on
+- Fast-forwards the target ref atomically with update-ref, guarded by the
+  tip it was rebased onto (git_plumbing.land_ref)
+
+Unlike WorktreeManager.merge, which lands each branch independently with
+a merge commit when the target has moved, the queue keeps history linear
+and re-runs affected tests before landing a rebased branch.
+
+Note:
+    If the target branch is checked out in a worktree (e.g. the main
+    repo), that checkout must be clean; it is moved to the new tip along
+    with the ref. With uncommitted changes there, the merge is refused.
+
+    The rebase is squashed: the branch's net change is replayed as a single
+    commit carrying the tip commit's author and message. Task branches
+    carry one commit per attempt, so this matches a regular rebase in
+    practice.
+"""
+
+import fcntl
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, Optional, TYPE_CHECKING
+
+from orchestrator import git_plumbing
+from orchestrator.cancellation import OperationCancelled, current_token
+from orchestrator.git_plumbing import GitCommandError
+from orchestrator.worktree import MergeResult
+
+if TYPE_CHECKING:
+    from orchestrator.pytest_runner import PytestRunner
+
+logger = logging.getLogger(__name__)
+
+# How often a waiting submission checks its cancellation token
+_CANCEL_POLL_INTERVAL = 0.25
+
+
+@dataclass
+class MergeRequest:
+    """A completed task branch waiting to be merged.
+
+    Attributes:
+        task_id: ID of the task that produced the branch.
+        branch: Branch name to merge (e.g. 'feature/T001_attempt_1').
+        target_branch: Branch to land the change on.
+        test_paths: Test files for the task, relative to the repo root.
+        files: Files the task's tests depend on, relative to the repo root.
+        worktree_path: Task worktree used to re-run tests after a rebase.
+    """
+
+    task_id: str
+    branch: str
+    target_branch: str = "main"
+    test_paths: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    worktree_path: Optional[str] = None
+
+
+class MergeQueue:
+    """Lands task branches on a target branch in FIFO order.
+
+    Submissions from multiple threads are processed strictly in the order
+    they arrive. A lock file in the repository's git directory additionally
+    serializes queues running in separate processes.
+
+    Attributes:
+        repo_path: Path to the main git repository.
+        pytest_runner: Optional PytestRunner used to re-run tests after a
+            rebase. If None, rebased branches are merged without re-testing.
+        max_ref_retries: Attempts to land a branch if the target ref moves
+            underneath the queue (e.g. a merge from outside the queue).
+
+    Example:
+        queue = MergeQueue("/path/to/repo", pytest_runner=PytestRunner())
+        result = queue.submit(MergeRequest(task_id="T001", branch="feature/T001_attempt_1"))
+    """
+
+    def __init__(
+        self,
+        repo_path: str,
+        pytest_runner: Optional["PytestRunner"] = None,
+        max_ref_retries: int = 5,
+    ) -> None:
+        """Initialize MergeQueue.
+
+        Args:
+            repo_path: Path to the main git repository.
+            pytest_runner: PytestRunner for post-rebase test runs (optional).
+            max_ref_retries: Attempts before giving up on a moving target ref.
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.pytest_runner = pytest_runner
+        self.max_ref_retries = max_ref_retries
+
+        self._git = git_plumbing.GitSession(self.repo_path)
+
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._now_serving = 0
+        # Tickets whose submitter was cancelled while waiting for its turn
+        self._abandoned: set[int] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of submissions waiting or in progress."""
+        with self._cond:
+            return self._next_ticket - self._now_serving - len(self._abandoned)
+
+    def submit(self, request: MergeRequest) -> MergeResult:
+        """Submit a branch and block until it has been processed.
+
+        If a cancellation token is active, the submission gives up its
+        place in the queue as soon as the token fires.
+
+        Args:
+            request: MergeRequest describing the branch to land.
+
+        Returns:
+            MergeResult with success status, message, and the landed commit.
+
+        Raises:
+            OperationCancelled: If the current token fires while waiting.
+        """
+        token = current_token()
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._now_serving:
+                if token is not None and token.cancelled:
+                    self._abandoned.add(ticket)
+                    raise OperationCancelled(token.reason)
+                self._cond.wait(_CANCEL_POLL_INTERVAL if token is not None else None)
+
+        try:
+            with self._repo_lock():
+                return self._process(request)
+        except GitCommandError as e:
+            logger.error(f"Merge queue git error for '{request.task_id}': {e}")
+            return MergeResult(success=False, message=f"Merge queue git error: {e}")
+        finally:
+            with self._cond:
+                self._now_serving += 1
+                while self._now_serving in self._abandoned:
+                    self._abandoned.discard(self._now_serving)
+                    self._now_serving += 1
+                self._cond.notify_all()
+
+    @contextmanager
+    def _repo_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by all queues on this repository."""
+        git_dir = git_plumbing.run_git(
+            self.repo_path, ["rev-parse", "--git-common-dir"]
+        ).stdout.strip()
+        lock_path = (self.repo_path / git_dir).resolve() / "hc_merge_queue.lock"
+
+        with open(lock_path, "w") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _process(self, request: MergeRequest) -> MergeResult:
+        """Rebase, optionally re-test, and fast-forward one branch."""
+        target_ref = f"refs/heads/{request.target_branch}"
+        branch_ref = f"refs/heads/{request.branch}"
+
+        branch_tip = self._git.rev_parse(branch_ref)
+        if branch_tip is None:
+            return MergeResult(
+                success=False, message=f"Branch '{request.branch}' not found"
+            )
+
+        logger.info(
+            f"Merge queue: landing '{request.branch}' on '{request.target_branch}'"
+        )
+
+        for _ in range(self.max_ref_retries):
+            target_tip = self._git.rev_parse(target_ref)
+            if target_tip is None:
+                return MergeResult(
+                    success=False,
+                    message=f"Target branch '{request.target_branch}' not found",
+                )
+
+            new_tip = branch_tip
+            rebased = False
+            tests_rerun = False
+
+            if not git_plumbing.is_ancestor(self.repo_path, target_tip, branch_tip):
+                rebase = self._rebase(request, branch_tip, target_tip)
+                if isinstance(rebase, MergeResult):
+                    return rebase
+                new_tip, upstream_changes = rebase
+                rebased = True
+
+                if self._needs_retest(request, upstream_changes):
+                    if not git_plumbing.update_ref(
+                        self.repo_path, branch_ref, new_tip, branch_tip,
+                        reason="hc merge-queue: rebase",
+                    ):
+                        return MergeResult(
+                            success=False,
+                            message=f"Branch '{request.branch}' changed during merge",
+                        )
+                    branch_tip = new_tip
+                    tests_rerun = True
+                    failure = self._rerun_tests(request, new_tip)
+                    if failure:
+                        return MergeResult(
+                            success=False,
+                            message=f"Tests failed after rebase onto "
+                            f"'{request.target_branch}': {failure}",
+                            commit=new_tip,
+                            rebased=True,
+                            tests_rerun=True,
+                        )
+
+            try:
+                landed = git_plumbing.land_ref(
+                    self.repo_path, target_ref, new_tip, target_tip,
+                    reason=f"hc merge-queue: {request.task_id}",
+                )
+            except git_plumbing.CheckedOutTargetError as e:
+                return MergeResult(success=False, message=f"Merge failed: {e}")
+            if landed:
+                # Keep the task branch pointing at what actually landed
+                if new_tip != branch_tip:
+                    git_plumbing.update_ref(self.repo_path, branch_ref, new_tip, branch_tip)
+                logger.info(
+                    f"Merge queue: '{request.branch}' landed at {new_tip[:12]}"
+                    f"{' (rebased)' if rebased else ''}"
+                )
+                return MergeResult(
+                    success=True,
+                    message=f"Successfully merged '{request.branch}' into "
+                    f"'{request.target_branch}'",
+                    commit=new_tip,
+                    rebased=rebased,
+                    tests_rerun=tests_rerun,
+                )
+
+            # Target moved outside the queue - rebase again onto the new tip
+            logger.info(f"Target '{request.target_branch}' moved, retrying")
+
+        return MergeResult(
+            success=False,
+            message=f"Target branch '{request.target_branch}' kept moving; "
+            f"gave up after {self.max_ref_retries} attempts",
+        )
+
+    def _rebase(
+        self, request: MergeRequest, branch_tip: str, target_tip: str
+    ) -> tuple[str, set[str]] | MergeResult:
+        """Replay the branch's net change onto the target tip.
+
+        Returns:
+            Tuple of (new commit OID, paths changed upstream since the branch
+            point), or a failed MergeResult on conflicts.
+        """
+        base = git_plumbing.merge_base(self.repo_path, target_tip, branch_tip)
+        if base is None:
+            return MergeResult(
+                success=False,
+                message=f"Branch '{request.branch}' shares no history with "
+                f"'{request.target_branch}'",
+            )
+
+        merged = git_plumbing.merge_tree(self.repo_path, target_tip, branch_tip)
+        if not merged.clean:
+            return MergeResult(
+                success=False,
+                message=f"Rebase conflict in: {', '.join(merged.conflicts)}",
+            )
+
+        author_env, message = git_plumbing.commit_identity(self.repo_path, branch_tip)
+        new_tip = git_plumbing.commit_tree(
+            self.repo_path, merged.tree, [target_tip], message, author_env
+        )
+        upstream_changes = git_plumbing.diff_names(self.repo_path, base, target_tip)
+        return new_tip, upstream_changes
+
+    def _needs_retest(self, request: MergeRequest, upstream_changes: set[str]) -> bool:
+        """Whether upstream changes touch anything the task's tests depend on."""
+        if self.pytest_runner is None or not request.test_paths:
+            return False
+
+        watched = [p.rstrip("/") for p in request.test_paths + request.files]
+        for changed in upstream_changes:
+            for path in watched:
+                if changed == path or changed.startswith(path + "/"):
+                    return True
+        return False
+
+    def _rerun_tests(self, request: MergeRequest, commit: str) -> Optional[str]:
+        """Re-run the task's tests at the rebased commit.
+
+        Returns:
+            None if all tests pass, otherwise a short failure description.
+        """
+        from orchestrator.pytest_runner import TestStatus
+
+        if not request.worktree_path:
+            return "no worktree available to re-run tests"
+
+        worktree = Path(request.worktree_path)
+        git_plumbing.run_git(worktree, ["reset", "--hard", "--quiet", commit])
+
+        for test_path in request.test_paths:
+            result = self.pytest_runner.run(
+                str(worktree / test_path), working_dir=str(worktree)
+            )
+            if result.status != TestStatus.PASSED:
+                return f"{test_path} {result.status.value}"
+        return None
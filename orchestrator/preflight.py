@@ -0,0 +1,349 @@
+"""Static pre-flight checks for generated implementations.
+
+This module rejects generated code that cannot pass its test before the
+code is written to the worktree and a pytest process is spent on it:
+- Syntax: the code must compile
+- Target symbols: names the test imports from the target module (or
+  reads as attributes of it) must be defined at the module's top level
+- Imports: every module the code imports at top level must resolve,
+  either inside the worktree (its root, a src/ directory or the root of
+  the target's package) or in the packages of the interpreter the tests
+  run with (`python3` on PATH, as PytestRunner uses; probed once and
+  cached)
+
+The checks run in-process on the AST and take milliseconds. They are
+deliberately conservative: modules with a module-level __getattr__ or a
+star import skip the symbol check, and imports guarded by try/except or
+made inside functions are not required to resolve.
+"""
+
+import ast
+import json
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class PreflightResult:
+    """Result of pre-flight checks on generated code.
+
+    Attributes:
+        valid: Whether the code passed every check.
+        errors: Problems found, each precise enough to feed back to the model.
+    """
+
+    valid: bool
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def message(self) -> str:
+        """All errors as one line."""
+        return "; ".join(self.errors)
+
+
+def _bound_names(body: list[ast.stmt]) -> tuple[set[str], bool]:
+    """Names bound at module level, and whether the module is dynamic.
+
+    Descends into if/try/with/for blocks (but not into functions or
+    classes). A module is dynamic if it star-imports or defines a
+    module-level __getattr__.
+    """
+    names: set[str] = set()
+    dynamic = False
+
+    def targets(node: ast.expr) -> None:
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name):
+                names.add(sub.id)
+
+    pending = list(body)
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            dynamic = dynamic or node.name == "__getattr__"
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                targets(target)
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            targets(node.target)
+        elif isinstance(node, ast.Import):
+            names.update(a.asname or a.name.split(".")[0] for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    dynamic = True
+                else:
+                    names.add(alias.asname or alias.name)
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            targets(node.target)
+            pending.extend(node.body + node.orelse)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                if item.optional_vars is not None:
+                    targets(item.optional_vars)
+            pending.extend(node.body)
+        elif isinstance(node, ast.If):
+            pending.extend(node.body + node.orelse)
+        elif isinstance(node, ast.Try):
+            pending.extend(node.body + node.orelse + node.finalbody)
+            for handler in node.handlers:
+                pending.extend(handler.body)
+    return names, dynamic
+
+
+def _module_names(impl_path: Path, bases: list[Path]) -> set[str]:
+    """Dotted names the target file can be imported as from the bases."""
+    names = set()
+    stem = impl_path.with_suffix("")
+    for base in bases:
+        try:
+            parts = stem.relative_to(base).parts
+        except ValueError:
+            continue
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        if parts and all(part.isidentifier() for part in parts):
+            names.add(".".join(parts))
+    return names
+
+
+def _is_target(
+    node: ast.ImportFrom, target_names: set[str], impl_path: Path, test_dir: Path
+) -> bool:
+    """Whether a from-import in the test imports from the target module."""
+    if not node.level:
+        return node.module in target_names
+    base = test_dir
+    for _ in range(node.level - 1):
+        base = base.parent
+    path = base.joinpath(*node.module.split(".")) if node.module else base
+    stem = impl_path.with_suffix("")
+    return path == stem or path / "__init__" == stem
+
+
+def _required_symbols(
+    test_tree: ast.Module, target_names: set[str], impl_path: Path, test_dir: Path
+) -> set[str]:
+    """Names the test takes from the target module."""
+    required: set[str] = set()
+    aliases: set[str] = set()
+    for node in ast.walk(test_tree):
+        if isinstance(node, ast.ImportFrom) and _is_target(node, target_names, impl_path, test_dir):
+            required.update(a.name for a in node.names if a.name != "*")
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in target_names:
+                    aliases.add(alias.asname or alias.name)
+    if aliases:
+        for node in ast.walk(test_tree):
+            if (
+                isinstance(node, ast.Attribute)
+                and isinstance(node.value, ast.Name)
+                and node.value.id in aliases
+                and not (node.attr.startswith("__") and node.attr.endswith("__"))
+            ):
+                # Module dunders (__doc__, __name__, ...) always exist
+                required.add(node.attr)
+    return required
+
+
+def _optional_imports(tree: ast.Module) -> set[int]:
+    """ids of imports not required at import time.
+
+    Those inside try blocks (optional dependencies) and inside functions
+    (lazy imports).
+    """
+    optional: set[int] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Try):
+            scopes = node.body
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            scopes = [node]
+        else:
+            continue
+        for scope in scopes:
+            optional.update(id(sub) for sub in ast.walk(scope))
+    return optional
+
+
+# Top-level modules importable by each test interpreter, and the results
+# of single-module probes for names missing from that list
+_PROBE_LIST = (
+    "import json, pkgutil, sys; print(json.dumps(sorted("
+    "{m.name for m in pkgutil.iter_modules()} | set(sys.builtin_module_names)"
+    " | set(getattr(sys, 'stdlib_module_names', ())))))"
+)
+_PROBE_ONE = "import importlib.util, sys; sys.exit(importlib.util.find_spec(sys.argv[1]) is None)"
+_probe_lock = threading.Lock()
+_installed: dict[str, Optional[frozenset[str]]] = {}
+_probed: dict[tuple[str, str], bool] = {}
+
+
+def _installed_modules(python: str) -> Optional[frozenset[str]]:
+    """Top-level modules the interpreter can import (None if it cannot be run)."""
+    with _probe_lock:
+        if python not in _installed:
+            try:
+                out = subprocess.run(
+                    [python, "-c", _PROBE_LIST],
+                    capture_output=True, text=True, timeout=30, cwd="/",
+                ).stdout
+                _installed[python] = frozenset(json.loads(out))
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                _installed[python] = None
+        return _installed[python]
+
+
+def _interpreter_has(python: str, top: str) -> bool:
+    """Whether the interpreter the tests run with can import a top-level module.
+
+    Names missing from the cached module list (e.g. installed since, or
+    provided by a custom finder) are probed once more individually.
+    """
+    modules = _installed_modules(python)
+    if modules is None:
+        # Cannot tell; leave it to pytest
+        return True
+    if top in modules:
+        return True
+    with _probe_lock:
+        if (python, top) not in _probed:
+            try:
+                result = subprocess.run(
+                    [python, "-c", _PROBE_ONE, top],
+                    capture_output=True, timeout=30, cwd="/",
+                )
+                _probed[(python, top)] = result.returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                _probed[(python, top)] = True
+        return _probed[(python, top)]
+
+
+def _module_exists(name: str, search_paths: list[Path], python: str = "python3") -> bool:
+    """Whether a dotted module resolves in search_paths or the test interpreter."""
+    top = name.split(".")[0]
+    for base in search_paths:
+        path = base.joinpath(*name.split("."))
+        if path.with_suffix(".py").is_file() or path.is_dir():
+            return True
+        if (base / top).is_dir() or (base / f"{top}.py").is_file():
+            # The package exists; a missing submodule may still be a name
+            return True
+    if top in sys.builtin_module_names:
+        return True
+    return _interpreter_has(python, top)
+
+
+def _package_root(impl_path: Path) -> Path:
+    """Directory above the outermost package containing impl_path.
+
+    For src/pkg/mod.py with src/pkg/__init__.py this is src, where
+    first-party imports such as 'pkg.util' resolve.
+    """
+    base = impl_path.parent
+    while (base / "__init__.py").is_file() and base.parent != base:
+        base = base.parent
+    return base
+
+
+def _unresolved_imports(
+    tree: ast.Module, impl_path: Path, search_paths: list[Path], python: str
+) -> list[str]:
+    """Top-level imports of the code that resolve nowhere."""
+    errors = []
+    optional = _optional_imports(tree)
+    for node in ast.walk(tree):
+        if id(node) in optional:
+            continue
+        if isinstance(node, ast.Import):
+            modules = [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = impl_path.parent
+                for _ in range(node.level - 1):
+                    base = base.parent
+                if node.module and not _module_exists(node.module, [base]):
+                    errors.append(
+                        f"line {node.lineno}: relative import "
+                        f"'{'.' * node.level}{node.module}' not found"
+                    )
+                continue
+            modules = [node.module] if node.module else []
+        else:
+            continue
+        for module in modules:
+            if module != "__future__" and not _module_exists(module, search_paths, python):
+                errors.append(
+                    f"line {node.lineno}: imports module '{module}' which does not exist "
+                    f"in the worktree or the installed packages"
+                )
+    return errors
+
+
+def preflight(
+    code: str,
+    target_file: str,
+    test_path: Optional[str] = None,
+    root: Optional[str] = None,
+    python: str = "python3",
+) -> PreflightResult:
+    """Check generated implementation code without running it.
+
+    Args:
+        code: Generated source of the target file.
+        target_file: Target implementation file, relative to root (or absolute).
+        test_path: Test the code must satisfy (enables the symbol check).
+        root: Worktree the code will be written to (default: the test's
+            directory, else the current directory).
+        python: Interpreter the tests run with, for third-party imports.
+
+    Returns:
+        PreflightResult with the problems found.
+    """
+    root_path = Path(root) if root else Path(test_path).parent if test_path else Path.cwd()
+    root_path = root_path.resolve()
+    impl_path = root_path / target_file
+
+    try:
+        tree = ast.parse(code, filename=target_file)
+        compile(tree, target_file, "exec")
+    except SyntaxError as e:
+        line = (e.text or "").strip()
+        detail = f": {line}" if line else ""
+        return PreflightResult(
+            valid=False,
+            errors=[f"SyntaxError in {target_file} line {e.lineno}: {e.msg}{detail}"],
+        )
+    except ValueError as e:
+        return PreflightResult(valid=False, errors=[f"Invalid source for {target_file}: {e}"])
+
+    errors = []
+    if test_path:
+        try:
+            test_tree = ast.parse(Path(test_path).read_text())
+        except (OSError, SyntaxError, ValueError):
+            test_tree = None
+        if test_tree is not None:
+            test_dir = Path(test_path).resolve().parent
+            bases = [root_path, root_path / "src", _package_root(impl_path), test_dir]
+            target_names = _module_names(impl_path, bases)
+            defined, dynamic = _bound_names(tree.body)
+            required = _required_symbols(test_tree, target_names, impl_path, test_dir)
+            missing = sorted(required - defined)
+            if missing and not dynamic:
+                errors.append(
+                    f"{target_file} does not define {', '.join(repr(n) for n in missing)} "
+                    f"used by {Path(test_path).name}"
+                )
+
+    search_paths = [root_path, root_path / "src", impl_path.parent, _package_root(impl_path)]
+    if test_path:
+        search_paths.append(Path(test_path).parent)
+    search_paths = list(dict.fromkeys(search_paths))
+    errors.extend(_unresolved_imports(tree, impl_path, search_paths, python))
+    return PreflightResult(valid=not errors, errors=errors)
@@ -0,0 +1,201 @@
+"""Pytest fork server: runs each pytest session in a forked child.
+
+Started by PytestRunner (see orchestrator.pytest_runner.ForkServer) as
+``python3 pytest_forkserver.py <root>`` in the project's interpreter, so
+this file must only use the standard library and must not import the
+orchestrator package.
+
+The server imports pytest once. For every request it forks a child that
+runs ``pytest.main(args)`` in the requested directory with stdout and
+stderr redirected to files. After each session the child reports which
+modules it imported, and the server imports the stable ones itself so
+that later children inherit them already initialised:
+- modules outside root (standard library, installed packages)
+- modules inside root that are not tests or conftest files and have not
+  been modified for stable_age seconds
+
+Protocol (one JSON object per line):
+    request:  {"args": [...], "cwd": "...", "stable_age": 60,
+               "rlimits": [[<resource>, <soft>, <hard>], ...]}
+    response: {"pid": <child pid>}
+              {"exit_code": <int>, "dir": <output dir>, "preloaded": [<files>],
+               "rusage": {"ru_utime": ..., "ru_stime": ..., "ru_maxrss": ...}}
+
+The child runs in its own process group with the requested rlimits, so
+the client can kill everything it started with one killpg(). Once the
+child has exited, the server kills whatever is left in its group before
+reaping it: until then the child's pid, which is the group ID, cannot be
+reused by an unrelated process.
+
+pytest cannot rewrite asserts in plugin packages that are already
+imported; children silence that warning for the plugins the server
+preloaded, so their output matches a fresh `python3 -m pytest` run.
+
+The output directory holds 'stdout' and 'stderr'; the client deletes it.
+'preloaded' lists the files under root imported by the server, so the
+client can restart it when one of them changes.
+"""
+
+import json
+import os
+import resource
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+
+def _is_test_file(path: str) -> bool:
+    """Whether a module file is a test or conftest module."""
+    name = os.path.basename(path)
+    return name.startswith("test_") or name.endswith("_test.py") or name == "conftest.py"
+
+
+def _plugin_packages() -> set:
+    """Top-level packages of installed pytest plugins (pytest11 entry points)."""
+    try:
+        from importlib.metadata import entry_points
+
+        return {ep.value.split(":")[0].split(".")[0] for ep in entry_points(group="pytest11")}
+    except Exception:
+        return set()
+
+
+def _preload(modules: dict, root: str, stable_age: float) -> None:
+    """Import the stable modules a child used into the server process."""
+    now = time.time()
+    for name, path in modules.items():
+        if name in sys.modules or not path or name == "__main__":
+            continue
+        if path.startswith(root + os.sep):
+            try:
+                if _is_test_file(path) or now - os.stat(path).st_mtime < stable_age:
+                    continue
+            except OSError:
+                continue
+        try:
+            __import__(name)
+        except BaseException:
+            continue
+
+
+def _preloaded_files(root: str) -> list:
+    """Files under root whose modules are loaded in the server."""
+    files = []
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None)
+        if path and os.path.realpath(path).startswith(root + os.sep):
+            files.append(os.path.realpath(path))
+    return sorted(set(files))
+
+
+def _run_child(request: dict, out_dir: str, plugins: set) -> None:
+    """Run one pytest session in the forked child; never returns."""
+    code = 3
+    try:
+        os.setpgid(0, 0)
+        for res, soft, hard in request.get("rlimits", []):
+            resource.setrlimit(res, (soft, hard))
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        for fd, name in ((1, "stdout"), (2, "stderr")):
+            target = os.open(os.path.join(out_dir, name), os.O_WRONLY | os.O_CREAT, 0o600)
+            os.dup2(target, fd)
+            os.close(target)
+
+        cwd = request["cwd"]
+        os.chdir(cwd)
+        # Same import path as `python3 -m pytest` started in cwd
+        sys.path.insert(0, cwd)
+        args = list(request["args"])
+        for plugin in sorted(plugins & set(sys.modules)):
+            args.append(
+                f"-Wignore:Module already imported so cannot be rewritten; {plugin}"
+                ":pytest.PytestAssertRewriteWarning"
+            )
+        sys.argv = ["pytest", *request["args"]]
+
+        import pytest
+
+        code = int(pytest.main(args))
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        traceback.print_exc()
+        code = 3
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            modules = {
+                name: getattr(module, "__file__", None)
+                for name, module in list(sys.modules.items())
+            }
+            with open(os.path.join(out_dir, "modules.json"), "w") as f:
+                json.dump(modules, f)
+        finally:
+            os._exit(code)
+
+
+def main() -> None:
+    """Serve pytest requests read from stdin."""
+    root = os.path.realpath(sys.argv[1])
+    # Do not let this file's directory shadow the project's modules
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path = [p for p in sys.path if os.path.abspath(p or ".") != script_dir]
+    sys.path.insert(0, root)
+
+    # Keep the protocol on a private fd; stray output goes to stderr
+    protocol = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)
+
+    import pytest  # noqa: F401  (preloaded for every child)
+
+    plugins = _plugin_packages()
+
+    def respond(message: dict) -> None:
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        out_dir = tempfile.mkdtemp(prefix="hc_pytest_")
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(request, out_dir, plugins)
+        respond({"pid": pid})
+
+        # Kill stragglers while the child is still a zombie, then reap it
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+        _, status, rusage = os.wait4(pid, 0)
+        exit_code = os.waitstatus_to_exitcode(status)
+        try:
+            with open(os.path.join(out_dir, "modules.json")) as f:
+                _preload(json.load(f), root, float(request.get("stable_age", 60)))
+        except (OSError, ValueError):
+            pass
+        respond(
+            {
+                "exit_code": exit_code,
+                "dir": out_dir,
+                "preloaded": _preloaded_files(root),
+                "rusage": {
+                    "ru_utime": rusage.ru_utime,
+                    "ru_stime": rusage.ru_stime,
+                    "ru_maxrss": rusage.ru_maxrss,
+                },
+            }
+        )
+
+
+if __name__ == "__main__":
+    main()
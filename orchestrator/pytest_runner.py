@@ -5,20 +5,261 @@ and captures output for the TDD execution loop.
 
 The runner:
 - Executes pytest on a given test file
-- Captures stdout, stderr, and exit code
+- Captures stdout, stderr, and exit code, keeping only the first and last
+  bytes of each stream (OutputLimits) so a test that prints without end
+  cannot exhaust memory; the full log can be spilled to a file
 - Supports configurable timeouts to prevent hung tests
-- Returns structured PytestResult dataclass
+- Kills the test process early when a cancellation token fires
+- Runs each test in its own process group (and optionally cgroup) with
+  ResourceLimits applied, kills the whole group on timeout, and reports
+  the run's ResourceUsage
+- Returns structured PytestResult dataclass, including per-test outcomes,
+  durations, exception types and short tracebacks read from pytest's
+  JUnit XML report, so consumers need not scan the raw output
+- Records each run as a 'pytest' tracing span
+
+With fork_server=True the runner keeps one warm pytest fork server per
+working directory (see orchestrator/pytest_forkserver.py). The server has
+pytest and the project's stable imports loaded already and forks a child
+for every run, so interpreter startup, plugin discovery and heavy imports
+are paid once instead of on every RED, GREEN and REFACTOR run. A server
+is restarted when a source file it preloaded changes, and any server
+failure falls back to a fresh `python3 -m pytest` process.
+
+With workers > 1 the runner collects the test items of a file first and,
+if there are enough of them, splits them into shards that run in
+parallel pytest processes. Items are assigned longest first to the
+least loaded shard, using the durations recorded for them in earlier
+runs, and the shard results are merged into one PytestResult. This needs
+no plugin (such as pytest-xdist) in the target project.
 """
 
+import heapq
+import json
 import logging
+import os
+import re
+import select
+import shutil
+import signal
 import subprocess
-from dataclasses import dataclass
+import tempfile
+import threading
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+
+from orchestrator.cancellation import CancellationToken, OperationCancelled, current_token
+from orchestrator.result_cache import ResultCache
+from orchestrator.sandbox import (
+    CgroupSandbox,
+    ResourceLimits,
+    ResourceUsage,
+    apply_rlimits,
+    kill_process_group,
+)
+from orchestrator.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
+# How often a running pytest process checks its cancellation token
+_CANCEL_POLL_INTERVAL = 0.25
+
+# pytest options of every run (the report option is added per run)
+PYTEST_ARGS = ("-v", "--tb=short", "-s")
+
+# Longest traceback kept per test case
+_MAX_TRACEBACK_CHARS = 2000
+
+# JUnit message pytest uses for a test module that failed to import
+COLLECTION_FAILURE = "collection failure"
+
+# "E   SomeError: message" line of a pytest short traceback
+_EXCEPTION_LINE = re.compile(
+    r"^E\s+([A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt|Failed|Warning))\b", re.MULTILINE
+)
+
+# Read size for captured output
+_READ_CHUNK = 65536
+
+# Files with fewer collected items are not split into shards
+_MIN_PARALLEL_TESTS = 4
+
+# Per-test durations remembered for shard balancing
+_MAX_DURATIONS = 10000
+
+# Server script run by ForkServer (standard library only)
+FORK_SERVER_SCRIPT = Path(__file__).with_name("pytest_forkserver.py")
+
+
+@dataclass(frozen=True)
+class OutputLimits:
+    """Bounds on the output kept from a pytest run.
+
+    Each stream keeps its first head_bytes and last tail_bytes; what lies
+    between is replaced by a truncation marker.
+
+    Attributes:
+        head_bytes: Bytes kept from the start of each stream.
+        tail_bytes: Bytes kept from the end of each stream.
+        spill_dir: Directory that receives the full log of a truncated
+            stream (None discards the dropped bytes).
+    """
+
+    head_bytes: int = 64 * 1024
+    tail_bytes: int = 64 * 1024
+    spill_dir: Optional[str] = None
+
+
+@dataclass
+class CapturedStream:
+    """Bounded text captured from one output stream.
+
+    Attributes:
+        text: Captured text, with a truncation marker if bytes were dropped.
+        truncated: Whether bytes were dropped.
+        log_path: File holding the full stream, if it was spilled.
+    """
+
+    text: str = ""
+    truncated: bool = False
+    log_path: Optional[str] = None
+
+
+def _bounded_text(head: bytes, tail: bytes, dropped: int, log_path: Optional[str]) -> str:
+    """Join head and tail of a stream around a truncation marker."""
+    if dropped <= 0:
+        return (head + tail).decode(errors="replace")
+    where = f"; full output in {log_path}" if log_path else ""
+    marker = f"\n[... {dropped} bytes truncated{where} ...]\n"
+    return head.decode(errors="replace") + marker + tail.decode(errors="replace")
+
+
+class OutputBuffer:
+    """Streaming capture that keeps only the head and tail of a stream.
+
+    Memory use is bounded by the limits whatever is written. With a spill
+    directory the whole stream is also written to a log file, which is
+    kept only if the stream was truncated.
+    """
+
+    def __init__(self, limits: OutputLimits, name: str) -> None:
+        """Initialize OutputBuffer.
+
+        Args:
+            limits: Head/tail sizes and optional spill directory.
+            name: Stream name used for the log file (e.g. 'test_add.stdout').
+        """
+        self.limits = limits
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+        self._log = None
+        self._log_path: Optional[Path] = None
+        if limits.spill_dir:
+            Path(limits.spill_dir).mkdir(parents=True, exist_ok=True)
+            self._log_path = Path(limits.spill_dir) / f"{uuid.uuid4().hex[:8]}_{name}.log"
+            self._log = open(self._log_path, "wb")
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk of the stream."""
+        self.total += len(data)
+        if self._log is not None:
+            self._log.write(data)
+        room = self.limits.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.limits.tail_bytes > 0:
+            self._tail += data
+            # Trim in batches so the front deletion stays amortized O(1)
+            if len(self._tail) > 2 * self.limits.tail_bytes:
+                del self._tail[: len(self._tail) - self.limits.tail_bytes]
+
+    def close(self) -> CapturedStream:
+        """Finish the capture.
+
+        Returns:
+            The captured stream.
+        """
+        tail = bytes(self._tail[-self.limits.tail_bytes :]) if self.limits.tail_bytes else b""
+        dropped = self.total - len(self._head) - len(tail)
+        log_path = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+            if dropped > 0:
+                log_path = str(self._log_path)
+            else:
+                self._log_path.unlink(missing_ok=True)
+        return CapturedStream(
+            text=_bounded_text(bytes(self._head), tail, dropped, log_path),
+            truncated=dropped > 0,
+            log_path=log_path,
+        )
+
+
+def read_bounded(path: Path, limits: OutputLimits, name: str) -> CapturedStream:
+    """Read a captured output file within the limits.
+
+    Only the head and tail of the file are read. A truncated file is moved
+    to the spill directory, if there is one.
+
+    Args:
+        path: Output file.
+        limits: Head/tail sizes and optional spill directory.
+        name: Stream name used for the log file.
+
+    Returns:
+        The captured stream (empty if the file cannot be read).
+    """
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            if size <= limits.head_bytes + limits.tail_bytes:
+                return CapturedStream(text=f.read().decode(errors="replace"))
+            head = f.read(limits.head_bytes)
+            tail = b""
+            if limits.tail_bytes:
+                f.seek(size - limits.tail_bytes)
+                tail = f.read()
+    except OSError:
+        return CapturedStream()
+
+    log_path = None
+    if limits.spill_dir:
+        Path(limits.spill_dir).mkdir(parents=True, exist_ok=True)
+        target = Path(limits.spill_dir) / f"{uuid.uuid4().hex[:8]}_{name}.log"
+        try:
+            shutil.move(str(path), target)
+            log_path = str(target)
+        except OSError:
+            pass
+    dropped = size - len(head) - len(tail)
+    return CapturedStream(
+        text=_bounded_text(head, tail, dropped, log_path), truncated=True, log_path=log_path
+    )
+
+
+class _RunTimeout(subprocess.TimeoutExpired):
+    """TimeoutExpired carrying the resource usage of the killed run."""
+
+    def __init__(self, cmd: Any, timeout: float, usage: Optional[ResourceUsage]) -> None:
+        super().__init__(cmd, timeout)
+        self.resource_usage = usage
+
+
+class ForkServerError(Exception):
+    """Raised when a pytest fork server cannot serve a request."""
+
+    pass
+
 
 class TestStatus(str, Enum):
     """Test execution status."""
@@ -29,6 +270,43 @@ class TestStatus(str, Enum):
     TIMEOUT = "timeout"
 
 
+class TestOutcome(str, Enum):
+    """Outcome of a single test case."""
+
+    PASSED = "passed"
+    FAILED = "failed"
+    ERROR = "error"
+    SKIPPED = "skipped"
+
+
+@dataclass
+class TestCaseResult:
+    """Outcome of a single test case, from pytest's JUnit XML report.
+
+    Attributes:
+        name: Test id ('module[.Class]::test'); for a module that failed
+            to import, the module name.
+        outcome: PASSED, FAILED, ERROR (setup/teardown/collection) or SKIPPED.
+        duration: Duration in seconds.
+        exception_type: Exception class name for failures and errors
+            (e.g. 'TypeError'), if known.
+        message: Failure, error or skip message.
+        traceback: Short traceback (truncated).
+    """
+
+    name: str
+    outcome: TestOutcome
+    duration: float = 0.0
+    exception_type: Optional[str] = None
+    message: str = ""
+    traceback: str = ""
+
+    @property
+    def collection_error(self) -> bool:
+        """Whether the test module failed to import (nothing ran)."""
+        return self.outcome == TestOutcome.ERROR and self.message == COLLECTION_FAILURE
+
+
 @dataclass
 class PytestResult:
     """Result of a pytest execution.
@@ -39,6 +317,13 @@ class PytestResult:
         stdout: Captured stdout output.
         stderr: Captured stderr output.
         test_path: Path to the test file that was executed.
+        tests: Per-test outcomes (empty if pytest produced no report,
+            e.g. on timeout).
+        truncated: Whether stdout or stderr was cut to the output limits.
+        stdout_log: File with the full stdout, if it was truncated and spilled.
+        stderr_log: File with the full stderr, if it was truncated and spilled.
+        resource_usage: CPU, memory and wall time of the run (None if
+            pytest was not started or the result came from the cache).
     """
 
     status: TestStatus
@@ -46,6 +331,403 @@ class PytestResult:
     stdout: str
     stderr: str
     test_path: str
+    tests: list[TestCaseResult] = field(default_factory=list)
+    truncated: bool = False
+    stdout_log: Optional[str] = None
+    stderr_log: Optional[str] = None
+    resource_usage: Optional[ResourceUsage] = None
+
+    @property
+    def failures(self) -> list[TestCaseResult]:
+        """Tests that failed or errored."""
+        return [t for t in self.tests if t.outcome in (TestOutcome.FAILED, TestOutcome.ERROR)]
+
+    @property
+    def exception_types(self) -> list[str]:
+        """Distinct exception types of the failures, in test order."""
+        return list(dict.fromkeys(t.exception_type for t in self.failures if t.exception_type))
+
+    def counts(self) -> dict[str, int]:
+        """Number of tests per outcome (e.g. {'passed': 3, 'failed': 1})."""
+        counts: dict[str, int] = {}
+        for test in self.tests:
+            counts[test.outcome.value] = counts.get(test.outcome.value, 0) + 1
+        return counts
+
+    def failure_summary(self, limit: int = 5) -> str:
+        """Short text describing the failures, for prompts and error messages.
+
+        Args:
+            limit: Maximum number of failures described.
+
+        Returns:
+            Summary text ('' if there are no structured results).
+        """
+        if not self.tests:
+            return ""
+        lines = [", ".join(f"{n} {outcome}" for outcome, n in self.counts().items())]
+        for test in self.failures[:limit]:
+            # Prefer the exception line of the traceback over the message
+            kind = test.exception_type or test.outcome.value
+            e_lines = [l[1:].strip() for l in test.traceback.splitlines() if l.startswith("E ")]
+            detail = next(
+                (l for l in e_lines if l.startswith(kind)),
+                e_lines[0] if e_lines else (test.message.splitlines() or [""])[0],
+            )
+            if not detail.startswith(kind):
+                detail = f"{kind}: {detail}"
+            lines.append(f"{test.name}: {detail}")
+        if len(self.failures) > limit:
+            lines.append(f"... and {len(self.failures) - limit} more")
+        return "\n".join(lines)
+
+
+# Severity of run statuses when results are combined
+_STATUS_SEVERITY = (TestStatus.PASSED, TestStatus.FAILED, TestStatus.ERROR, TestStatus.TIMEOUT)
+
+
+def merge_results(results: list[PytestResult], test_path: str) -> PytestResult:
+    """Combine the results of several pytest runs into one.
+
+    The status and exit code are those of the worst run (PASSED < FAILED
+    < ERROR < TIMEOUT); tests and output are concatenated, output under a
+    header per run; CPU times are summed, peak memory and wall time are
+    the maxima.
+
+    Args:
+        results: Results to combine.
+        test_path: test_path of the combined result.
+
+    Returns:
+        The combined PytestResult (PASSED with no tests if results is empty).
+    """
+    if not results:
+        return PytestResult(
+            status=TestStatus.PASSED, exit_code=0, stdout="", stderr="", test_path=test_path
+        )
+    worst = max(results, key=lambda r: _STATUS_SEVERITY.index(r.status))
+
+    usage = None
+    usages = [r.resource_usage for r in results if r.resource_usage is not None]
+    if usages:
+        usage = ResourceUsage(
+            wall_time=max(u.wall_time for u in usages),
+            user_time=sum(u.user_time for u in usages),
+            system_time=sum(u.system_time for u in usages),
+            max_rss_bytes=max(u.max_rss_bytes for u in usages),
+        )
+
+    def joined(attr: str) -> str:
+        return "".join(
+            f"==== {r.test_path} ====\n{getattr(r, attr)}\n" for r in results if getattr(r, attr)
+        )
+
+    return PytestResult(
+        status=worst.status,
+        exit_code=worst.exit_code,
+        stdout=joined("stdout"),
+        stderr=joined("stderr"),
+        test_path=test_path,
+        tests=[t for r in results for t in r.tests],
+        truncated=any(r.truncated for r in results),
+        resource_usage=usage,
+    )
+
+
+def _exception_type(traceback: str, kind: str) -> Optional[str]:
+    """Exception class name from a short traceback."""
+    match = _EXCEPTION_LINE.search(traceback)
+    if match:
+        return match.group(1).rsplit(".", 1)[-1]
+    if kind == "failure" and re.search(r"^E\s+assert\b", traceback, re.MULTILINE):
+        return "AssertionError"
+    return None
+
+
+def _test_id(node_id: str) -> str:
+    """TestCaseResult name of a pytest node id.
+
+    'tests/test_x.py::TestA::test_b[1]' -> 'tests.test_x.TestA::test_b[1]',
+    matching the JUnit classname and name.
+    """
+    path, *rest = node_id.split("::")
+    module = path[:-3] if path.endswith(".py") else path
+    classname = ".".join([module.replace("/", "."), *rest[:-1]])
+    return f"{classname}::{rest[-1]}" if rest else classname
+
+
+def parse_junit_xml(path: str | Path) -> list[TestCaseResult]:
+    """Read per-test outcomes from a pytest JUnit XML report.
+
+    Args:
+        path: Report written by `pytest --junitxml`.
+
+    Returns:
+        Test case results (empty if the report is missing or unreadable).
+    """
+    try:
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return []
+
+    tests = []
+    for case in root.iter("testcase"):
+        classname, name = case.get("classname", ""), case.get("name", "")
+        outcome, exception_type, message, traceback = TestOutcome.PASSED, None, "", ""
+        for child in case:
+            if child.tag in ("failure", "error"):
+                outcome = TestOutcome.FAILED if child.tag == "failure" else TestOutcome.ERROR
+                message = child.get("message", "")
+                traceback = (child.text or "")[-_MAX_TRACEBACK_CHARS:]
+                exception_type = _exception_type(traceback, child.tag)
+                break
+            if child.tag == "skipped":
+                outcome, message = TestOutcome.SKIPPED, child.get("message", "")
+        try:
+            duration = float(case.get("time", 0))
+        except ValueError:
+            duration = 0.0
+        tests.append(
+            TestCaseResult(
+                name=f"{classname}::{name}" if classname else name,
+                outcome=outcome,
+                duration=duration,
+                exception_type=exception_type,
+                message=message,
+                traceback=traceback,
+            )
+        )
+    return tests
+
+
+class ForkServer:
+    """Client for one warm pytest fork server.
+
+    Attributes:
+        root: Directory the server serves (worktree or project root).
+        python: Interpreter the server runs in.
+        stable_age: Seconds a source file under root must be unmodified
+            before the server preloads it.
+    """
+
+    def __init__(self, root: str, python: str = "python3", stable_age: float = 60.0) -> None:
+        """Initialize ForkServer (the process starts on first use).
+
+        Args:
+            root: Directory the server serves.
+            python: Interpreter to start the server with.
+            stable_age: Minimum age of preloaded source files, in seconds.
+        """
+        self.root = str(Path(root).resolve())
+        self.python = python
+        self.stable_age = stable_age
+        # Held while a run is in progress; one server serves one run at a time
+        self.lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._buffer = b""
+        self._preloaded: dict[str, int] = {}
+
+    @property
+    def alive(self) -> bool:
+        """Whether the server process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def stale(self) -> bool:
+        """Whether a source file the server preloaded has changed since."""
+        for path, mtime in self._preloaded.items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def start(self) -> None:
+        """Start the server process."""
+        self.close()
+        self._process = subprocess.Popen(
+            [self.python, str(FORK_SERVER_SCRIPT), self.root],
+            cwd=self.root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._buffer = b""
+        self._preloaded = {}
+
+    def close(self) -> None:
+        """Stop the server process."""
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+        for stream in (self._process.stdin, self._process.stdout):
+            if stream is not None:
+                stream.close()
+        self._process = None
+
+    def run(
+        self,
+        args: list[str],
+        cwd: str,
+        timeout: float,
+        token: Optional[CancellationToken],
+        limits: OutputLimits = OutputLimits(),
+        name: str = "pytest",
+        resource_limits: Optional[ResourceLimits] = None,
+    ) -> tuple[int, CapturedStream, CapturedStream, Optional[ResourceUsage]]:
+        """Run one pytest session in a forked child of the server.
+
+        Starts (or restarts a stale) server as needed.
+
+        Args:
+            args: pytest arguments (without 'python3 -m pytest').
+            cwd: Working directory for the session.
+            timeout: Timeout in seconds.
+            token: Optional cancellation token, polled while the child runs.
+            limits: Bounds on the captured output.
+            name: Name for spilled log files.
+            resource_limits: Limits applied to the child.
+
+        Returns:
+            Tuple of (returncode, stdout, stderr, resource usage).
+
+        Raises:
+            ForkServerError: If the server failed; the caller should fall
+                back to a fresh process.
+            subprocess.TimeoutExpired: If the timeout elapsed.
+            OperationCancelled: If the token fired.
+        """
+        if not self.alive or self.stale():
+            self.start()
+
+        started = time.monotonic()
+        deadline = started + timeout
+        resource_limits = resource_limits or ResourceLimits()
+        request = {
+            "args": args,
+            "cwd": str(cwd),
+            "stable_age": self.stable_age,
+            "rlimits": [[res, soft, hard] for res, (soft, hard) in resource_limits.rlimits()],
+        }
+        try:
+            self._process.stdin.write((json.dumps(request) + "\n").encode())
+            self._process.stdin.flush()
+            pid = self._read_message(deadline)["pid"]
+        except (OSError, KeyError, subprocess.TimeoutExpired) as e:
+            self.close()
+            raise ForkServerError(f"Fork server for {self.root} failed to start a run: {e}")
+
+        cgroup = CgroupSandbox.create(resource_limits) if resource_limits.use_cgroup else None
+        if cgroup is not None:
+            cgroup.add(pid)
+        try:
+            interrupt: Optional[BaseException] = None
+            try:
+                reply = self._read_message(deadline, token)
+            except subprocess.TimeoutExpired:
+                interrupt = _RunTimeout(args, timeout, None)
+            except OperationCancelled as e:
+                interrupt = e
+            if interrupt is not None:
+                self._kill_child(pid, cgroup)
+                try:
+                    reply = self._read_message(time.monotonic() + 5)
+                except (ForkServerError, subprocess.TimeoutExpired):
+                    self.close()
+                    raise interrupt
+                self._collect_output(reply, OutputLimits(0, 0), name)
+                if isinstance(interrupt, _RunTimeout):
+                    interrupt.resource_usage = self._usage(reply, started, cgroup)
+                raise interrupt
+
+            # The server killed the child's process group before reaping it
+            if cgroup is not None:
+                cgroup.kill()
+            usage = self._usage(reply, started, cgroup)
+        finally:
+            if cgroup is not None:
+                cgroup.close()
+
+        stdout, stderr = self._collect_output(reply, limits, name)
+        return int(reply["exit_code"]), stdout, stderr, usage
+
+    def _usage(
+        self, reply: dict, started: float, cgroup: Optional[CgroupSandbox]
+    ) -> Optional[ResourceUsage]:
+        """Resource usage of a finished child from the server's reply."""
+        if "rusage" not in reply:
+            return None
+        usage = ResourceUsage.from_rusage(
+            reply["rusage"], time.monotonic() - started, int(reply["exit_code"])
+        )
+        if cgroup is not None:
+            usage.peak_memory_bytes = cgroup.peak_memory()
+        return usage
+
+    def _read_message(
+        self, deadline: float, token: Optional[CancellationToken] = None
+    ) -> dict:
+        """Read one JSON line from the server, bounded by a deadline."""
+        fd = self._process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            if token is not None and token.cancelled:
+                raise OperationCancelled(token.reason)
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise subprocess.TimeoutExpired(FORK_SERVER_SCRIPT.name, 0)
+            step = left if token is None else min(left, _CANCEL_POLL_INTERVAL)
+            ready, _, _ = select.select([fd], [], [], step)
+            if ready:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    self.close()
+                    raise ForkServerError(f"Fork server for {self.root} exited")
+                self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        try:
+            return json.loads(line)
+        except ValueError as e:
+            self.close()
+            raise ForkServerError(f"Bad fork server reply: {e}")
+
+    def _kill_child(self, pid: int, cgroup: Optional[CgroupSandbox] = None) -> None:
+        """Kill a running test child, its process group and its cgroup.
+
+        The child is also killed directly in case it has not called
+        setpgid() yet.
+
+        Args:
+            pid: Child pid, which is also its process group ID.
+            cgroup: The child's cgroup, if any.
+        """
+        kill_process_group(pid)
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+        if cgroup is not None:
+            cgroup.kill()
+
+    def _collect_output(
+        self, reply: dict, limits: OutputLimits, name: str
+    ) -> tuple[CapturedStream, CapturedStream]:
+        """Read a finished run's output and delete its directory."""
+        out_dir = Path(reply["dir"])
+        try:
+            stdout = read_bounded(out_dir / "stdout", limits, f"{name}.stdout")
+            stderr = read_bounded(out_dir / "stderr", limits, f"{name}.stderr")
+        finally:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        preloaded = {}
+        for path in reply.get("preloaded", []):
+            try:
+                preloaded[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+        self._preloaded = preloaded
+        return stdout, stderr
 
 
 class PytestRunner:
@@ -53,21 +735,91 @@ class PytestRunner:
 
     Attributes:
         default_timeout: Default timeout in seconds for test execution.
+        fork_server: Whether runs go through warm per-directory fork servers.
+        max_servers: Maximum number of fork servers kept running; the least
+            recently used one is stopped first.
+        result_cache: Optional cache of results keyed by input content.
+        output_limits: Bounds on the output kept per stream.
+        resource_limits: Resource caps applied to every run.
+        workers: Parallel pytest processes a test file may be split across.
     """
 
-    def __init__(self, default_timeout: int = 60) -> None:
+    def __init__(
+        self,
+        default_timeout: int = 60,
+        fork_server: bool = False,
+        max_servers: int = 4,
+        result_cache: Optional[ResultCache] = None,
+        output_limits: Optional[OutputLimits] = None,
+        resource_limits: Optional[ResourceLimits] = None,
+        workers: int = 1,
+    ) -> None:
         """Initialize PytestRunner.
 
         Args:
             default_timeout: Default timeout in seconds (default: 60).
+            fork_server: Run tests through warm fork servers (default: False).
+            max_servers: Maximum number of fork servers kept running.
+            result_cache: Cache to answer repeated runs from (default: none).
+            output_limits: Bounds on captured output (default: OutputLimits()).
+            resource_limits: Resource caps per run (default: no caps; runs
+                are still isolated in their own process group).
+            workers: Split test files with enough test items across up to
+                this many parallel pytest processes, at most one per CPU
+                (default: 1, no splitting).
         """
         self.default_timeout = default_timeout
+        self.fork_server = fork_server
+        self.max_servers = max_servers
+        self.result_cache = result_cache
+        self.output_limits = output_limits or OutputLimits()
+        self.resource_limits = resource_limits or ResourceLimits()
+        self._servers: OrderedDict[str, ForkServer] = OrderedDict()
+        self._servers_lock = threading.Lock()
+        self.workers = max(workers, 1)
+        # Test id -> last duration in seconds, for balancing shards
+        self._durations: OrderedDict[str, float] = OrderedDict()
+        self._durations_lock = threading.Lock()
+
+    def close_server(self, working_dir: str) -> None:
+        """Stop the fork servers of a directory and its subdirectories.
+
+        Args:
+            working_dir: Directory whose servers to stop (e.g. a worktree
+                that is being cleaned up).
+        """
+        root = Path(working_dir).resolve()
+        with self._servers_lock:
+            keys = [key for key in self._servers if Path(key).is_relative_to(root)]
+            servers = [self._servers.pop(key) for key in keys]
+        for server in servers:
+            server.close()
+
+    def close(self) -> None:
+        """Stop all fork servers."""
+        while self._servers:
+            _, server = self._servers.popitem()
+            server.close()
+
+    def _server_for(self, cwd: str) -> ForkServer:
+        """Get (or create) the fork server for a working directory."""
+        key = str(Path(cwd).resolve())
+        with self._servers_lock:
+            server = self._servers.pop(key, None) or ForkServer(key)
+            self._servers[key] = server
+            evicted = []
+            while len(self._servers) > self.max_servers:
+                evicted.append(self._servers.popitem(last=False)[1])
+        for old in evicted:
+            old.close()
+        return server
 
     def run(
         self,
         test_path: str,
         timeout: Optional[int] = None,
         working_dir: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> PytestResult:
         """Execute pytest on a test file.
 
@@ -75,11 +827,61 @@ class PytestRunner:
             test_path: Path to the test file to execute.
             timeout: Timeout in seconds (uses default_timeout if None).
             working_dir: Working directory for pytest (uses test file dir if None).
+            cancel_token: Token bounding the run (defaults to current_token()).
 
         Returns:
             PytestResult with status, exit code, and captured output.
+
+        Raises:
+            OperationCancelled: If the token fires before pytest finishes.
         """
+        token = cancel_token or current_token()
+        with get_tracer().span("pytest", "pytest", test_path=test_path) as span:
+            key, cached = self._cache_lookup(test_path, working_dir)
+            result = cached
+            if result is None:
+                result = self._run(test_path, timeout, working_dir, token)
+                self._record_durations(result)
+                if key is not None:
+                    self.result_cache.put(key, result)
+            span.set_attribute("exit_code", result.exit_code)
+            if key is not None:
+                span.set_attribute("cache_hit", cached is not None)
+            span.set_outcome(result.status.value)
+        return result
+
+    def _cache_lookup(
+        self, test_path: str, working_dir: Optional[str]
+    ) -> tuple[Optional[str], Optional[PytestResult]]:
+        """Look a run up in the result cache.
+
+        Returns:
+            Tuple of (cache key or None without a cache, cached result or None).
+        """
+        if self.result_cache is None:
+            return None, None
+        cwd = working_dir if working_dir else str(Path(test_path).parent)
+        key = self.result_cache.key(test_path, cwd, list(PYTEST_ARGS))
+        result = self.result_cache.get(key)
+        if result is not None:
+            result.test_path = test_path
+        logger.info(
+            f"Pytest result cache {'hit' if result is not None else 'miss'} for {test_path} "
+            f"(hit rate {self.result_cache.stats.hit_rate:.0%})"
+        )
+        return key, result
+
+    def _run(
+        self,
+        test_path: str,
+        timeout: Optional[int],
+        working_dir: Optional[str],
+        token: Optional[CancellationToken] = None,
+    ) -> PytestResult:
+        """Execute pytest without tracing (see run())."""
         timeout = timeout if timeout is not None else self.default_timeout
+        if token is not None:
+            token.raise_if_cancelled()
         test_path_obj = Path(test_path)
 
         # Check if test file exists
@@ -96,51 +898,81 @@ class PytestRunner:
         # Determine working directory
         cwd = working_dir if working_dir else str(test_path_obj.parent)
 
+        # More shards than cores only add interpreter startups
+        workers = min(self.workers, os.cpu_count() or 1)
+        if workers > 1:
+            result = self._run_parallel(test_path, cwd, timeout, token, workers)
+            if result is not None:
+                return result
+
+        logger.info(f"Running pytest on {test_path} with timeout={timeout}s")
+        return self._run_pytest([str(test_path_obj)], test_path, cwd, timeout, token)
+
+    def _run_pytest(
+        self,
+        targets: list[str],
+        test_path: str,
+        cwd: str,
+        timeout: float,
+        token: Optional[CancellationToken],
+        extra_args: tuple[str, ...] = (),
+    ) -> PytestResult:
+        """Run one pytest process and build its PytestResult.
+
+        Args:
+            targets: Files or test ids to run.
+            test_path: test_path of the result.
+            cwd: Working directory.
+            timeout: Timeout in seconds.
+            token: Optional cancellation token.
+            extra_args: Further pytest arguments.
+        """
+        # Per-test outcomes come from a JUnit XML report
+        report_dir = tempfile.mkdtemp(prefix="hc_junit_")
+        report_path = Path(report_dir) / "report.xml"
+
         # Build pytest command
         cmd = [
             "python3",
             "-m",
             "pytest",
-            str(test_path_obj),
-            "-v",
-            "--tb=short",
-            "-s",  # Capture stdout
+            *targets,
+            *PYTEST_ARGS,
+            *extra_args,
+            f"--junitxml={report_path}",
         ]
 
-        logger.info(f"Running pytest on {test_path} with timeout={timeout}s")
-
         try:
-            result = subprocess.run(
-                cmd,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
+            returncode, stdout, stderr, usage = self._execute(
+                cmd, cwd, timeout, token, Path(test_path).stem
             )
 
             # Determine status from exit code
-            if result.returncode == 0:
+            if returncode == 0:
                 status = TestStatus.PASSED
-            elif result.returncode == 1:
+            elif returncode == 1:
                 status = TestStatus.FAILED
             else:
                 # Exit code 2 = user interrupt, 3 = internal error, etc.
                 status = TestStatus.ERROR
 
-            logger.info(f"Pytest completed with status={status}, exit_code={result.returncode}")
+            logger.info(f"Pytest completed with status={status}, exit_code={returncode}")
 
             return PytestResult(
                 status=status,
-                exit_code=result.returncode,
-                stdout=result.stdout,
-                stderr=result.stderr,
+                exit_code=returncode,
+                stdout=stdout.text,
+                stderr=stderr.text,
                 test_path=test_path,
+                tests=parse_junit_xml(report_path),
+                truncated=stdout.truncated or stderr.truncated,
+                stdout_log=stdout.log_path,
+                stderr_log=stderr.log_path,
+                resource_usage=usage,
             )
 
-        except subprocess.TimeoutExpired:
-            # Note: subprocess.run() with timeout internally kills the process
-            # before raising TimeoutExpired, so no explicit cleanup needed.
-            # This is documented behavior in Python's subprocess module.
+        except subprocess.TimeoutExpired as e:
+            # _execute() kills and reaps the process group before re-raising
             logger.warning(f"Pytest timed out after {timeout}s on {test_path}")
             return PytestResult(
                 status=TestStatus.TIMEOUT,
@@ -148,8 +980,13 @@ class PytestRunner:
                 stdout="",
                 stderr=f"Test execution timed out after {timeout} seconds",
                 test_path=test_path,
+                resource_usage=getattr(e, "resource_usage", None),
             )
 
+        except OperationCancelled:
+            logger.warning(f"Pytest cancelled on {test_path}")
+            raise
+
         except Exception as e:
             logger.error(f"Unexpected error running pytest: {e}")
             return PytestResult(
@@ -159,3 +996,243 @@ class PytestRunner:
                 stderr=str(e),
                 test_path=test_path,
             )
+
+        finally:
+            shutil.rmtree(report_dir, ignore_errors=True)
+
+    def _run_parallel(
+        self,
+        test_path: str,
+        cwd: str,
+        timeout: float,
+        token: Optional[CancellationToken],
+        workers: int,
+    ) -> Optional[PytestResult]:
+        """Run a test file's items in up to workers parallel shards.
+
+        Returns:
+            The merged result, or None if the file should run in one
+            process (too few items, or collection failed or was truncated;
+            the single run then reports any collection error).
+        """
+        start = time.monotonic()
+        rootdir = ("--rootdir", cwd)
+        returncode, stdout, _, _ = self._execute(
+            ["python3", "-m", "pytest", "--collect-only", "-q", test_path, *rootdir],
+            cwd, timeout, token, f"{Path(test_path).stem}.collect",
+        )
+        if returncode != 0 or stdout.truncated:
+            return None
+        # Node ids are relative to the rootdir, i.e. cwd
+        items = [line for line in stdout.text.splitlines() if "::" in line]
+        if len(items) < _MIN_PARALLEL_TESTS:
+            return None
+
+        shards = self._shard(items, min(workers, len(items)))
+        remaining = max(timeout - (time.monotonic() - start), 1.0)
+        logger.info(
+            f"Running pytest on {test_path} in {len(shards)} shards "
+            f"({len(items)} tests) with timeout={remaining:.0f}s"
+        )
+        with ThreadPoolExecutor(
+            max_workers=len(shards), thread_name_prefix="pytest-shard"
+        ) as pool:
+            # Threads do not inherit the active token; pass it explicitly
+            futures = [
+                pool.submit(
+                    self._run_pytest,
+                    shard,
+                    f"{test_path} [{index + 1}/{len(shards)}]",
+                    cwd,
+                    remaining,
+                    token,
+                    rootdir,
+                )
+                for index, shard in enumerate(shards)
+            ]
+            results = [future.result() for future in futures]
+
+        merged = merge_results(results, test_path)
+        logger.info(
+            f"Pytest completed with status={merged.status}, exit_code={merged.exit_code} "
+            f"in {time.monotonic() - start:.2f}s"
+        )
+        return merged
+
+    def _shard(self, items: list[str], count: int) -> list[list[str]]:
+        """Split node ids into shards of about equal expected duration.
+
+        Longest items first, each to the currently least loaded shard.
+        Items without a recorded duration count as the median of those
+        with one. Each shard keeps the collection order.
+        """
+        with self._durations_lock:
+            known = {item: self._durations.get(_test_id(item)) for item in items}
+        recorded = sorted(d for d in known.values() if d is not None)
+        default = recorded[len(recorded) // 2] if recorded else 1.0
+        estimate = {item: d if d is not None else default for item, d in known.items()}
+
+        order = {item: index for index, item in enumerate(items)}
+        shards: list[list[str]] = [[] for _ in range(count)]
+        loads = [(0.0, index) for index in range(count)]
+        for item in sorted(items, key=lambda i: -estimate[i]):
+            load, index = heapq.heappop(loads)
+            shards[index].append(item)
+            heapq.heappush(loads, (load + estimate[item], index))
+        return [sorted(shard, key=order.__getitem__) for shard in shards if shard]
+
+    def _record_durations(self, result: PytestResult) -> None:
+        """Remember per-test durations for balancing later shards."""
+        with self._durations_lock:
+            for test in result.tests:
+                self._durations[test.name] = test.duration
+                self._durations.move_to_end(test.name)
+            while len(self._durations) > _MAX_DURATIONS:
+                self._durations.popitem(last=False)
+
+    def _execute(
+        self,
+        cmd: list[str],
+        cwd: str,
+        timeout: int,
+        token: Optional[CancellationToken],
+        name: str = "pytest",
+    ) -> tuple[int, CapturedStream, CapturedStream, Optional[ResourceUsage]]:
+        """Run pytest in a fork server if enabled, else in a fresh process.
+
+        A server busy with another thread's run is not waited for; the run
+        uses a fresh process instead, so parallel runs stay parallel.
+        """
+        if self.fork_server:
+            server = self._server_for(cwd)
+            if server.lock.acquire(blocking=False):
+                try:
+                    return server.run(
+                        cmd[3:], cwd, timeout, token, self.output_limits, name,
+                        self.resource_limits,
+                    )
+                except ForkServerError as e:
+                    logger.warning(f"{e}; running pytest in a fresh process")
+                finally:
+                    server.lock.release()
+        return self._communicate(cmd, cwd, timeout, token, name)
+
+    def _communicate(
+        self,
+        cmd: list[str],
+        cwd: str,
+        timeout: int,
+        token: Optional[CancellationToken],
+        name: str = "pytest",
+    ) -> tuple[int, CapturedStream, CapturedStream, ResourceUsage]:
+        """Run a command to completion, killing it on timeout or cancellation.
+
+        The command runs in its own session with resource_limits applied;
+        on timeout or cancellation its whole process group (and cgroup) is
+        killed. Output is streamed into OutputBuffers, so memory stays
+        within output_limits however much the command prints.
+
+        Args:
+            cmd: Command to run.
+            cwd: Working directory.
+            timeout: Timeout in seconds.
+            token: Optional cancellation token, polled while the process runs.
+            name: Name for spilled log files.
+
+        Returns:
+            Tuple of (returncode, stdout, stderr, resource usage).
+
+        Raises:
+            subprocess.TimeoutExpired: If the timeout elapsed.
+            OperationCancelled: If the token fired.
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        process = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+        )
+        apply_rlimits(process.pid, self.resource_limits)
+        cgroup = None
+        if self.resource_limits.use_cgroup:
+            cgroup = CgroupSandbox.create(self.resource_limits)
+            if cgroup is not None:
+                cgroup.add(process.pid)
+
+        buffers = [
+            OutputBuffer(self.output_limits, f"{name}.stdout"),
+            OutputBuffer(self.output_limits, f"{name}.stderr"),
+        ]
+        by_fd = {process.stdout.fileno(): buffers[0], process.stderr.fileno(): buffers[1]}
+        open_fds = list(by_fd)
+        exited: Optional[tuple[int, Any]] = None
+
+        def reap(block: bool) -> None:
+            # Until the leader is reaped its pid (the group ID) cannot be
+            # reused, so stragglers are killed while it is still a zombie
+            nonlocal exited
+            if exited is not None:
+                return
+            flags = os.WEXITED | os.WNOWAIT | (0 if block else os.WNOHANG)
+            if os.waitid(os.P_PID, process.pid, flags) is None:
+                return
+            kill_process_group(process.pid)
+            _, status, rusage = os.wait4(process.pid, 0)
+            exited = (os.waitstatus_to_exitcode(status), rusage)
+            process.returncode = exited[0]
+
+        def usage() -> ResourceUsage:
+            result = ResourceUsage.from_rusage(exited[1], time.monotonic() - started, exited[0])
+            if cgroup is not None:
+                result.peak_memory_bytes = cgroup.peak_memory()
+            return result
+
+        try:
+            while open_fds or exited is None:
+                if token is not None and token.cancelled:
+                    raise OperationCancelled(token.reason)
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    raise _RunTimeout(cmd, timeout, None)
+                # Poll even without a token: the pipes may outlive the process
+                step = min(left, _CANCEL_POLL_INTERVAL)
+                if open_fds:
+                    ready, _, _ = select.select(open_fds, [], [], step)
+                    for fd in ready:
+                        chunk = os.read(fd, _READ_CHUNK)
+                        if chunk:
+                            by_fd[fd].write(chunk)
+                        else:
+                            open_fds.remove(fd)
+                else:
+                    time.sleep(min(step, 0.01))
+                # Stragglers in the process group may hold the pipes open
+                reap(False)
+            streams = [buffer.close() for buffer in buffers]
+            return exited[0], streams[0], streams[1], usage()
+        except (OperationCancelled, _RunTimeout) as e:
+            if exited is None:
+                kill_process_group(process.pid)
+            if cgroup is not None:
+                cgroup.kill()
+            reap(True)
+            if isinstance(e, _RunTimeout):
+                e.resource_usage = usage()
+            for buffer in buffers:
+                buffer.close()
+            raise
+        finally:
+            if exited is None:
+                # Unexpected error (e.g. in select or read): do not leave a zombie
+                kill_process_group(process.pid)
+                try:
+                    reap(True)
+                except ChildProcessError:
+                    pass
+            process.stdout.close()
+            process.stderr.close()
+            if cgroup is not None:
+                cgroup.close()
@@ -11,12 +11,17 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Union
+
+from orchestrator.pytest_runner import PytestResult, TestStatus
 
 if TYPE_CHECKING:
     from orchestrator.dispatcher import ModelDispatcher
 import re
 
+# Test results as pytest output text or a structured PytestResult
+TestResults = Union[str, PytestResult]
+
 
 class ReviewCategory(Enum):
     """Categories for code review issues."""
@@ -88,16 +93,18 @@ class QAAgent:
         self,
         task: dict,
         code: str,
-        test_results: str,
-        existing_test_results: Optional[str] = None,
+        test_results: TestResults,
+        existing_test_results: Optional[TestResults] = None,
     ) -> ReviewResult:
         """Review code for quality, security, and logic issues.
 
         Args:
             task: Task dict with 'description' and optional 'security_boundaries'.
             code: The code to review.
-            test_results: Results of tests for the new code.
-            existing_test_results: Optional results from existing test suite.
+            test_results: Results of tests for the new code (output text or
+                PytestResult).
+            existing_test_results: Optional results from existing test suite
+                (output text or PytestResult).
 
         Returns:
             ReviewResult with decision, issues, and recommendations.
@@ -106,9 +113,12 @@ class QAAgent:
         task_description = self._format_task_description(task)
 
         # Include existing test results in context if provided
-        full_test_results = test_results
+        full_test_results = self._format_test_results(test_results)
         if existing_test_results:
-            full_test_results = f"New Tests:\n{test_results}\n\nExisting Tests:\n{existing_test_results}"
+            full_test_results = (
+                f"New Tests:\n{full_test_results}\n\n"
+                f"Existing Tests:\n{self._format_test_results(existing_test_results)}"
+            )
 
         # Build prompt variables
         prompt_vars = {
@@ -138,8 +148,8 @@ class QAAgent:
         queue_path: str,
         northstar_path: str,
         code: str,
-        test_results: str,
-        existing_test_results: Optional[str] = None,
+        test_results: TestResults,
+        existing_test_results: Optional[TestResults] = None,
     ) -> ReviewResult:
         """Review code and verify DNA traceability.
 
@@ -207,8 +217,21 @@ class QAAgent:
 
         return description
 
+    def _format_test_results(self, test_results: TestResults) -> str:
+        """Render test results for the review prompt.
+
+        A PytestResult with per-test outcomes is summarized instead of
+        passing its full output.
+        """
+        if isinstance(test_results, str):
+            return test_results
+        summary = test_results.failure_summary()
+        if summary:
+            return f"{test_results.status.value}: {summary}"
+        return test_results.stdout + test_results.stderr
+
     def _parse_review_response(
-        self, response: str, existing_test_results: Optional[str] = None
+        self, response: str, existing_test_results: Optional[TestResults] = None
     ) -> ReviewResult:
         """Parse Pro model response into ReviewResult.
 
@@ -353,15 +376,20 @@ class QAAgent:
 
         return recommendations
 
-    def _has_test_failures(self, test_results: str) -> bool:
+    def _has_test_failures(self, test_results: TestResults) -> bool:
         """Check if test results indicate actual failures.
 
         Args:
-            test_results: Test output string.
+            test_results: Test output string or PytestResult.
 
         Returns:
             True if there are actual test failures, False otherwise.
         """
+        if isinstance(test_results, PytestResult):
+            if test_results.tests:
+                return bool(test_results.failures)
+            return test_results.status != TestStatus.PASSED
+
         # Check for pytest-style "FAILED:" marker
         if "FAILED:" in test_results or "FAILED " in test_results:
             return True
@@ -0,0 +1,286 @@
+"""Background removal of finished worktrees and task branches.
+
+This module provides the WorktreeReaper class which takes worktree
+removal off the task's critical path. WorktreeManager.cleanup hands the
+worktree to the reaper, which:
+- moves it aside immediately (`git worktree move`, a rename on the same
+  filesystem), so the task path is free for the next attempt at once
+- deletes the moved directory in a background thread at idle I/O and
+  lowest CPU priority (`ionice -c3 nice -n19 rm -rf` where available)
+- batches the bookkeeping: one `git worktree prune` and one
+  `update-ref --stdin` transaction for all branches queued since the
+  last batch
+
+Moved-aside directories are named {parent}/hc_reap_{name}_{suffix}.
+Leftovers from a crashed run are picked up again by start().
+
+Example:
+    reaper = WorktreeReaper("/path/to/repo")
+    reaper.start(bases=["/tmp"])
+    manager = WorktreeManager("/path/to/repo", reaper=reaper)
+    ...
+    reaper.close()
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from orchestrator.git_plumbing import GitSession, run_git
+
+logger = logging.getLogger(__name__)
+
+REAP_PREFIX = "hc_reap_"
+
+
+def _low_priority_prefix() -> list[str]:
+    """Command prefix that runs a process at idle I/O and lowest CPU priority."""
+    prefix = []
+    if shutil.which("ionice"):
+        prefix.extend(["ionice", "-c3"])
+    if shutil.which("nice"):
+        prefix.extend(["nice", "-n19"])
+    return prefix
+
+
+class WorktreeReaper:
+    """Deletes worktrees and branches in the background, in batches.
+
+    Attributes:
+        repo_path: Path to the main git repository.
+        batch_delay: Seconds to wait after the first queued item so that
+            further items can share the same prune and ref transaction.
+        low_priority: Whether to delete directories via ionice/nice.
+    """
+
+    def __init__(
+        self, repo_path: str, batch_delay: float = 0.5, low_priority: bool = True
+    ) -> None:
+        """Initialize WorktreeReaper.
+
+        Args:
+            repo_path: Path to the main git repository.
+            batch_delay: Seconds to collect items before processing a batch.
+            low_priority: Delete directories at idle I/O and lowest CPU priority.
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.batch_delay = batch_delay
+        self.low_priority = low_priority
+
+        self._cond = threading.Condition()
+        self._dirs: list[Path] = []
+        self._refs: dict[str, str] = {}
+        # Refs of the batch being processed, until they are deleted
+        self._inflight: dict[str, str] = {}
+        self._prune = False
+        self._busy = False
+        self._flush = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._git = GitSession(self.repo_path)
+
+    @property
+    def pending(self) -> int:
+        """Number of directories and refs waiting to be deleted."""
+        with self._cond:
+            return len(self._dirs) + len(self._refs)
+
+    def start(self, bases: Optional[list[str]] = None) -> None:
+        """Start the background thread.
+
+        Args:
+            bases: Worktree directories to scan for moved-aside worktrees
+                left behind by a previous run; they are queued for deletion.
+        """
+        for base in dict.fromkeys(bases or []):
+            base_path = Path(base)
+            if base_path.is_dir():
+                for path in base_path.glob(f"{REAP_PREFIX}*"):
+                    if path.is_dir():
+                        logger.info(f"Queueing leftover worktree {path} for deletion")
+                        self._enqueue(dirs=[path], prune=True)
+
+        with self._cond:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="hc-reaper", daemon=True)
+        self._thread.start()
+
+    def reap(self, path: str | Path, registered: bool = True) -> bool:
+        """Move a worktree aside and queue it for deletion.
+
+        Args:
+            path: Worktree directory.
+            registered: Whether the directory is a worktree registered with
+                git (moved with `git worktree move`) or a stray directory
+                (renamed).
+
+        Returns:
+            True if the worktree was moved aside (or no longer exists),
+            False if it could not be moved and the caller should remove
+            it itself.
+        """
+        path = Path(path)
+        if not path.exists():
+            return True
+
+        aside = path.parent / f"{REAP_PREFIX}{path.name}_{uuid.uuid4().hex[:8]}"
+        if registered:
+            # Detach HEAD so the task branch can be checked out or deleted
+            # while the directory is still waiting to be removed
+            run_git(path, ["update-ref", "--no-deref", "HEAD", "HEAD"], check=False)
+            result = run_git(
+                self.repo_path, ["worktree", "move", str(path), str(aside)], check=False
+            )
+            if result.returncode != 0:
+                logger.info(f"Cannot move worktree {path} aside: {result.stderr.strip()}")
+                return False
+        else:
+            try:
+                os.rename(path, aside)
+            except OSError as e:
+                logger.info(f"Cannot move {path} aside: {e}")
+                return False
+
+        self._enqueue(dirs=[aside], prune=registered)
+        return True
+
+    def delete_refs(self, refs: dict[str, str]) -> None:
+        """Queue refs for deletion in the next batch.
+
+        Args:
+            refs: Dict of full ref name -> expected OID. A ref that has
+                moved by the time the batch runs is left alone.
+        """
+        if refs:
+            self._enqueue(refs=refs)
+
+    def claim_ref(self, ref: str) -> None:
+        """Delete a queued ref now, because its name is about to be reused.
+
+        Does nothing if the ref is not queued. If the ref is in the batch
+        being processed, waits until the batch has deleted it (a batch
+        deletes its refs before its directories, so this is short).
+
+        Args:
+            ref: Full ref name (e.g. 'refs/heads/feature/T001_attempt_1').
+        """
+        with self._cond:
+            old_value = self._refs.pop(ref, None)
+            self._cond.wait_for(lambda: ref not in self._inflight)
+        if old_value is not None:
+            run_git(self.repo_path, ["update-ref", "-d", ref, old_value], check=False)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been processed.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely).
+
+        Returns:
+            True if the queue is empty, False on timeout.
+        """
+        with self._cond:
+            self._flush = bool(self._dirs or self._refs or self._prune)
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not (self._dirs or self._refs or self._prune or self._busy),
+                timeout=timeout,
+            )
+
+    def close(self, timeout: Optional[float] = 60.0) -> None:
+        """Process what is queued, then stop the background thread.
+
+        Args:
+            timeout: Maximum seconds to wait for pending deletions.
+        """
+        if self._thread is not None:
+            self.drain(timeout=timeout)
+            with self._cond:
+                self._stopped = True
+                self._cond.notify_all()
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._git.close()
+
+    def _enqueue(
+        self,
+        dirs: Optional[list[Path]] = None,
+        refs: Optional[dict[str, str]] = None,
+        prune: bool = False,
+    ) -> None:
+        """Add work for the background thread."""
+        with self._cond:
+            self._dirs.extend(dirs or [])
+            self._refs.update(refs or {})
+            self._prune = self._prune or prune
+            self._cond.notify_all()
+
+    def _run(self) -> None:
+        """Background loop: collect a batch, then delete it."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._stopped or self._dirs or self._refs or self._prune
+                )
+                if self._stopped:
+                    return
+                # Give other cleanups a moment to join this batch
+                deadline = time.monotonic() + self.batch_delay
+                while not (self._stopped or self._flush):
+                    left = deadline - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                self._flush = False
+                dirs, self._dirs = self._dirs, []
+                refs, self._refs = self._refs, {}
+                self._inflight = refs
+                prune, self._prune = self._prune, False
+                self._busy = True
+
+            try:
+                self._process(dirs, refs, prune)
+            except Exception as e:
+                logger.warning(f"Reaper batch failed: {e}")
+            finally:
+                with self._cond:
+                    self._inflight = {}
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _process(self, dirs: list[Path], refs: dict[str, str], prune: bool) -> None:
+        """Delete one batch of refs and directories.
+
+        Refs go first: claim_ref() waits for them, while the directories
+        can take long to remove.
+        """
+        if refs and not self._git.delete_refs(refs):
+            # One moved ref aborts the transaction; retry the others singly
+            for ref, old_value in refs.items():
+                run_git(self.repo_path, ["update-ref", "-d", ref, old_value], check=False)
+        with self._cond:
+            self._inflight = {}
+            self._cond.notify_all()
+        for path in dirs:
+            self._remove_dir(path)
+        if prune:
+            run_git(self.repo_path, ["worktree", "prune"], check=False)
+        logger.debug(f"Reaped {len(dirs)} worktrees and {len(refs)} refs")
+
+    def _remove_dir(self, path: Path) -> None:
+        """Delete a directory tree, at low priority when possible."""
+        if shutil.which("rm"):
+            cmd = ["rm", "-rf", "--", str(path)]
+            if self.low_priority:
+                cmd = _low_priority_prefix() + cmd
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode == 0:
+                return
+            logger.warning(f"Removing {path} failed: {result.stderr.strip()}")
+        shutil.rmtree(path, ignore_errors=True)
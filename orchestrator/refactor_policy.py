@@ -0,0 +1,254 @@
+"""Adaptive REFACTOR phase skipping based on measured outcomes.
+
+This module provides the RefactorPolicy used by TaskPipeline to decide
+whether a task's REFACTOR phase is worth a model round-trip and a pytest
+run. Each REFACTOR ends in one of three outcomes:
+- accepted: the code changed and the tests still pass
+- unchanged: the model returned the same code
+- reverted: the refactored code failed pre-flight checks or the tests
+
+The policy keeps the most recent outcomes per task type and skips
+REFACTOR when:
+- the implementation is trivially small, or
+- enough outcomes have been seen and the fraction accepted is low
+
+Skipped task types are still refactored every explore_every-th time, so
+their estimate recovers when the model (or the code) improves. Outcomes
+are optionally persisted to a JSON file, so estimates survive restarts.
+
+The task type of a task is the directory of its target file (e.g.
+'orchestrator/hd'); callers may pass any other key.
+"""
+
+import json
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from orchestrator.tdd_cycle import RefactorResult
+
+logger = logging.getLogger(__name__)
+
+
+class RefactorOutcome(str, Enum):
+    """Outcome of one REFACTOR phase."""
+
+    ACCEPTED = "accepted"
+    UNCHANGED = "unchanged"
+    REVERTED = "reverted"
+
+
+def code_lines(code: str) -> int:
+    """Number of non-blank, non-comment lines in source code."""
+    return sum(
+        1 for line in code.splitlines() if line.strip() and not line.lstrip().startswith("#")
+    )
+
+
+def refactor_task_type(target_file: str) -> str:
+    """Task type of a task: the directory of its target file."""
+    return Path(target_file).parent.as_posix()
+
+
+@dataclass
+class RefactorStats:
+    """Aggregated REFACTOR outcomes of one task type.
+
+    Attributes:
+        attempts: REFACTOR phases recorded.
+        accepted: Phases whose changes were kept.
+        unchanged: Phases that returned the same code.
+        reverted: Phases whose changes were reverted.
+        size_delta: Total change in code lines of accepted phases
+            (negative when refactoring shrinks the code).
+    """
+
+    attempts: int = 0
+    accepted: int = 0
+    unchanged: int = 0
+    reverted: int = 0
+    size_delta: int = 0
+
+    @property
+    def accept_rate(self) -> float:
+        """Fraction of phases whose changes were kept (0.0 if none yet)."""
+        return self.accepted / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_size_delta(self) -> float:
+        """Average change in code lines per accepted phase."""
+        return self.size_delta / self.accepted if self.accepted else 0.0
+
+
+@dataclass
+class RefactorDecision:
+    """Whether to run REFACTOR for a task, and why.
+
+    Attributes:
+        run: Whether to run the REFACTOR phase.
+        reason: Human-readable reason for the decision.
+    """
+
+    run: bool
+    reason: str
+
+
+class RefactorPolicy:
+    """Decides per task type whether REFACTOR is worth running.
+
+    Thread-safe; one policy is shared by all pipelines of an orchestrator.
+
+    Example:
+        policy = RefactorPolicy(stats_path=".h-conductor/refactor_stats.json")
+        pipeline = TaskPipeline(worktree_manager, dispatcher, refactor_policy=policy)
+    """
+
+    def __init__(
+        self,
+        stats_path: Optional[str] = None,
+        min_impl_lines: int = 10,
+        min_samples: int = 5,
+        min_accept_rate: float = 0.3,
+        explore_every: int = 10,
+        window: int = 50,
+    ) -> None:
+        """Initialize RefactorPolicy.
+
+        Args:
+            stats_path: Optional JSON file the outcomes are loaded from and
+                saved to.
+            min_impl_lines: Implementations with fewer code lines are never
+                refactored.
+            min_samples: Outcomes needed for a task type before it can be
+                skipped for a low accept rate.
+            min_accept_rate: Task types whose accept rate is below this are
+                skipped.
+            explore_every: Still refactor every n-th skipped task of a type
+                (0 disables exploration).
+            window: Most recent outcomes kept per task type.
+        """
+        self.stats_path = Path(stats_path) if stats_path else None
+        self.min_impl_lines = min_impl_lines
+        self.min_samples = min_samples
+        self.min_accept_rate = min_accept_rate
+        self.explore_every = explore_every
+        self.window = window
+        self._lock = threading.Lock()
+        self._outcomes: dict[str, deque[tuple[RefactorOutcome, int]]] = {}
+        self._skipped: dict[str, int] = {}
+        self._load()
+
+    def stats(self, task_type: str) -> RefactorStats:
+        """Aggregate the recorded outcomes of a task type.
+
+        Args:
+            task_type: Task type to aggregate.
+
+        Returns:
+            RefactorStats over the most recent outcomes.
+        """
+        with self._lock:
+            outcomes = list(self._outcomes.get(task_type, ()))
+        stats = RefactorStats(attempts=len(outcomes))
+        for outcome, size_delta in outcomes:
+            if outcome == RefactorOutcome.ACCEPTED:
+                stats.accepted += 1
+                stats.size_delta += size_delta
+            elif outcome == RefactorOutcome.UNCHANGED:
+                stats.unchanged += 1
+            else:
+                stats.reverted += 1
+        return stats
+
+    def decide(self, task_type: str, impl_code: str) -> RefactorDecision:
+        """Decide whether to run REFACTOR for a task.
+
+        Args:
+            task_type: Task type of the task (see refactor_task_type()).
+            impl_code: Implementation produced by the GREEN phase.
+
+        Returns:
+            RefactorDecision for the task.
+        """
+        lines = code_lines(impl_code)
+        if lines < self.min_impl_lines:
+            return RefactorDecision(
+                run=False,
+                reason=f"implementation has {lines} code lines (< {self.min_impl_lines})",
+            )
+
+        stats = self.stats(task_type)
+        if stats.attempts < self.min_samples or stats.accept_rate >= self.min_accept_rate:
+            return RefactorDecision(
+                run=True,
+                reason=f"accept rate {stats.accept_rate:.0%} over {stats.attempts} refactors",
+            )
+
+        with self._lock:
+            skipped = self._skipped.get(task_type, 0) + 1
+            explore = bool(self.explore_every) and skipped >= self.explore_every
+            self._skipped[task_type] = 0 if explore else skipped
+        if explore:
+            return RefactorDecision(
+                run=True,
+                reason=f"re-measuring after {skipped - 1} skipped refactors",
+            )
+        return RefactorDecision(
+            run=False,
+            reason=(
+                f"accept rate {stats.accept_rate:.0%} over {stats.attempts} refactors "
+                f"(< {self.min_accept_rate:.0%})"
+            ),
+        )
+
+    def record(self, task_type: str, result: "RefactorResult") -> None:
+        """Record the outcome of a REFACTOR phase.
+
+        Results without an outcome (e.g. the dispatch failed) are ignored.
+
+        Args:
+            task_type: Task type of the task.
+            result: RefactorResult of the phase.
+        """
+        if result.outcome is None:
+            return
+        with self._lock:
+            outcomes = self._outcomes.setdefault(task_type, deque(maxlen=self.window))
+            outcomes.append((RefactorOutcome(result.outcome), result.size_delta))
+        self._save()
+
+    def _load(self) -> None:
+        """Load recorded outcomes from stats_path, if it exists."""
+        if self.stats_path is None or not self.stats_path.exists():
+            return
+        try:
+            data = json.loads(self.stats_path.read_text())
+            for task_type, outcomes in data.items():
+                self._outcomes[task_type] = deque(
+                    ((RefactorOutcome(o), int(d)) for o, d in outcomes), maxlen=self.window
+                )
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable refactor stats {self.stats_path}: {e}")
+            self._outcomes.clear()
+
+    def _save(self) -> None:
+        """Save recorded outcomes to stats_path atomically."""
+        if self.stats_path is None:
+            return
+        with self._lock:
+            data = {
+                task_type: [[outcome.value, delta] for outcome, delta in outcomes]
+                for task_type, outcomes in self._outcomes.items()
+            }
+            try:
+                self.stats_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = self.stats_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(data, indent=2))
+                temp_path.replace(self.stats_path)
+            except OSError as e:
+                logger.warning(f"Cannot save refactor stats {self.stats_path}: {e}")
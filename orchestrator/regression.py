@@ -0,0 +1,496 @@
+"""Regression runs of the existing tests affected by a task.
+
+This module provides what TaskPipeline's regression stage uses to protect
+the existing suite without running all of it for every task:
+
+- ImportGraph: which repository files import which, built from the
+  target commit's tree with `git ls-tree` and parsed with ast. Parse
+  results are cached by blob OID, so moving the graph to a new commit
+  (after a merge) only parses the files that changed.
+- RegressionRunner: finds the files a task changed in its worktree,
+  selects the existing test files that (transitively) import one of them
+  and runs those test files in parallel, one pytest process each.
+
+A test file also depends on the conftest.py files in its directory and
+above. Changes to pytest configuration (pytest.ini, pyproject.toml,
+setup.cfg, tox.ini) select every test; other changed non-Python files
+(test data) select the tests of the nearest directory that has any. Imports are resolved by
+name against every path suffix of a module (so 'src/pkg/mod.py' provides
+both 'src.pkg.mod' and 'pkg.mod'), which errs towards selecting too many
+tests rather than too few. Dynamic imports (importlib, __import__) are
+not seen.
+"""
+
+import ast
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Optional, TYPE_CHECKING
+
+from orchestrator.cancellation import CancellationToken, current_token
+from orchestrator.git_plumbing import (
+    GitCommandError,
+    GitSession,
+    diff_names,
+    merge_base,
+    run_git,
+)
+from orchestrator.pytest_runner import PytestResult, PytestRunner, merge_results
+
+if TYPE_CHECKING:
+    from orchestrator.worktree import WorktreeManager
+
+logger = logging.getLogger(__name__)
+
+# Changes to these select every test
+PYTEST_CONFIG_FILES = frozenset({"pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini"})
+
+# pytest exit code for a file that collected no tests
+_NO_TESTS_COLLECTED = 5
+
+
+def is_test_file(path: str) -> bool:
+    """Whether a repository path is a pytest test module."""
+    name = PurePosixPath(path).name
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _module_names(path: str) -> list[str]:
+    """Dotted names a module file can be imported as (every path suffix)."""
+    parts = list(PurePosixPath(path).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return [".".join(parts[i:]) for i in range(len(parts))]
+
+
+def _package(path: str) -> str:
+    """Package that relative imports in a module file are resolved against."""
+    return ".".join(PurePosixPath(path).parent.parts)
+
+
+def parse_imports(source: bytes, package: str) -> frozenset[str]:
+    """Collect the module names a source file imports.
+
+    For `from a import b` both 'a' and 'a.b' are reported, since b may be a
+    submodule. Relative imports are made absolute against package.
+
+    Args:
+        source: Python source.
+        package: Dotted package of the file ('' at the top level).
+
+    Returns:
+        Imported dotted names (empty if the file does not parse).
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return frozenset()
+
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package.split(".") if package else []
+                parts = parts[: max(len(parts) - (node.level - 1), 0)]
+                base = ".".join(p for p in (*parts, base) if p)
+            if base:
+                names.add(base)
+            names.update(
+                f"{base}.{alias.name}" if base else alias.name
+                for alias in node.names
+                if alias.name != "*"
+            )
+    return frozenset(names)
+
+
+class ImportGraph:
+    """Import dependencies between the Python files of one commit.
+
+    Thread-safe; several pipelines may share one graph.
+
+    Attributes:
+        repo_path: Repository the graph is built from.
+        commit: Commit the graph describes (None until update()).
+    """
+
+    def __init__(self, repo_path: str | Path) -> None:
+        """Initialize ImportGraph.
+
+        Args:
+            repo_path: Repository (or any worktree of it).
+        """
+        self.repo_path = Path(repo_path)
+        self.commit: Optional[str] = None
+        self._git = GitSession(self.repo_path)
+        self._lock = threading.Lock()
+        # (blob oid, package) -> imported names
+        self._parsed: dict[tuple[str, str], frozenset[str]] = {}
+        # Python file -> files it depends on / files depending on it
+        self._deps: dict[str, set[str]] = {}
+        self._dependents: dict[str, set[str]] = {}
+
+    def update(self, commit: str) -> int:
+        """Move the graph to a commit, parsing only files not seen before.
+
+        Args:
+            commit: Commit OID.
+
+        Returns:
+            Number of files parsed.
+
+        Raises:
+            GitCommandError: If the commit's tree cannot be listed.
+        """
+        with self._lock:
+            if commit == self.commit:
+                return 0
+            listing = run_git(self.repo_path, ["ls-tree", "-r", "-z", "--full-tree", commit])
+            blobs = {}
+            for entry in listing.stdout.split("\0"):
+                meta, _, path = entry.partition("\t")
+                fields = meta.split()
+                if path.endswith(".py") and len(fields) == 3 and fields[1] == "blob":
+                    blobs[path] = fields[2]
+
+            parsed = 0
+            imports = {}
+            for path, oid in blobs.items():
+                key = (oid, _package(path))
+                if key not in self._parsed:
+                    self._parsed[key] = parse_imports(self._git.read_object(oid) or b"", key[1])
+                    parsed += 1
+                imports[path] = self._parsed[key]
+            # Drop parse results no longer referenced
+            live = {(oid, _package(path)) for path, oid in blobs.items()}
+            self._parsed = {k: v for k, v in self._parsed.items() if k in live}
+
+            self._build(imports)
+            self.commit = commit
+            logger.info(
+                f"Import graph at {commit[:12]}: {len(blobs)} Python files, {parsed} parsed"
+            )
+            return parsed
+
+    def _build(self, imports: dict[str, frozenset[str]]) -> None:
+        """Resolve imported names to files and index both directions."""
+        modules: dict[str, set[str]] = {}
+        conftests: dict[str, str] = {}
+        for path in imports:
+            for name in _module_names(path):
+                modules.setdefault(name, set()).add(path)
+            if PurePosixPath(path).name == "conftest.py":
+                conftests[str(PurePosixPath(path).parent)] = path
+
+        deps: dict[str, set[str]] = {}
+        dependents: dict[str, set[str]] = {path: set() for path in imports}
+        for path, names in imports.items():
+            targets = set()
+            for name in names:
+                # Importing a.b.c also runs a/__init__.py and a/b/__init__.py
+                parts = name.split(".")
+                for i in range(1, len(parts) + 1):
+                    targets.update(modules.get(".".join(parts[:i]), ()))
+            # pytest loads the conftest.py files above a test module first
+            for parent in PurePosixPath(path).parents:
+                conftest = conftests.get(str(parent))
+                if conftest is not None:
+                    targets.add(conftest)
+            targets.discard(path)
+            deps[path] = targets
+            for target in targets:
+                dependents[target].add(path)
+        self._deps, self._dependents = deps, dependents
+
+    def test_files(self) -> list[str]:
+        """All test files of the commit."""
+        return sorted(p for p in self._deps if is_test_file(p))
+
+    def affected_tests(self, changed: Iterable[str]) -> list[str]:
+        """Test files that may behave differently after changes.
+
+        Args:
+            changed: Repository-relative paths changed (added, modified or
+                deleted) relative to the graph's commit.
+
+        Returns:
+            Sorted test files of the graph's commit.
+        """
+        with self._lock:
+            changed = set(changed)
+            if any(PurePosixPath(p).name in PYTEST_CONFIG_FILES for p in changed):
+                return self.test_files()
+
+            selected: set[str] = set()
+            # Changed or deleted modules; new ones have no existing importers
+            seeds = [p for p in changed if p in self._deps]
+            for path in changed - set(seeds):
+                if path.endswith(".py"):
+                    continue
+                # Test data: the tests of the nearest directory holding any
+                # (not the repository root, e.g. for a README)
+                for directory in PurePosixPath(path).parents:
+                    if directory == PurePosixPath("."):
+                        break
+                    tests = [
+                        t for t in self._deps
+                        if is_test_file(t) and directory in PurePosixPath(t).parents
+                    ]
+                    if tests:
+                        selected.update(tests)
+                        break
+            seen = set(seeds)
+            queue = deque(seeds)
+            while queue:
+                path = queue.popleft()
+                for dependent in self._dependents.get(path, ()):
+                    if dependent not in seen:
+                        seen.add(dependent)
+                        queue.append(dependent)
+            selected.update(p for p in seen if is_test_file(p))
+            return sorted(selected)
+
+    def dependencies(self, paths: Iterable[str]) -> set[str]:
+        """Files the given files need, transitively (including themselves).
+
+        Args:
+            paths: Repository-relative Python files.
+
+        Returns:
+            The files plus everything they import from the repository.
+        """
+        with self._lock:
+            seen = set(paths)
+            queue = deque(seen)
+            while queue:
+                for dep in self._deps.get(queue.popleft(), ()):
+                    if dep not in seen:
+                        seen.add(dep)
+                        queue.append(dep)
+            return seen
+
+    def close(self) -> None:
+        """Stop the git helper processes."""
+        self._git.close()
+
+
+@dataclass
+class RegressionResult:
+    """Outcome of a regression run for one task.
+
+    Attributes:
+        changed_files: Repository-relative paths the task changed.
+        selected_tests: Existing test files selected for the changes.
+        result: Combined PytestResult of the selected test files (PASSED
+            with no tests if none were selected).
+        skipped_tests: Selected test files that could not be run (missing
+            from the worktree).
+        duration: Wall time in seconds.
+    """
+
+    changed_files: list[str]
+    selected_tests: list[str]
+    result: PytestResult
+    skipped_tests: list[str] = field(default_factory=list)
+    duration: float = 0.0
+
+    @property
+    def passed(self) -> bool:
+        """Whether every selected test file passed."""
+        return not self.result.failures and self.result.exit_code == 0
+
+
+class RegressionRunner:
+    """Runs the existing tests affected by a task's changes.
+
+    The import graph describes the tip of base_ref in the main repository
+    and is moved forward (incrementally) whenever that tip changes. Test
+    files run in parallel, up to max_workers at a time.
+
+    Attributes:
+        repo_path: Main repository.
+        pytest_runner: Runner for the individual test files.
+        max_workers: Maximum number of test files run at once.
+        base_ref: Ref tasks branch from and merge into.
+        graph: Import graph of base_ref's tip.
+
+    Example:
+        runner = RegressionRunner("/path/to/repo")
+        outcome = runner.run("/tmp/hc_worktree_T001")
+        if not outcome.passed:
+            print(outcome.result.failure_summary())
+    """
+
+    def __init__(
+        self,
+        repo_path: str | Path,
+        pytest_runner: Optional[PytestRunner] = None,
+        max_workers: Optional[int] = None,
+        base_ref: str = "HEAD",
+    ) -> None:
+        """Initialize RegressionRunner.
+
+        Args:
+            repo_path: Main repository.
+            pytest_runner: Runner for test files (default: PytestRunner()).
+            max_workers: Parallel test files (default: os.cpu_count()).
+            base_ref: Ref tasks branch from and merge into (default: HEAD).
+        """
+        self.repo_path = Path(repo_path)
+        self.pytest_runner = pytest_runner or PytestRunner()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.base_ref = base_ref
+        self.graph = ImportGraph(self.repo_path)
+
+    def changed_files(self, worktree_path: str | Path) -> set[str]:
+        """Paths a worktree changed relative to the graph's commit.
+
+        Covers commits on the task branch as well as uncommitted and
+        untracked files.
+
+        Args:
+            worktree_path: Task worktree.
+
+        Returns:
+            Repository-relative paths.
+
+        Raises:
+            GitCommandError: If git fails.
+        """
+        changed = set()
+        base = merge_base(worktree_path, "HEAD", self.graph.commit)
+        if base is not None:
+            # Only the task's own commits; the target may have moved on since
+            changed |= diff_names(worktree_path, base, "HEAD")
+        status = run_git(
+            worktree_path, ["status", "--porcelain", "-z", "--untracked-files=all"]
+        ).stdout.split("\0")
+        entries = iter(status)
+        for entry in entries:
+            if len(entry) < 4:
+                continue
+            changed.add(entry[3:])
+            if entry[0] in "RC":
+                # Renames and copies are followed by the source path
+                changed.add(next(entries, ""))
+        changed.discard("")
+        return changed
+
+    def select(
+        self, worktree_path: str | Path, fallback: Iterable[str] = ()
+    ) -> tuple[list[str], list[str]]:
+        """Select the existing tests affected by a worktree's changes.
+
+        Args:
+            worktree_path: Task worktree.
+            fallback: Paths to treat as changed if git cannot tell
+                (e.g. TaskModel.files).
+
+        Returns:
+            Tuple of (changed files, selected test files).
+
+        Raises:
+            GitCommandError: If the graph cannot be moved to base_ref's tip.
+        """
+        tip = run_git(self.repo_path, ["rev-parse", f"{self.base_ref}^{{commit}}"]).stdout
+        self.graph.update(tip.strip())
+        try:
+            changed = self.changed_files(worktree_path)
+        except GitCommandError as e:
+            logger.warning(f"Cannot list changes in {worktree_path}, using task files: {e}")
+            changed = set(fallback)
+        return sorted(changed), self.graph.affected_tests(changed)
+
+    def run(
+        self,
+        worktree_path: str | Path,
+        fallback: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        worktree_manager: Optional["WorktreeManager"] = None,
+        task_id: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> RegressionResult:
+        """Run the existing tests affected by a worktree's changes.
+
+        Args:
+            worktree_path: Task worktree.
+            fallback: Paths to treat as changed if git cannot tell.
+            exclude: Test files not to run (e.g. the task's own test,
+                already run by the TDD cycle).
+            worktree_manager: Manager of a sparse worktree; selected tests
+                and the files they import are materialized into it.
+            task_id: Task of the worktree (with worktree_manager).
+            cancel_token: Token bounding the runs (defaults to current_token()).
+
+        Returns:
+            RegressionResult of the selected tests.
+
+        Raises:
+            OperationCancelled: If the token fires before the runs finish.
+        """
+        start = time.perf_counter()
+        token = cancel_token or current_token()
+        worktree = Path(worktree_path)
+        changed, selected = self.select(worktree, fallback)
+        excluded = {str(PurePosixPath(p)) for p in exclude}
+        selected = [t for t in selected if t not in excluded]
+
+        # A sparse worktree may lack the tests or the modules they import
+        missing = [p for p in self.graph.dependencies(selected) if not (worktree / p).exists()]
+        if missing and worktree_manager is not None and task_id is not None:
+            try:
+                worktree_manager.materialize(task_id, sorted(f"/{p}" for p in missing))
+            except Exception as e:
+                logger.warning(f"Cannot materialize regression tests for {task_id}: {e}")
+        runnable = [t for t in selected if (worktree / t).exists()]
+        skipped = [t for t in selected if t not in runnable]
+        if skipped:
+            logger.warning(f"Skipping {len(skipped)} regression test files missing from {worktree}")
+
+        logger.info(
+            f"Regression: {len(changed)} changed files select {len(runnable)} test files "
+            f"(of {len(self.graph.test_files())})"
+        )
+        results = []
+        if runnable:
+            with ThreadPoolExecutor(
+                max_workers=min(self.max_workers, len(runnable)),
+                thread_name_prefix="regression",
+            ) as pool:
+                # Threads do not inherit the active token; pass it explicitly
+                futures = [
+                    pool.submit(
+                        self.pytest_runner.run,
+                        str(worktree / test),
+                        working_dir=str(worktree),
+                        cancel_token=token,
+                    )
+                    for test in runnable
+                ]
+                try:
+                    results = [future.result() for future in futures]
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        # A file without tests (e.g. all deselected) is not a failure
+        results = [r for r in results if r.exit_code != _NO_TESTS_COLLECTED]
+        return RegressionResult(
+            changed_files=changed,
+            selected_tests=runnable,
+            result=merge_results(results, str(worktree)),
+            skipped_tests=skipped,
+            duration=time.perf_counter() - start,
+        )
+
+    def close(self) -> None:
+        """Stop the graph's git helper processes."""
+        self.graph.close()
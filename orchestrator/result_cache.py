@@ -0,0 +1,278 @@
+"""Cache of pytest results keyed by the content of their inputs.
+
+This module provides the ResultCache class used by PytestRunner to skip
+re-running pytest when nothing it depends on has changed: a REFACTOR that
+returns identical code, or a GREEN retry that regenerates the same
+implementation, gets the earlier PytestResult back at once.
+
+A cache key combines:
+- the pytest arguments, working directory and test file
+- a content hash of every file under the test file's project root (the
+  git toplevel, else the directory of the nearest pytest configuration
+  file) and under the working directory; large files contribute their
+  size and mtime instead. Implementation files anywhere in the project
+  (not only next to the test), conftest.py, pytest configuration and test
+  data are all covered
+- an interpreter fingerprint: the python3 binary, its version and the
+  modification times of its sys.path directories (which change when
+  packages are installed or removed), plus PYTHONPATH
+
+File hashes are memoized by (device, inode, size, mtime) in a bounded
+LRU map, so computing a key for an unchanged tree costs one directory
+walk. Only deterministic outcomes are cached; timeouts and
+infrastructure errors are not.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from orchestrator.pytest_runner import PytestResult
+
+# Directories never hashed (VCS data, caches, virtualenvs)
+SKIP_DIRS = frozenset(
+    {".git", "__pycache__", ".pytest_cache", ".mypy_cache", ".tox", ".venv", "venv",
+     "node_modules"}
+)
+
+# Files marking a pytest rootdir when there is no git toplevel
+_PYTEST_CONFIG_FILES = ("pytest.ini", "pyproject.toml", "setup.cfg", "tox.ini")
+
+# Files larger than this contribute size and mtime instead of content
+_MAX_HASH_BYTES = 1024 * 1024
+
+# pytest exit codes whose results are reproducible (passed, failed,
+# usage/collection error, no tests collected)
+_CACHEABLE_EXIT_CODES = frozenset({0, 1, 2, 5})
+
+
+def project_root(path: Path) -> Path:
+    """Root of the project a file or directory belongs to.
+
+    The nearest ancestor holding .git (a directory, or a file in linked
+    worktrees); without one, the nearest ancestor holding a pytest
+    configuration file; else the directory itself.
+
+    Args:
+        path: File or directory inside the project.
+
+    Returns:
+        Resolved project root directory.
+    """
+    start = path.resolve()
+    if not start.is_dir():
+        start = start.parent
+    ancestors = [start, *start.parents]
+    for candidate in ancestors:
+        if (candidate / ".git").exists():
+            return candidate
+    for candidate in ancestors:
+        if any((candidate / name).is_file() for name in _PYTEST_CONFIG_FILES):
+            return candidate
+    return start
+
+
+@dataclass
+class CacheStats:
+    """Hit and miss counts of a ResultCache.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that required a pytest run.
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache (0.0 if none yet)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResultCache:
+    """In-memory LRU cache of PytestResults keyed by input content.
+
+    Attributes:
+        max_entries: Maximum number of cached results.
+        max_file_hashes: Maximum number of memoized file hashes.
+        stats: Hit and miss counts since creation (or reset_stats()).
+
+    Example:
+        cache = ResultCache()
+        runner = PytestRunner(result_cache=cache)
+        ...
+        print(f"pytest cache hit rate: {cache.stats.hit_rate:.0%}")
+    """
+
+    def __init__(self, max_entries: int = 256, max_file_hashes: int = 100_000) -> None:
+        """Initialize ResultCache.
+
+        Args:
+            max_entries: Maximum number of cached results.
+            max_file_hashes: Maximum number of memoized file hashes (every
+                worktree and every edit adds entries for its files).
+        """
+        self.max_entries = max_entries
+        self.max_file_hashes = max_file_hashes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._results: OrderedDict[str, "PytestResult"] = OrderedDict()
+        self._file_hashes: OrderedDict[tuple, str] = OrderedDict()
+        self._interpreters: dict[str, tuple[str, list[str]]] = {}
+
+    def key(self, test_path: str, cwd: str, args: list[str]) -> str:
+        """Compute the cache key of a pytest run.
+
+        Args:
+            test_path: Test file to run.
+            cwd: Working directory of the run.
+            args: pytest arguments.
+
+        Returns:
+            Hex digest identifying the run's inputs.
+        """
+        digest = hashlib.sha256()
+        cwd_path = Path(cwd).resolve()
+        test_file = Path(test_path)
+        if not test_file.is_absolute():
+            test_file = cwd_path / test_file
+        # The test imports from anywhere in its project, not only from cwd
+        root = project_root(test_file.parent)
+        trees = [root] if cwd_path.is_relative_to(root) else [root, cwd_path]
+        digest.update(json.dumps([str(cwd_path), str(root), test_path, args]).encode())
+        digest.update(self._interpreter_fingerprint().encode())
+        digest.update(self._file_hash(test_file).encode())
+        for tree in trees:
+            for path in self._tree_files(tree):
+                entry = f"\0{tree}\0{path.relative_to(tree)}\0{self._file_hash(path)}"
+                digest.update(entry.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional["PytestResult"]:
+        """Look up a result, counting the hit or miss.
+
+        Args:
+            key: Key from key().
+
+        Returns:
+            The cached PytestResult, or None.
+        """
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.stats.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.stats.hits += 1
+            return replace(result)
+
+    def put(self, key: str, result: "PytestResult") -> bool:
+        """Store a result if its outcome is reproducible.
+
+        Args:
+            key: Key from key(), computed before the run.
+            result: Result of the run.
+
+        Returns:
+            True if the result was cached.
+        """
+        if result.exit_code not in _CACHEABLE_EXIT_CODES:
+            return False
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return True
+
+    def clear(self) -> None:
+        """Drop all cached results and file hashes."""
+        with self._lock:
+            self._results.clear()
+            self._file_hashes.clear()
+            self._interpreters.clear()
+
+    def reset_stats(self) -> CacheStats:
+        """Start counting hits and misses afresh.
+
+        Returns:
+            The statistics collected so far.
+        """
+        with self._lock:
+            stats, self.stats = self.stats, CacheStats()
+        return stats
+
+    def _tree_files(self, root: Path) -> list[Path]:
+        """All files under root, in a stable order, skipping SKIP_DIRS."""
+        files = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            files.extend(Path(dirpath) / name for name in sorted(filenames))
+        return files
+
+    def _file_hash(self, path: Path) -> str:
+        """Content hash of a file, memoized by its stat identity."""
+        try:
+            st = path.stat()
+        except OSError:
+            return "missing"
+        if st.st_size > _MAX_HASH_BYTES:
+            return f"size:{st.st_size}:{st.st_mtime_ns}"
+        identity = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._file_hashes.get(identity)
+            if cached is not None:
+                self._file_hashes.move_to_end(identity)
+                return cached
+        try:
+            value = hashlib.sha256(path.read_bytes()).hexdigest()
+        except OSError:
+            return "unreadable"
+        with self._lock:
+            self._file_hashes[identity] = value
+            while len(self._file_hashes) > self.max_file_hashes:
+                self._file_hashes.popitem(last=False)
+        return value
+
+    def _interpreter_fingerprint(self, python: str = "python3") -> str:
+        """Identify the interpreter and its installed packages."""
+        executable = shutil.which(python) or python
+        real = os.path.realpath(executable)
+        try:
+            st = os.stat(real)
+            binary = f"{real}:{st.st_size}:{st.st_mtime_ns}"
+        except OSError:
+            binary = real
+
+        if binary not in self._interpreters:
+            try:
+                out = subprocess.run(
+                    [executable, "-c", "import json, sys; print(json.dumps([sys.version, sys.path]))"],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                ).stdout
+                version, paths = json.loads(out)
+            except (OSError, ValueError, subprocess.TimeoutExpired):
+                version, paths = "", []
+            with self._lock:
+                self._interpreters[binary] = (version, [p for p in paths if p])
+
+        version, paths = self._interpreters[binary]
+        parts = [binary, version, os.environ.get("PYTHONPATH", "")]
+        for path in paths:
+            try:
+                parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+            except OSError:
+                parts.append(f"{path}:missing")
+        return "\n".join(parts)
@@ -0,0 +1,299 @@
+"""Resource limits and usage accounting for test runs.
+
+This module provides what PytestRunner uses to keep one generated test
+from starving the other workers on the machine:
+
+- ResourceLimits: per-run caps applied as rlimits to the test process
+  (address space, CPU seconds, processes, file size) and, when cgroup v2
+  is usable, as cgroup limits (memory, pids, CPU bandwidth)
+- CgroupSandbox: a throwaway cgroup v2 group per run; everything the test
+  starts is inside it, so the whole tree can be killed at once and its
+  peak memory read afterwards
+- ResourceUsage: CPU time, peak RSS and wall time of a run, from wait4()
+  rusage (and the cgroup's memory.peak where available)
+- kill_process_group(): test processes run in their own session, so a
+  timeout kills grandchildren (e.g. a fork bomb) and not only the direct
+  child
+
+Note that RLIMIT_NPROC counts all processes of the user, not only those
+of the run; prefer the cgroup pids limit when it is available.
+"""
+
+import logging
+import os
+import resource
+import signal
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+CGROUP_PREFIX = "hc_pytest_"
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Per-run resource caps (None leaves a resource unlimited).
+
+    Attributes:
+        memory_bytes: Address-space limit (RLIMIT_AS); with a cgroup also
+            the memory.max limit on resident memory.
+        cpu_seconds: CPU time limit (RLIMIT_CPU); the process gets SIGXCPU,
+            then SIGKILL one second later.
+        max_processes: Process limit (RLIMIT_NPROC, per user); with a cgroup
+            the pids.max limit of the run.
+        file_size_bytes: Largest file the run may write (RLIMIT_FSIZE).
+        cpu_quota: CPU bandwidth in CPUs (e.g. 1.0), cgroup only.
+        use_cgroup: Run each test in its own cgroup v2 group if possible.
+    """
+
+    memory_bytes: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    max_processes: Optional[int] = None
+    file_size_bytes: Optional[int] = None
+    cpu_quota: Optional[float] = None
+    use_cgroup: bool = False
+
+    def rlimits(self) -> list[tuple[int, tuple[int, int]]]:
+        """rlimits to apply, as (resource, (soft, hard)) pairs."""
+        limits = []
+        if self.memory_bytes is not None:
+            limits.append((resource.RLIMIT_AS, (self.memory_bytes, self.memory_bytes)))
+        if self.cpu_seconds is not None:
+            limits.append((resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds + 1)))
+        if self.max_processes is not None:
+            limits.append((resource.RLIMIT_NPROC, (self.max_processes, self.max_processes)))
+        if self.file_size_bytes is not None:
+            limits.append(
+                (resource.RLIMIT_FSIZE, (self.file_size_bytes, self.file_size_bytes))
+            )
+        return limits
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by one run.
+
+    Attributes:
+        wall_time: Elapsed seconds.
+        user_time: User CPU seconds of the test process and its reaped children.
+        system_time: System CPU seconds of the test process and its reaped children.
+        max_rss_bytes: Peak resident set size of the largest process.
+        peak_memory_bytes: Peak memory of the whole run (cgroup only).
+        signal: Signal that ended the test process, if any (e.g. 'SIGXCPU').
+    """
+
+    wall_time: float = 0.0
+    user_time: float = 0.0
+    system_time: float = 0.0
+    max_rss_bytes: int = 0
+    peak_memory_bytes: Optional[int] = None
+    signal: Optional[str] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_rusage(
+        cls, rusage: Any, wall_time: float, returncode: Optional[int] = None
+    ) -> "ResourceUsage":
+        """Build from a wait4() rusage (or a dict with the same fields).
+
+        Args:
+            rusage: resource.struct_rusage or dict with ru_utime, ru_stime
+                and ru_maxrss.
+            wall_time: Elapsed seconds.
+            returncode: Exit code (negative for a signal), if known.
+        """
+        get = rusage.get if isinstance(rusage, dict) else lambda k: getattr(rusage, k)
+        signame = None
+        if returncode is not None and returncode < 0:
+            try:
+                signame = signal.Signals(-returncode).name
+            except ValueError:
+                signame = str(-returncode)
+        return cls(
+            wall_time=wall_time,
+            user_time=float(get("ru_utime")),
+            system_time=float(get("ru_stime")),
+            # ru_maxrss is in kilobytes on Linux
+            max_rss_bytes=int(get("ru_maxrss")) * 1024,
+            signal=signame,
+        )
+
+
+def apply_rlimits(pid: int, limits: ResourceLimits) -> None:
+    """Apply rlimits to a running process (Linux prlimit).
+
+    Processes it starts afterwards inherit the limits.
+
+    Args:
+        pid: Process to limit.
+        limits: Limits to apply.
+    """
+    for res, value in limits.rlimits():
+        try:
+            resource.prlimit(pid, res, value)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Cannot set rlimit {res} on pid {pid}: {e}")
+
+
+def kill_process_group(pgid: int) -> None:
+    """SIGKILL a process group (no error if it is already gone).
+
+    Args:
+        pgid: Process group ID (the pid of the group leader).
+    """
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def _cgroup2_root() -> Optional[Path]:
+    """Mount point of the cgroup v2 hierarchy, if mounted."""
+    try:
+        for line in Path("/proc/mounts").read_text().splitlines():
+            fields = line.split()
+            if len(fields) > 2 and fields[2] == "cgroup2":
+                return Path(fields[1])
+    except OSError:
+        pass
+    return None
+
+
+def _own_cgroup() -> Optional[str]:
+    """This process's cgroup v2 path (relative to the hierarchy root)."""
+    try:
+        for line in Path("/proc/self/cgroup").read_text().splitlines():
+            if line.startswith("0::"):
+                return line[3:]
+    except OSError:
+        pass
+    return None
+
+
+class CgroupSandbox:
+    """A throwaway cgroup v2 group holding one test run.
+
+    Create with CgroupSandbox.create(); it returns None where cgroup v2 is
+    not mounted or not writable, and the caller relies on rlimits alone.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize CgroupSandbox for an existing group directory.
+
+        Args:
+            path: Directory of the group in the cgroup v2 hierarchy.
+        """
+        self.path = path
+
+    @classmethod
+    def create(cls, limits: ResourceLimits) -> Optional["CgroupSandbox"]:
+        """Create a group below this process's cgroup and apply the limits.
+
+        Limits whose controller is not enabled are skipped (the group is
+        still used for killing and accounting).
+
+        Args:
+            limits: Limits to apply.
+
+        Returns:
+            The sandbox, or None if cgroup v2 is unavailable.
+        """
+        root, own = _cgroup2_root(), _own_cgroup()
+        if root is None or own is None:
+            return None
+        parent = root / own.lstrip("/")
+        path = parent / f"{CGROUP_PREFIX}{uuid.uuid4().hex[:8]}"
+        try:
+            path.mkdir()
+        except OSError as e:
+            logger.debug(f"cgroup v2 not usable at {parent}: {e}")
+            return None
+
+        try:
+            # Fails when the parent holds processes itself; the group then
+            # has no controllers but can still kill and account
+            (parent / "cgroup.subtree_control").write_text("+memory +pids +cpu")
+        except OSError:
+            pass
+        settings = {}
+        if limits.memory_bytes is not None:
+            settings["memory.max"] = str(limits.memory_bytes)
+            settings["memory.swap.max"] = "0"
+        if limits.max_processes is not None:
+            settings["pids.max"] = str(limits.max_processes)
+        if limits.cpu_quota is not None:
+            period = 100_000
+            settings["cpu.max"] = f"{int(limits.cpu_quota * period)} {period}"
+        for name, value in settings.items():
+            try:
+                (path / name).write_text(value)
+            except OSError as e:
+                logger.debug(f"Cannot set {name} on {path}: {e}")
+        return cls(path)
+
+    def add(self, pid: int) -> bool:
+        """Move a process into the group.
+
+        Args:
+            pid: Process to move.
+
+        Returns:
+            True if the process was moved.
+        """
+        try:
+            (self.path / "cgroup.procs").write_text(str(pid))
+            return True
+        except OSError as e:
+            logger.debug(f"Cannot move pid {pid} into {self.path}: {e}")
+            return False
+
+    def kill(self) -> None:
+        """SIGKILL every process in the group."""
+        try:
+            (self.path / "cgroup.kill").write_text("1")
+            return
+        except OSError:
+            pass
+        # Kernels before 5.14 have no cgroup.kill
+        try:
+            for pid in (self.path / "cgroup.procs").read_text().split():
+                try:
+                    os.kill(int(pid), signal.SIGKILL)
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+    def peak_memory(self) -> Optional[int]:
+        """Peak memory of the group in bytes (kernel 5.19+), if known."""
+        try:
+            return int((self.path / "memory.peak").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Kill what is left in the group and remove it.
+
+        Args:
+            timeout: Seconds to wait for killed processes to exit.
+        """
+        self.kill()
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.path.rmdir()
+                return
+            except FileNotFoundError:
+                return
+            except OSError as e:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Cannot remove cgroup {self.path}: {e}")
+                    return
+                time.sleep(0.01)
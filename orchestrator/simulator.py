@@ -0,0 +1,584 @@
+"""Discrete-event simulator for queue execution.
+
+This module replays the execution loop's scheduling over a real
+queue.json dependency graph without touching git or the model proxies,
+so parallelism can be sized before spending proxy quota.
+
+The simulation:
+- Selects ready tasks exactly like TaskSelector (open, dependencies
+  complete, lowest priority number first), handing them to idle workers
+- Runs each task through the pipeline stages with sampled latencies
+- Throttles model calls with a requests-per-minute rate limit shared by
+  all workers
+- Models the merge policy: 'queue' serializes merges like MergeQueue,
+  'concurrent' lets merges run in parallel like WorktreeManager.merge();
+  with either policy, a task whose target moved since its worktree was
+  created is merged three-way and blocked only if that merge conflicts
+  (see LatencyModel.conflict_rate)
+
+Latencies come either from a configured LatencyModel or from trace files
+recorded with HC_TRACE_FILE (see orchestrator.tracing).
+
+Example:
+    model = LatencyModel.from_trace("/tmp/hc_trace.json")
+    report = simulate("queue.json", model, workers=4, rate_limit=60)
+    print(format_report(report))
+"""
+
+import heapq
+import json
+import logging
+import math
+import random
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from orchestrator.models import QueueModel, TaskStatus
+from orchestrator.queue_manager import QueueManager
+from orchestrator.tracing import load_trace
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in execution order (see TaskPipeline)
+PIPELINE_STAGES: tuple[str, ...] = (
+    "worktree", "tdd", "regression", "qa", "dna", "merge", "memory", "cleanup"
+)
+
+MERGE_POLICIES: tuple[str, ...] = ("queue", "concurrent")
+
+
+@dataclass
+class StageLatency:
+    """Latency distribution for one pipeline stage.
+
+    Samples are drawn from the empirical samples if any, otherwise from a
+    lognormal distribution with the given mean and standard deviation
+    (a constant when stddev is 0).
+
+    Attributes:
+        mean: Mean duration in seconds.
+        stddev: Standard deviation in seconds.
+        dispatch_calls: Model proxy calls the stage makes (rate limited).
+        samples: Observed durations in seconds (e.g. from a trace).
+    """
+
+    mean: float
+    stddev: float = 0.0
+    dispatch_calls: int = 0
+    samples: list[float] = field(default_factory=list)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one duration in seconds."""
+        if self.samples:
+            return rng.choice(self.samples)
+        if self.stddev <= 0 or self.mean <= 0:
+            return max(self.mean, 0.0)
+        # Lognormal parameters matching the requested mean and stddev
+        sigma2 = math.log(1 + (self.stddev / self.mean) ** 2)
+        mu = math.log(self.mean) - sigma2 / 2
+        return rng.lognormvariate(mu, math.sqrt(sigma2))
+
+
+def _default_stages() -> dict[str, StageLatency]:
+    """Rough latencies for a small repository and hosted proxies."""
+    return {
+        "worktree": StageLatency(mean=2.0, stddev=0.5),
+        "tdd": StageLatency(mean=90.0, stddev=40.0, dispatch_calls=3),
+        "qa": StageLatency(mean=20.0, stddev=8.0, dispatch_calls=1),
+        "dna": StageLatency(mean=0.5),
+        "merge": StageLatency(mean=3.0, stddev=1.0),
+        "memory": StageLatency(mean=10.0, stddev=4.0, dispatch_calls=1),
+        "cleanup": StageLatency(mean=1.0, stddev=0.3),
+    }
+
+
+@dataclass
+class LatencyModel:
+    """Per-stage latency distributions plus task failure and conflict rates.
+
+    Attributes:
+        stages: StageLatency by stage name; stages not listed take no time.
+        failure_rate: Probability that a task fails in its TDD stage and is
+            blocked (its dependents then never become ready).
+        conflict_rate: Probability that a task's merge conflicts with one
+            other task merged into the target since the task's worktree
+            was created; a conflicting task is blocked.
+    """
+
+    stages: dict[str, StageLatency] = field(default_factory=_default_stages)
+    failure_rate: float = 0.0
+    conflict_rate: float = 0.0
+
+    @classmethod
+    def from_config(cls, data: dict[str, Any]) -> "LatencyModel":
+        """Create a model from a configuration dictionary.
+
+        Stages not mentioned keep their defaults.
+
+        Example config:
+            {"failure_rate": 0.1, "conflict_rate": 0.05,
+             "stages": {"tdd": {"mean": 120, "stddev": 30, "dispatch_calls": 3}}}
+
+        Args:
+            data: Configuration dictionary.
+
+        Returns:
+            LatencyModel.
+        """
+        stages = _default_stages()
+        for name, spec in data.get("stages", {}).items():
+            stages[name] = StageLatency(
+                mean=float(spec.get("mean", 0.0)),
+                stddev=float(spec.get("stddev", 0.0)),
+                dispatch_calls=int(spec.get("dispatch_calls", 0)),
+                samples=[float(s) for s in spec.get("samples", [])],
+            )
+        return cls(
+            stages=stages,
+            failure_rate=float(data.get("failure_rate", 0.0)),
+            conflict_rate=float(data.get("conflict_rate", 0.0)),
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "LatencyModel":
+        """Load a model from a JSON configuration file (see from_config())."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_config(json.load(f))
+
+    @classmethod
+    def from_trace(cls, *paths: str) -> "LatencyModel":
+        """Derive a model from historical trace files.
+
+        Stage durations are taken from 'stage.<name>' spans and resampled
+        empirically. A stage's dispatch_calls is the average number of
+        'dispatch' spans of the same task that started inside it. The
+        failure rate is the fraction of 'task' spans with an error outcome.
+        Stages never seen in the traces keep their defaults.
+
+        Args:
+            *paths: Trace files written by Tracer.
+
+        Returns:
+            LatencyModel.
+        """
+        events: list[dict[str, Any]] = []
+        for path in paths:
+            events.extend(load_trace(path))
+
+        stage_events = [e for e in events if e.get("cat") == "stage"]
+        dispatch_starts: dict[Optional[str], list[int]] = defaultdict(list)
+        for e in events:
+            if e.get("cat") == "dispatch":
+                dispatch_starts[e.get("args", {}).get("task_id")].append(e["ts"])
+
+        samples: dict[str, list[float]] = defaultdict(list)
+        calls: dict[str, list[int]] = defaultdict(list)
+        for e in stage_events:
+            name = e["name"].removeprefix("stage.")
+            samples[name].append(e["dur"] / 1_000_000)
+            task_id = e.get("args", {}).get("task_id")
+            end = e["ts"] + e["dur"]
+            calls[name].append(
+                sum(1 for ts in dispatch_starts.get(task_id, []) if e["ts"] <= ts <= end)
+            )
+
+        stages = _default_stages()
+        for name, durations in samples.items():
+            stages[name] = StageLatency(
+                mean=statistics.fmean(durations),
+                stddev=statistics.pstdev(durations),
+                dispatch_calls=round(statistics.fmean(calls[name])),
+                samples=durations,
+            )
+
+        task_events = [e for e in events if e.get("cat") == "task"]
+        failures = sum(
+            1 for e in task_events if e.get("args", {}).get("outcome") == "error"
+        )
+        failure_rate = failures / len(task_events) if task_events else 0.0
+
+        logger.info(
+            f"Latency model from {len(stage_events)} stage spans "
+            f"({len(task_events)} tasks, failure rate {failure_rate:.0%})"
+        )
+        return cls(stages=stages, failure_rate=failure_rate)
+
+
+@dataclass
+class SimulatedTask:
+    """Simulated execution of one task.
+
+    Attributes:
+        task_id: ID of the task.
+        worker: Index of the worker that ran it.
+        start: Time the worker picked the task up (seconds).
+        end: Time the task finished, including cleanup (seconds).
+        busy: Time spent executing stages (excludes waits).
+        rate_limit_wait: Time spent waiting for rate-limit slots.
+        merge_wait: Time spent waiting for the merge queue.
+        success: Whether the task completed (False if blocked).
+    """
+
+    task_id: str
+    worker: int
+    start: float
+    end: float = 0.0
+    busy: float = 0.0
+    rate_limit_wait: float = 0.0
+    merge_wait: float = 0.0
+    success: bool = True
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of one simulation run.
+
+    Attributes:
+        makespan: Time until the last task finished (seconds).
+        workers: Number of workers simulated.
+        utilisation: Fraction of worker time spent executing stages.
+        tasks: SimulatedTask per task that ran, in start order.
+        critical_path: Task IDs on the longest dependency chain.
+        critical_path_length: Sum of the task durations on that chain.
+        unreachable: Open tasks that never became ready (blocked dependencies).
+    """
+
+    makespan: float
+    workers: int
+    utilisation: float
+    tasks: list[SimulatedTask]
+    critical_path: list[str]
+    critical_path_length: float
+    unreachable: list[str] = field(default_factory=list)
+
+    @property
+    def blocked(self) -> list[str]:
+        """IDs of tasks that failed or were blocked at merge."""
+        return [t.task_id for t in self.tasks if not t.success]
+
+    def worker_utilisation(self) -> list[float]:
+        """Utilisation of each worker over the makespan."""
+        busy = [0.0] * self.workers
+        for t in self.tasks:
+            busy[t.worker] += t.busy
+        if self.makespan <= 0:
+            return [0.0] * self.workers
+        return [b / self.makespan for b in busy]
+
+
+@dataclass
+class SimulationReport:
+    """Aggregate over several simulation runs.
+
+    Attributes:
+        runs: Results of the individual runs.
+    """
+
+    runs: list[SimulationResult]
+
+    @property
+    def makespans(self) -> list[float]:
+        """Makespan of every run."""
+        return [r.makespan for r in self.runs]
+
+    @property
+    def representative(self) -> SimulationResult:
+        """The run with the median makespan."""
+        ordered = sorted(self.runs, key=lambda r: r.makespan)
+        return ordered[(len(ordered) - 1) // 2]
+
+    def percentile(self, q: float) -> float:
+        """Makespan percentile (q in 0..100, nearest rank)."""
+        ordered = sorted(self.makespans)
+        index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+
+class Simulator:
+    """Simulates the execution loop over a queue with modelled latencies.
+
+    Attributes:
+        queue: Queue whose open tasks are scheduled.
+        latency: LatencyModel for stage durations.
+        workers: Number of parallel workers (pipelines).
+        rate_limit: Model calls per minute across all workers (None: unlimited).
+        merge_policy: 'queue' or 'concurrent'.
+        qa: Whether the QA stage runs.
+        dna: Whether the DNA check stage runs.
+
+    Example:
+        sim = Simulator(queue, LatencyModel(), workers=4, rate_limit=60)
+        result = sim.run(seed=1)
+    """
+
+    def __init__(
+        self,
+        queue: QueueModel,
+        latency: LatencyModel,
+        workers: int = 1,
+        rate_limit: Optional[float] = None,
+        merge_policy: str = "queue",
+        qa: bool = True,
+        dna: bool = True,
+    ) -> None:
+        """Initialize Simulator.
+
+        Raises:
+            ValueError: If workers < 1 or merge_policy is unknown.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if merge_policy not in MERGE_POLICIES:
+            raise ValueError(
+                f"Unknown merge policy '{merge_policy}'. Valid: {', '.join(MERGE_POLICIES)}"
+            )
+        self.queue = queue
+        self.latency = latency
+        self.workers = workers
+        self.rate_limit = rate_limit
+        self.merge_policy = merge_policy
+        self.qa = qa
+        self.dna = dna
+
+    def _stages(self) -> list[str]:
+        """Stages each task goes through."""
+        skipped = set()
+        if not self.qa:
+            skipped.add("qa")
+        if not self.dna:
+            skipped.add("dna")
+        return [s for s in PIPELINE_STAGES if s not in skipped]
+
+    def run(self, seed: Optional[int] = None) -> SimulationResult:
+        """Simulate one execution of the queue.
+
+        Args:
+            seed: Random seed for reproducible runs.
+
+        Returns:
+            SimulationResult.
+        """
+        rng = random.Random(seed)
+        tasks = {t.id: t for t in self.queue.tasks}
+        complete = {t.id for t in self.queue.tasks if t.status == TaskStatus.COMPLETE}
+        pending = [t for t in self.queue.tasks if t.status == TaskStatus.OPEN]
+        stages = self._stages()
+
+        idle = list(range(self.workers))
+        # (time, seq, task_id, stage index): the task is ready to start a stage
+        events: list[tuple[float, int, str, int]] = []
+        seq = 0
+        next_call_slot = 0.0
+        merge_free_at = 0.0
+        merge_ends: list[float] = []
+        worktree_at: dict[str, float] = {}
+        failing: set[str] = set()
+        simulated: dict[str, SimulatedTask] = {}
+
+        def schedule(now: float) -> None:
+            # Hand ready tasks to idle workers (like execution_loop's selector)
+            nonlocal seq
+            ready = [t for t in pending if all(d in complete for d in t.dependencies)]
+            for task in sorted(ready, key=lambda t: t.priority):
+                if not idle:
+                    break
+                pending.remove(task)
+                simulated[task.id] = SimulatedTask(task_id=task.id, worker=idle.pop(0), start=now)
+                if rng.random() < self.latency.failure_rate:
+                    failing.add(task.id)
+                heapq.heappush(events, (now, seq, task.id, 0))
+                seq += 1
+
+        schedule(0.0)
+        while events:
+            now, _, task_id, index = heapq.heappop(events)
+            sim = simulated[task_id]
+
+            if index == len(stages):
+                # Task finished: free the worker and unlock dependents
+                sim.end = now
+                if task_id in failing:
+                    sim.success = False
+                if sim.success:
+                    complete.add(task_id)
+                idle.append(sim.worker)
+                idle.sort()
+                schedule(now)
+                continue
+
+            stage = stages[index]
+            if (task_id in failing or not sim.success) and stage not in ("worktree", "tdd", "cleanup"):
+                heapq.heappush(events, (now, seq, task_id, index + 1))
+                seq += 1
+                continue
+
+            latency = self.latency.stages.get(stage)
+            duration = latency.sample(rng) if latency else 0.0
+            begin = now
+
+            # Model calls wait for rate-limit slots (spaced evenly)
+            if latency and latency.dispatch_calls and self.rate_limit:
+                interval = 60.0 / self.rate_limit
+                for _ in range(latency.dispatch_calls):
+                    begin = max(next_call_slot, now)
+                    next_call_slot = begin + interval
+                sim.rate_limit_wait += begin - now
+
+            if stage == "worktree":
+                worktree_at[task_id] = begin
+            elif stage == "merge":
+                if self.merge_policy == "queue":
+                    queued = max(begin, merge_free_at)
+                    sim.merge_wait += queued - begin
+                    begin = queued
+                    merge_free_at = begin + duration
+                # Merges that landed since the worktree was created; each
+                # may conflict with this task's three-way merge
+                landed = sum(1 for end in merge_ends if worktree_at[task_id] < end <= begin)
+                conflict = self.latency.conflict_rate
+                if landed and conflict > 0 and rng.random() < 1 - (1 - conflict) ** landed:
+                    sim.success = False
+                else:
+                    merge_ends.append(begin + duration)
+
+            sim.busy += duration
+            heapq.heappush(events, (begin + duration, seq, task_id, index + 1))
+            seq += 1
+
+        makespan = max((s.end for s in simulated.values()), default=0.0)
+        busy = sum(s.busy for s in simulated.values())
+        utilisation = busy / (self.workers * makespan) if makespan > 0 else 0.0
+        path, length = self._critical_path(tasks, simulated)
+
+        return SimulationResult(
+            makespan=makespan,
+            workers=self.workers,
+            utilisation=utilisation,
+            tasks=sorted(simulated.values(), key=lambda s: (s.start, s.task_id)),
+            critical_path=path,
+            critical_path_length=length,
+            unreachable=sorted(t.id for t in pending),
+        )
+
+    @staticmethod
+    def _critical_path(
+        tasks: dict, simulated: dict[str, SimulatedTask]
+    ) -> tuple[list[str], float]:
+        """Longest dependency chain weighted by simulated task durations.
+
+        This is the makespan lower bound with unlimited workers; a makespan
+        well above it means the run is worker- or resource-bound.
+        """
+        longest: dict[str, tuple[float, Optional[str]]] = {}
+
+        def visit(task_id: str) -> float:
+            if task_id in longest:
+                return longest[task_id][0]
+            best, via = 0.0, None
+            for dep in tasks[task_id].dependencies:
+                if dep in simulated:
+                    length = visit(dep)
+                    if length > best:
+                        best, via = length, dep
+            sim = simulated[task_id]
+            longest[task_id] = (best + sim.end - sim.start, via)
+            return longest[task_id][0]
+
+        for task_id in simulated:
+            visit(task_id)
+        if not longest:
+            return [], 0.0
+
+        end = max(longest, key=lambda k: longest[k][0])
+        path: list[str] = []
+        node: Optional[str] = end
+        while node is not None:
+            path.append(node)
+            node = longest[node][1]
+        return list(reversed(path)), longest[end][0]
+
+
+def simulate(
+    queue_path: str,
+    latency: Optional[LatencyModel] = None,
+    workers: int = 1,
+    rate_limit: Optional[float] = None,
+    merge_policy: str = "queue",
+    runs: int = 1,
+    seed: Optional[int] = None,
+    qa: bool = True,
+    dna: bool = True,
+) -> SimulationReport:
+    """Simulate executing a queue.json several times.
+
+    Args:
+        queue_path: Path to queue.json.
+        latency: LatencyModel (defaults to LatencyModel()).
+        workers: Number of parallel workers.
+        rate_limit: Model calls per minute (None: unlimited).
+        merge_policy: 'queue' or 'concurrent'.
+        runs: Number of Monte Carlo runs.
+        seed: Base random seed (run i uses seed + i).
+        qa: Whether the QA stage runs.
+        dna: Whether the DNA check stage runs.
+
+    Returns:
+        SimulationReport over all runs.
+    """
+    queue = QueueManager(queue_path).load()
+    simulator = Simulator(
+        queue,
+        latency or LatencyModel(),
+        workers=workers,
+        rate_limit=rate_limit,
+        merge_policy=merge_policy,
+        qa=qa,
+        dna=dna,
+    )
+    results = [
+        simulator.run(seed=None if seed is None else seed + i) for i in range(max(runs, 1))
+    ]
+    return SimulationReport(runs=results)
+
+
+def format_report(report: SimulationReport) -> str:
+    """Format a SimulationReport as human-readable text.
+
+    Args:
+        report: Report to format.
+
+    Returns:
+        Multi-line summary string.
+    """
+    result = report.representative
+    lines = [
+        "Simulation Report",
+        "=" * 50,
+        f"  Workers:        {result.workers}",
+        f"  Tasks run:      {len(result.tasks)} ({len(result.blocked)} blocked)",
+    ]
+    if len(report.runs) > 1:
+        lines.append(
+            f"  Makespan:       p50 {report.percentile(50):.0f}s, "
+            f"p90 {report.percentile(90):.0f}s over {len(report.runs)} runs"
+        )
+    else:
+        lines.append(f"  Makespan:       {result.makespan:.0f}s")
+    lines.append(f"  Utilisation:    {result.utilisation:.0%}")
+    lines.append(
+        "  Per worker:     "
+        + ", ".join(f"{u:.0%}" for u in result.worker_utilisation())
+    )
+    rate_wait = sum(t.rate_limit_wait for t in result.tasks)
+    merge_wait = sum(t.merge_wait for t in result.tasks)
+    lines.append(f"  Rate-limit wait: {rate_wait:.0f}s total")
+    lines.append(f"  Merge wait:     {merge_wait:.0f}s total")
+    lines.append(
+        f"  Critical path:  {result.critical_path_length:.0f}s "
+        f"({' -> '.join(result.critical_path) or 'none'})"
+    )
+    if result.unreachable:
+        lines.append(f"  Never ready:    {', '.join(result.unreachable)}")
+    return "\n".join(lines)
@@ -14,24 +14,49 @@ TDDCycleExecutor handles the actual execution:
 - Writes generated code to files
 - Runs tests with PytestRunner
 - Manages state transitions
+
+With speculative_candidates > 1 the GREEN phase requests several
+implementations at once (at different temperatures), tests each in its
+own scratch copy of the worktree in parallel and keeps the first one that
+passes; the others are cancelled. This spends proxy quota to cut the
+GREEN phase's latency. The scratch copies' size is reserved in the
+worktree manager's DiskBudget first; if it does not fit, the attempt
+falls back to a single candidate tested in the worktree itself.
 """
 
 import logging
 import re
-import time
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional, TYPE_CHECKING
 
+from orchestrator.cancellation import (
+    CancellationToken,
+    OperationCancelled,
+    current_token,
+    sleep,
+)
+from orchestrator.cow_clone import copy_tree
+from orchestrator.disk_check import DiskBudget, DiskSpaceError, directory_size
+from orchestrator.preflight import preflight
+from orchestrator.refactor_policy import RefactorOutcome, code_lines
+from orchestrator.tracing import get_tracer
+
 if TYPE_CHECKING:
     from orchestrator.dispatcher import ModelDispatcher
-    from orchestrator.pytest_runner import PytestRunner
+    from orchestrator.pytest_runner import PytestResult, PytestRunner
     from orchestrator.retry_policy import RetryPolicy
     from orchestrator.worktree import WorktreeManager
 
 logger = logging.getLogger(__name__)
 
+# Sampling temperatures of speculative GREEN candidates, in order
+CANDIDATE_TEMPERATURES: tuple[float, ...] = (0.2, 0.6, 1.0, 0.4, 0.8)
+
 
 class CycleState(str, Enum):
     """TDD cycle states."""
@@ -62,6 +87,15 @@ class NeedsRetryError(Exception):
     pass
 
 
+class PreflightError(NeedsRetryError):
+    """Raised when generated code fails static pre-flight checks.
+
+    Retried at once: nothing was run, so there is nothing to back off from.
+    """
+
+    pass
+
+
 class DispatchError(Exception):
     """Raised when model dispatch fails."""
 
@@ -108,11 +142,14 @@ class GreenResult:
         impl_path: Path to the implementation file.
         test_output: Output from running the test.
         test_passed: Whether the test passed.
+        pytest_result: Full result of the test run, for the QA review. Not
+            checkpointed, so None after resuming from a checkpoint.
     """
 
     impl_path: str
     test_output: str
     test_passed: bool
+    pytest_result: Optional["PytestResult"] = field(default=None, repr=False)
 
 
 @dataclass
@@ -124,12 +161,23 @@ class RefactorResult:
         test_output: Output from running the test.
         test_passed: Whether tests still pass.
         reverted: Whether changes were reverted.
+        outcome: Accepted, unchanged or reverted (None if the model could
+            not be reached).
+        size_delta: Change in code lines of the implementation (0 unless
+            accepted).
     """
 
     impl_path: str
     test_output: str
     test_passed: bool
     reverted: bool = False
+    outcome: Optional[RefactorOutcome] = None
+    size_delta: int = 0
+
+    def __post_init__(self) -> None:
+        # Checkpoints store the outcome as a plain string
+        if self.outcome is not None:
+            self.outcome = RefactorOutcome(self.outcome)
 
 
 @dataclass
@@ -346,6 +394,8 @@ class TDDCycleExecutor:
         dispatcher: "ModelDispatcher",
         working_dir: str,
         pytest_runner: Optional["PytestRunner"] = None,
+        speculative_candidates: int = 1,
+        disk_budget: Optional[DiskBudget] = None,
     ) -> None:
         """Initialize TDDCycleExecutor.
 
@@ -353,9 +403,15 @@ class TDDCycleExecutor:
             dispatcher: ModelDispatcher for sending requests to Flash.
             working_dir: Directory to write generated files.
             pytest_runner: PytestRunner instance (creates default if None).
+            speculative_candidates: GREEN implementations generated and
+                tested in parallel per attempt (default: 1, no speculation).
+            disk_budget: DiskBudget the speculative scratch copies are
+                reserved in (None: copies are not accounted).
         """
         self.dispatcher = dispatcher
         self.working_dir = Path(working_dir)
+        self.speculative_candidates = max(speculative_candidates, 1)
+        self.disk_budget = disk_budget
         self.working_dir.mkdir(parents=True, exist_ok=True)
 
         if pytest_runner is None:
@@ -484,24 +540,12 @@ class TDDCycleExecutor:
 
         Raises:
             DispatchError: If model dispatch fails.
+            PreflightError: If the implementation fails pre-flight checks.
             NeedsRetryError: If test still fails after implementation.
         """
         logger.info(f"Executing GREEN phase for: {target_file}")
 
-        # Read the test file content
-        test_content = Path(red_result.test_path).read_text()
-
-        # Build prompt with test context
-        prompt_vars = {
-            "task_description": f"Implement minimal code to pass this test:\n\n{test_content}",
-            "target_file": target_file,
-            "phase": "green",
-            "test_output": red_result.test_output,
-        }
-
-        if previous_error:
-            prompt_vars["previous_error"] = previous_error
-
+        prompt_vars = self._green_prompt_vars(red_result, target_file, previous_error)
         dispatch_result = self.dispatcher.send_request("tdd_worker", prompt_vars)
 
         if not dispatch_result.success:
@@ -509,8 +553,9 @@ class TDDCycleExecutor:
                 f"Failed to generate implementation: {dispatch_result.error}"
             )
 
-        # Extract and write implementation code
+        # Extract, check and write implementation code
         impl_code = self._extract_code(dispatch_result.response)
+        self._preflight(impl_code, target_file, red_result.test_path)
         impl_path = self.working_dir / target_file
 
         impl_path.write_text(impl_code)
@@ -525,16 +570,226 @@ class TDDCycleExecutor:
         test_output = pytest_result.stdout + pytest_result.stderr
 
         if not test_passed:
+            detail = pytest_result.failure_summary() or test_output[:500]
             raise NeedsRetryError(
-                f"Test still fails in GREEN phase. Output: {test_output[:500]}"
+                f"Test still fails in GREEN phase. Output: {detail}"
             )
 
         return GreenResult(
             impl_path=str(impl_path),
             test_output=test_output,
             test_passed=True,
+            pytest_result=pytest_result,
         )
 
+    def _preflight(self, code: str, target_file: str, test_path: str) -> None:
+        """Reject code that cannot pass before writing it or running pytest.
+
+        Raises:
+            PreflightError: With the problems found.
+        """
+        result = preflight(code, target_file, test_path, str(self.working_dir))
+        if not result.valid:
+            logger.info(f"Pre-flight rejected {target_file}: {result.message}")
+            raise PreflightError(f"Pre-flight check failed: {result.message}")
+
+    def _green_prompt_vars(
+        self,
+        red_result: RedResult,
+        target_file: str,
+        previous_error: Optional[str],
+    ) -> dict[str, str]:
+        """Build the GREEN prompt variables from the RED test."""
+        # Read the test file content
+        test_content = Path(red_result.test_path).read_text()
+
+        # Build prompt with test context
+        prompt_vars = {
+            "task_description": f"Implement minimal code to pass this test:\n\n{test_content}",
+            "target_file": target_file,
+            "phase": "green",
+            "test_output": red_result.test_output,
+        }
+
+        if previous_error:
+            prompt_vars["previous_error"] = previous_error
+        return prompt_vars
+
+    def execute_green_speculative(
+        self,
+        red_result: RedResult,
+        target_file: str,
+        previous_error: Optional[str] = None,
+    ) -> GreenResult:
+        """Execute the GREEN phase with parallel implementation candidates.
+
+        speculative_candidates implementations are requested concurrently
+        at different temperatures (CANDIDATE_TEMPERATURES). Each is tested
+        in its own scratch copy of the working directory; the first that
+        passes is written to the working directory and the remaining
+        requests and test runs are cancelled. If the disk budget cannot
+        hold the scratch copies, execute_green() runs instead.
+
+        Args:
+            red_result: Result from RED phase with test path and output.
+            target_file: Target implementation file.
+            previous_error: Error from previous GREEN attempt (for retry).
+
+        Returns:
+            GreenResult of the winning candidate (its test output comes
+            from the candidate's scratch copy).
+
+        Raises:
+            DispatchError: If every candidate's dispatch fails.
+            NeedsRetryError: If no candidate passes the test.
+        """
+        from orchestrator.pytest_runner import TestStatus
+
+        count = self.speculative_candidates
+        reservation = f"green:{self.working_dir}"
+        if not self._reserve_scratch(reservation, count):
+            return self.execute_green(red_result, target_file, previous_error)
+        logger.info(f"Executing speculative GREEN phase for: {target_file} ({count} candidates)")
+        prompt_vars = self._green_prompt_vars(red_result, target_file, previous_error)
+
+        parent = current_token()
+        race = CancellationToken(parent=parent, name="speculative GREEN")
+        pool = ThreadPoolExecutor(max_workers=count, thread_name_prefix="green-candidate")
+        # Threads do not inherit the active token; pass it explicitly
+        futures = {
+            pool.submit(
+                self._green_candidate, index, prompt_vars, red_result, target_file, race
+            ): index
+            for index in range(count)
+        }
+        errors: list[str] = []
+        dispatch_errors: list[DispatchError] = []
+        preflight_errors = 0
+        try:
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    impl_code, pytest_result = future.result()
+                except OperationCancelled:
+                    if parent is not None:
+                        parent.raise_if_cancelled()
+                    raise
+                except DispatchError as e:
+                    dispatch_errors.append(e)
+                    errors.append(f"candidate {index + 1}: {e}")
+                    continue
+                except PreflightError as e:
+                    preflight_errors += 1
+                    errors.append(f"candidate {index + 1}: {e}")
+                    continue
+                except Exception as e:
+                    errors.append(f"candidate {index + 1}: {e}")
+                    continue
+
+                test_output = pytest_result.stdout + pytest_result.stderr
+                if pytest_result.status == TestStatus.PASSED:
+                    race.cancel(f"GREEN candidate {index + 1} passed")
+                    impl_path = self.working_dir / target_file
+                    impl_path.write_text(impl_code)
+                    logger.info(
+                        f"GREEN candidate {index + 1}/{count} passed; "
+                        f"wrote implementation to: {impl_path}"
+                    )
+                    return GreenResult(
+                        impl_path=str(impl_path),
+                        test_output=test_output,
+                        test_passed=True,
+                        pytest_result=pytest_result,
+                    )
+                detail = pytest_result.failure_summary() or test_output[:500]
+                errors.append(f"candidate {index + 1}: {detail}")
+        finally:
+            race.cancel("speculative GREEN phase finished")
+            # Losing candidates see the cancellation and clean up by themselves
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self.disk_budget is not None:
+                self.disk_budget.release(reservation)
+
+        if len(dispatch_errors) == count:
+            raise dispatch_errors[0]
+        # No test ran, so the retry need not back off
+        error_type = PreflightError if preflight_errors == count else NeedsRetryError
+        raise error_type(
+            f"No GREEN candidate passed ({count} tried). Output: {' | '.join(errors)}"
+        )
+
+    def _reserve_scratch(self, key: str, count: int) -> bool:
+        """Reserve disk space for count scratch copies of the working directory.
+
+        The copies are made next to the working directory, i.e. on the
+        base (scratch or worktree) the worktree manager chose for it.
+
+        Returns:
+            Whether the copies fit (always True without a disk budget).
+        """
+        if self.disk_budget is None:
+            return True
+        try:
+            size = directory_size(str(self.working_dir))
+            self.disk_budget.reserve(key, str(self.working_dir.parent), size * count)
+        except (DiskSpaceError, OSError) as e:
+            logger.warning(
+                f"No disk space for {count} GREEN scratch copies, "
+                f"testing a single candidate: {e}"
+            )
+            return False
+        return True
+
+    def _green_candidate(
+        self,
+        index: int,
+        prompt_vars: dict[str, str],
+        red_result: RedResult,
+        target_file: str,
+        token: CancellationToken,
+    ) -> tuple[str, "PytestResult"]:
+        """Generate one GREEN candidate and test it in a scratch copy.
+
+        Returns:
+            Tuple of (implementation code, PytestResult).
+        """
+        temperature = CANDIDATE_TEMPERATURES[index % len(CANDIDATE_TEMPERATURES)]
+        # Next to the worktree, so reflink copies stay on its filesystem
+        scratch = Path(
+            tempfile.mkdtemp(prefix=f"hc_green_{index + 1}_", dir=self.working_dir.parent)
+        )
+        test_path = Path(red_result.test_path)
+        try:
+            test_path = scratch / test_path.relative_to(self.working_dir)
+        except ValueError:
+            test_path = scratch / test_path.name
+        try:
+            copy_tree(self.working_dir, scratch, ["-a", "--reflink=auto"])
+
+            with get_tracer().span(
+                "tdd.green.candidate", "tdd", candidate=index + 1, temperature=temperature
+            ) as span:
+                dispatch_result = self.dispatcher.send_request(
+                    "tdd_worker", prompt_vars, cancel_token=token, temperature=temperature
+                )
+                if not dispatch_result.success:
+                    raise DispatchError(
+                        f"Failed to generate implementation: {dispatch_result.error}"
+                    )
+
+                impl_code = self._extract_code(dispatch_result.response)
+                self._preflight(impl_code, target_file, red_result.test_path)
+                impl_path = scratch / target_file
+                impl_path.parent.mkdir(parents=True, exist_ok=True)
+                impl_path.write_text(impl_code)
+
+                pytest_result = self.pytest_runner.run(str(test_path), cancel_token=token)
+                span.set_outcome(pytest_result.status.value)
+            return impl_code, pytest_result
+        finally:
+            self.pytest_runner.close_server(str(scratch))
+            shutil.rmtree(scratch, ignore_errors=True)
+
     def execute_refactor(
         self,
         green_result: GreenResult,
@@ -579,6 +834,29 @@ class TDDCycleExecutor:
         original_code = impl_content
         refactored_code = self._extract_code(dispatch_result.response)
 
+        if refactored_code.strip() == original_code.strip():
+            # Nothing to write or test
+            logger.info("Refactor returned the same code")
+            return RefactorResult(
+                impl_path=green_result.impl_path,
+                test_output="Refactor returned the same code",
+                test_passed=True,
+                reverted=False,
+                outcome=RefactorOutcome.UNCHANGED,
+            )
+
+        check = preflight(refactored_code, green_result.impl_path, test_path, str(self.working_dir))
+        if not check.valid:
+            # Nothing written yet; keep the GREEN implementation
+            logger.warning(f"Refactor failed pre-flight checks - keeping original: {check.message}")
+            return RefactorResult(
+                impl_path=green_result.impl_path,
+                test_output=f"Refactor rejected by pre-flight checks: {check.message}",
+                test_passed=False,
+                reverted=True,
+                outcome=RefactorOutcome.REVERTED,
+            )
+
         # Write refactored code
         impl_path = Path(green_result.impl_path)
         impl_path.write_text(refactored_code)
@@ -600,6 +878,7 @@ class TDDCycleExecutor:
                 test_output=test_output,
                 test_passed=False,
                 reverted=True,
+                outcome=RefactorOutcome.REVERTED,
             )
 
         return RefactorResult(
@@ -607,6 +886,8 @@ class TDDCycleExecutor:
             test_output=test_output,
             test_passed=True,
             reverted=False,
+            outcome=RefactorOutcome.ACCEPTED,
+            size_delta=code_lines(refactored_code) - code_lines(original_code),
         )
 
     def execute_green_with_retry(
@@ -632,24 +913,35 @@ class TDDCycleExecutor:
         from orchestrator.retry_policy import RetryPolicy
 
         previous_error: Optional[str] = None
+        # A speculative attempt generates several candidates at once
+        execute = (
+            self.execute_green_speculative
+            if self.speculative_candidates > 1
+            else self.execute_green
+        )
 
         while retry_policy.should_retry():
             try:
-                result = self.execute_green(
-                    red_result,
-                    target_file,
-                    previous_error=previous_error,
-                )
+                with get_tracer().span(
+                    "tdd.green.attempt", "tdd",
+                    attempt=retry_policy.get_retry_count() + 1,
+                ):
+                    result = execute(
+                        red_result,
+                        target_file,
+                        previous_error=previous_error,
+                    )
                 retry_policy.record_attempt(success=True)
                 return result
 
             except NeedsRetryError as e:
                 previous_error = str(e)
                 retry_policy.record_attempt(success=False, error=previous_error)
-                delay = retry_policy.get_backoff_delay()
+                # Pre-flight rejections ran nothing, so retry at once
+                delay = 0 if isinstance(e, PreflightError) else retry_policy.get_backoff_delay()
                 if delay > 0:
                     logger.info(f"Backing off for {delay:.1f}s before retry")
-                    time.sleep(delay)
+                    sleep(delay)
                 logger.info(
                     f"GREEN phase retry {retry_policy.get_retry_count()}/{retry_policy.max_attempts}"
                 )
@@ -693,6 +985,7 @@ class TDDFullCycleRunner:
         retry_policy: Optional["RetryPolicy"] = None,
         queue_path: Optional[str] = None,
         northstar_path: Optional[str] = None,
+        speculative_candidates: int = 1,
     ) -> None:
         """Initialize TDDFullCycleRunner.
 
@@ -703,13 +996,20 @@ class TDDFullCycleRunner:
             retry_policy: RetryPolicy for GREEN phase retries.
             queue_path: Path to queue.json for DNA check.
             northstar_path: Path to NORTHSTAR.md for DNA check.
+            speculative_candidates: GREEN candidates generated and tested
+                in parallel per attempt (see TDDCycleExecutor).
         """
         self.worktree_manager = worktree_manager
         self.dispatcher = dispatcher
+        if pytest_runner is None:
+            from orchestrator.pytest_runner import PytestRunner
+            pytest_runner = PytestRunner()
+        # Shared by all cycles, so fork servers are reused and closed once
         self.pytest_runner = pytest_runner
         self.retry_policy = retry_policy
         self.queue_path = queue_path
         self.northstar_path = northstar_path
+        self.speculative_candidates = speculative_candidates
 
         self._cycle: Optional[TDDCycle] = None
         self._executor: Optional[TDDCycleExecutor] = None
@@ -720,12 +1020,18 @@ class TDDFullCycleRunner:
         self._red_result: Optional[RedResult] = None
         self._green_result: Optional[GreenResult] = None
 
+    @property
+    def green_result(self) -> Optional[GreenResult]:
+        """Result of the current cycle's GREEN phase (None before it ran)."""
+        return self._green_result
+
     def start_cycle(
         self,
         task_id: str,
         task_description: str,
         target_file: str,
         attempt: int = 1,
+        worktree_path: Optional[str] = None,
     ) -> None:
         """Start a new TDD cycle.
 
@@ -736,22 +1042,28 @@ class TDDFullCycleRunner:
             task_description: Description of what to implement.
             target_file: Target implementation file name.
             attempt: Attempt number for the worktree branch.
+            worktree_path: Existing worktree to run in. If None, a new
+                worktree is created through the WorktreeManager.
         """
         self._task_id = task_id
         self._target_file = target_file
         self._task_description = task_description
 
-        # Create worktree
-        self._worktree_path = self.worktree_manager.create(
-            task_id=task_id,
-            attempt=attempt,
-        )
+        if worktree_path is not None:
+            self._worktree_path = worktree_path
+        else:
+            self._worktree_path = self.worktree_manager.create(
+                task_id=task_id,
+                attempt=attempt,
+            )
 
         # Initialize executor with worktree as working dir
         self._executor = TDDCycleExecutor(
             dispatcher=self.dispatcher,
             working_dir=self._worktree_path,
             pytest_runner=self.pytest_runner,
+            speculative_candidates=self.speculative_candidates,
+            disk_budget=self.worktree_manager.disk_budget,
         )
 
         # Initialize state machine
@@ -760,6 +1072,38 @@ class TDDFullCycleRunner:
 
         logger.info(f"Started TDD cycle for task '{task_id}' in {self._worktree_path}")
 
+    def restore_phases(
+        self,
+        red_result: RedResult,
+        green_result: Optional[GreenResult] = None,
+    ) -> None:
+        """Restore completed phases from a checkpoint instead of re-running them.
+
+        Advances the state machine past RED (and GREEN if given) so the cycle
+        continues with the next phase. The generated files must still exist
+        in the worktree.
+
+        Args:
+            red_result: Result of a previously completed RED phase.
+            green_result: Result of a previously completed GREEN phase.
+
+        Raises:
+            RuntimeError: If start_cycle() was not called first.
+        """
+        if not self._executor or not self._cycle:
+            raise RuntimeError("Must call start_cycle() first")
+
+        self._red_result = red_result
+        self._cycle.complete_red(test_failed=red_result.test_failed)
+
+        if green_result is not None:
+            self._green_result = green_result
+            self._cycle.complete_green(test_passed=green_result.test_passed)
+
+        logger.info(
+            f"Restored TDD cycle for task '{self._task_id}' at state {self._cycle.state}"
+        )
+
     def run_red_phase(self) -> RedResult:
         """Run the RED phase: generate and validate failing test.
 
@@ -776,10 +1120,11 @@ class TDDFullCycleRunner:
         if self._task_description is None:
             raise RuntimeError("Must call start_cycle() first")
 
-        result = self._executor.execute_red(
-            task_description=self._task_description,
-            target_file=self._target_file,
-        )
+        with get_tracer().span("tdd.red", "tdd", target_file=self._target_file):
+            result = self._executor.execute_red(
+                task_description=self._task_description,
+                target_file=self._target_file,
+            )
 
         self._red_result = result
         self._cycle.complete_red(test_failed=result.test_failed)
@@ -806,11 +1151,13 @@ class TDDFullCycleRunner:
             from orchestrator.retry_policy import RetryPolicy
             policy = RetryPolicy(max_attempts=5)
 
-        result = self._executor.execute_green_with_retry(
-            red_result=self._red_result,
-            target_file=self._target_file,
-            retry_policy=policy,
-        )
+        with get_tracer().span("tdd.green", "tdd", target_file=self._target_file) as span:
+            result = self._executor.execute_green_with_retry(
+                red_result=self._red_result,
+                target_file=self._target_file,
+                retry_policy=policy,
+            )
+            span.set_attribute("attempts", policy.get_retry_count())
 
         self._green_result = result
         self._cycle.complete_green(test_passed=result.test_passed)
@@ -822,12 +1169,15 @@ class TDDFullCycleRunner:
         self,
         skip_refactor: bool = False,
         target_branch: str = "main",
+        merge: bool = True,
     ) -> CycleResult:
         """Finish the cycle: optional refactor, then merge.
 
         Args:
             skip_refactor: Whether to skip the REFACTOR phase.
             target_branch: Branch to merge into.
+            merge: Whether to merge the worktree. TaskPipeline passes False
+                because it reviews and merges in later stages.
 
         Returns:
             CycleResult with all phase results.
@@ -837,10 +1187,14 @@ class TDDFullCycleRunner:
 
         refactor_result = None
         if not skip_refactor:
-            refactor_result = self._executor.execute_refactor(
-                green_result=self._green_result,
-                test_path=self._red_result.test_path,
-            )
+            with get_tracer().span("tdd.refactor", "tdd") as span:
+                refactor_result = self._executor.execute_refactor(
+                    green_result=self._green_result,
+                    test_path=self._red_result.test_path,
+                )
+                span.set_attribute("reverted", refactor_result.reverted)
+                if refactor_result.outcome is not None:
+                    span.set_attribute("outcome", refactor_result.outcome.value)
             self._cycle.complete_refactor(test_passed=refactor_result.test_passed)
         else:
             self._cycle.skip_refactor()
@@ -851,6 +1205,10 @@ class TDDFullCycleRunner:
         if refactor_result:
             self._cycle.set_refactor_result(refactor_result)
 
+        if not merge:
+            logger.info(f"TDD cycle complete for task '{self._task_id}' (merge deferred)")
+            return self._cycle.get_result()
+
         # Merge to main with DNA check if configured
         merge_kwargs = {
             "task_id": self._task_id,
@@ -0,0 +1,257 @@
+"""Structured timing spans for H-Conductor execution.
+
+This module provides a lightweight tracer that records spans (name,
+start, duration, outcome, attributes) for pipeline stages, TDD phases,
+dispatch attempts, pytest runs and git subprocesses.
+
+Spans are written to a local file in the Chrome trace event format
+(JSON array of "complete" events), which opens directly in
+chrome://tracing, Perfetto (ui.perfetto.dev) or speedscope. The array is
+streamed one event per line and left unterminated, which the format
+explicitly allows, so a trace stays readable even if the process dies.
+
+Every span carries the ID of the task being executed, taken from the
+task_context() in effect when the span started.
+
+Environment variable:
+- HC_TRACE_FILE: Path of the trace file for the default tracer. If unset,
+  tracing is disabled and spans cost almost nothing.
+
+Example:
+    set_tracer(Tracer("/tmp/hc_trace.json"))
+    with task_context("T001"):
+        with get_tracer().span("stage.tdd", "stage") as span:
+            span.set_attribute("target_file", "calc.py")
+"""
+
+import contextvars
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE_ENV = "HC_TRACE_FILE"
+
+_current_task_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "hc_trace_task_id", default=None
+)
+
+
+@dataclass
+class Span:
+    """A timed operation.
+
+    Attributes:
+        name: Span name (e.g. 'stage.tdd', 'pytest', 'git').
+        category: Span category (stage, tdd, dispatch, pytest, git).
+        task_id: ID of the task the span belongs to, if any.
+        start_us: Start time in microseconds since the epoch.
+        duration_us: Duration in microseconds (set when the span ends).
+        outcome: 'ok', 'error', or a custom outcome set by the caller.
+        attributes: Extra key/value data attached to the span.
+    """
+
+    name: str
+    category: str
+    task_id: Optional[str]
+    start_us: int
+    duration_us: int = 0
+    outcome: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def end_us(self) -> int:
+        """End time in microseconds since the epoch."""
+        return self.start_us + self.duration_us
+
+    @property
+    def duration_s(self) -> float:
+        """Duration in seconds."""
+        return self.duration_us / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def set_outcome(self, outcome: str) -> None:
+        """Override the span outcome (default: 'ok', or 'error' on exception)."""
+        self.outcome = outcome
+
+    def to_trace_event(self) -> dict[str, Any]:
+        """Convert to a Chrome trace 'complete' (ph=X) event."""
+        args = {"outcome": self.outcome, **self.attributes}
+        if self.task_id is not None:
+            args["task_id"] = self.task_id
+        return {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start_us,
+            "dur": self.duration_us,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": args,
+        }
+
+
+class Tracer:
+    """Records spans and streams them to a Chrome trace file.
+
+    A tracer without a path keeps finished spans in memory instead (useful
+    for inspection); a disabled tracer records nothing.
+
+    Attributes:
+        path: Trace file path, or None for in-memory only.
+        enabled: Whether spans are recorded at all.
+    """
+
+    def __init__(self, path: Optional[str] = None, enabled: bool = True) -> None:
+        """Initialize Tracer.
+
+        Args:
+            path: Trace file to append events to (created if missing).
+            enabled: Set False for a no-op tracer.
+        """
+        self.path = Path(path) if path else None
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+
+    @property
+    def spans(self) -> list[Span]:
+        """Finished spans kept in memory (only when there is no trace file)."""
+        with self._lock:
+            return list(self._spans)
+
+    @contextmanager
+    def span(self, name: str, category: str, **attributes: Any) -> Iterator[Span]:
+        """Time a block of code as a span.
+
+        The outcome is 'error' (with the exception type as an attribute) if
+        the block raises, otherwise 'ok' unless changed via set_outcome().
+
+        Args:
+            name: Span name.
+            category: Span category.
+            **attributes: Initial span attributes.
+
+        Yields:
+            The Span, so the block can add attributes or set the outcome.
+        """
+        span = Span(
+            name=name,
+            category=category,
+            task_id=_current_task_id.get(),
+            start_us=time.time_ns() // 1000,
+            attributes=dict(attributes),
+        )
+        start = time.perf_counter_ns()
+        try:
+            yield span
+        except BaseException as e:
+            span.outcome = "error"
+            span.attributes["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration_us = (time.perf_counter_ns() - start) // 1000
+            if self.enabled:
+                self._record(span)
+
+    def _record(self, span: Span) -> None:
+        """Store a finished span and append it to the trace file."""
+        with self._lock:
+            if self.path is None:
+                self._spans.append(span)
+                return
+            try:
+                self._append(span.to_trace_event())
+            except OSError as e:
+                logger.warning(f"Failed to write trace event to {self.path}: {e}")
+
+    def _append(self, event: dict[str, Any]) -> None:
+        """Append one event line, opening the JSON array if the file is new."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            # Lock so several processes can share one trace file
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                if f.tell() == 0:
+                    f.write("[\n")
+                f.write(json.dumps(event) + ",\n")
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer.
+
+    Created on first use from HC_TRACE_FILE; disabled if it is unset.
+
+    Returns:
+        The current Tracer.
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                path = os.environ.get(TRACE_FILE_ENV)
+                _tracer = Tracer(path) if path else Tracer(enabled=False)
+    return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install the process-wide tracer.
+
+    Args:
+        tracer: Tracer to use, or None to fall back to HC_TRACE_FILE again.
+    """
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+
+
+@contextmanager
+def task_context(task_id: str) -> Iterator[None]:
+    """Attribute spans started inside the block to a task.
+
+    Args:
+        task_id: ID of the task being executed.
+    """
+    token = _current_task_id.set(task_id)
+    try:
+        yield
+    finally:
+        _current_task_id.reset(token)
+
+
+def load_trace(path: str) -> list[dict[str, Any]]:
+    """Read the events of a trace file written by Tracer.
+
+    Accepts both the streamed (unterminated) array and a closed JSON array.
+
+    Args:
+        path: Trace file path.
+
+    Returns:
+        List of Chrome trace event dictionaries.
+    """
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if not line or line in ("[", "]"):
+                continue
+            events.append(json.loads(line))
+    return events
@@ -14,7 +14,9 @@ import ast
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
+
+from orchestrator.pytest_runner import PytestResult
 
 
 @dataclass
@@ -221,15 +223,21 @@ class TestValidator:
 
         return {"has_import": False, "reason": f"module '{module_name}' not imported"}
 
-    def check_failure_reason(self, pytest_output: str) -> dict:
+    def check_failure_reason(self, pytest_output: Union[str, PytestResult]) -> dict:
         """Classify the failure reason from pytest output.
 
         Args:
-            pytest_output: Raw output from pytest run.
+            pytest_output: Raw output from pytest run, or a PytestResult
+                (classified from its per-test exception types when present).
 
         Returns:
             Dict with type and expected status.
         """
+        if isinstance(pytest_output, PytestResult):
+            if pytest_output.tests:
+                return self._classify_failures(pytest_output)
+            pytest_output = pytest_output.stdout + pytest_output.stderr
+
         output_lower = pytest_output.lower()
 
         # Check for syntax errors
@@ -278,6 +286,60 @@ class TestValidator:
             "reason": "Unknown failure type",
         }
 
+    def _classify_failures(self, result: PytestResult) -> dict:
+        """Classify the failure reason from structured test results.
+
+        Same categories and precedence as the text scan in
+        check_failure_reason, read from the failures' exception types.
+        """
+        failures = result.failures
+        types = {t.exception_type for t in failures}
+
+        if types & {"SyntaxError", "IndentationError", "TabError"}:
+            return {
+                "type": "syntax_error",
+                "expected": False,
+                "reason": "Test has syntax errors",
+            }
+
+        import_failures = [
+            t for t in failures if t.exception_type in ("ImportError", "ModuleNotFoundError")
+        ]
+        if import_failures:
+            if self.target_module and any(
+                self.target_module in f"{t.message}\n{t.traceback}" for t in import_failures
+            ):
+                return {
+                    "type": "import_error",
+                    "expected": True,
+                    "reason": f"Target module '{self.target_module}' not found (expected in RED)",
+                }
+            return {
+                "type": "import_error",
+                "expected": True,
+                "reason": "Module import error",
+            }
+
+        if "AssertionError" in types:
+            return {
+                "type": "assertion_error",
+                "expected": True,
+                "reason": "Test assertion failed (expected in RED)",
+            }
+
+        if any(t.collection_error for t in failures):
+            return {
+                "type": "syntax_error",
+                "expected": False,
+                "reason": "Test collection failed (test code broken)",
+            }
+
+        return {
+            "type": "unknown",
+            "expected": True,
+            "reason": "Unknown failure type",
+        }
+
     def validate(self) -> ValidationResult:
         """Run all validation checks.
 
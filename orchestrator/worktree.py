@@ -9,20 +9,86 @@ cannot damage the main repository during execution.
 Worktree naming convention:
 - Branch: feature/{task_id}_attempt_{n}
 - Path: /tmp/hc_worktree_{task_id}
+- Pooled path: /tmp/hc_worktree_pool_{n} (see orchestrator.worktree_pool)
+
+Scratch placement:
+    With a scratch_base (e.g. a tmpfs mount such as /dev/shm), worktrees
+    are created there while the live scratch worktrees fit within
+    scratch_budget bytes, so test runs and file writes stay in RAM. Once
+    the budget (or the scratch filesystem) is exhausted, worktrees fall
+    back to worktree_base on disk.
+
+Sparse mode:
+    With sparse=True, create(files=...) checks out only the task's files,
+    the test files and test directories next to them, and always-needed
+    paths (packaging, pytest config, conftest.py, __init__.py). Everything
+    else stays in the shared object store and can be brought in later with
+    materialize(). Commits still record the full tree.
+
+Copy-on-write cloning:
+    With a CowCloner, create() clones a pristine template checkout with
+    reflinks or mounts it as an overlay instead of checking files out, so
+    creation time and disk footprint do not grow with the repository
+    (see orchestrator.cow_clone). It falls back to `git worktree add`.
+
+Registry:
+    Every worktree the manager creates is recorded in a registry file in
+    the git common directory (see orchestrator.worktree_registry), so
+    startup recovery only checks registered worktrees and recognises
+    worktrees whose owning process died.
+
+Background cleanup:
+    With a WorktreeReaper, cleanup() only moves the worktree aside and
+    queues it and the task's branches for deletion, so the next task can
+    start right away (see orchestrator.reaper).
 """
 
 import logging
 import shutil
-import subprocess
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
-
-from orchestrator.disk_check import check_disk_space, DiskSpaceError
+from typing import Optional, TYPE_CHECKING
+
+from orchestrator.disk_check import DiskBudget, directory_size, DiskSpaceError
+from orchestrator.worktree_registry import WorktreeRecord, WorktreeRegistry
+from orchestrator.git_plumbing import (
+    CheckedOutTargetError,
+    GitCommandError,
+    GitSession,
+    commit_tree,
+    is_ancestor,
+    land_ref,
+    merge_tree,
+    run_git,
+)
+
+if TYPE_CHECKING:
+    from orchestrator.checkpoint import CheckpointStore, PipelineCheckpoint
+    from orchestrator.cow_clone import CowCloner
+    from orchestrator.reaper import WorktreeReaper
+    from orchestrator.worktree_pool import WorktreePool
 
 logger = logging.getLogger(__name__)
 
+# Attempts to land a merge if the target ref moves concurrently
+MERGE_REF_RETRIES = 5
+
+# Default directory holding task worktrees
+DEFAULT_WORKTREE_BASE = "/tmp"
+
+# Paths every sparse worktree needs (gitignore-style, non-cone patterns)
+DEFAULT_SPARSE_PATHS: tuple[str, ...] = (
+    "/pyproject.toml",
+    "/setup.py",
+    "/setup.cfg",
+    "/pytest.ini",
+    "/tox.ini",
+    "/requirements*.txt",
+    "conftest.py",
+    "__init__.py",
+)
+
 
 def _rmtree_onerror(func, path, exc_info):
     """Logging callback for shutil.rmtree errors.
@@ -63,28 +129,64 @@ class MergeResult:
     Attributes:
         success: Whether the merge succeeded.
         message: Descriptive message about the merge result.
+        commit: Commit the target branch points at after a successful merge.
+        rebased: Whether the branch had to be rebased onto the target.
+        tests_rerun: Whether tests were re-run after rebasing.
+        pending: Whether the branch was handed off for landing elsewhere
+            (a fleet coordinator) but has not been seen on the target yet;
+            success is False until it has.
     """
 
     success: bool
     message: str
+    commit: Optional[str] = None
+    rebased: bool = False
+    tests_rerun: bool = False
+    pending: bool = False
 
 
 class WorktreeManager:
     """Manages git worktrees for isolated task execution.
 
-    Creates worktrees in /tmp for task isolation, handles cleanup,
-    and provides merge capabilities with fast-forward-only strategy.
+    Creates worktrees in worktree_base (default: /tmp) for task isolation,
+    handles cleanup, and merges task branches into the target branch
+    (fast-forward when possible, otherwise a three-way merge that fails
+    only on conflicts).
+
+    With a WorktreePool, create() takes a pre-warmed worktree from the pool
+    when one is idle and cleanup() hands it back for recycling.
 
     Attributes:
         repo_path: Path to the main git repository.
         worktree_base: Base path for worktree directories (default: /tmp).
+        scratch_base: Optional fast scratch directory tried before worktree_base.
+        scratch_budget: Byte budget for live worktrees under scratch_base
+            (None: limited only by disk_threshold).
+        pool: Optional WorktreePool of reusable worktrees.
+        sparse: Whether create(files=...) makes sparse worktrees.
+        sparse_paths: Always-needed patterns for sparse worktrees.
+        reaper: Optional WorktreeReaper that deletes worktrees and branches
+            in the background.
+        disk_budget: DiskBudget that admits new worktrees and holds their
+            estimated size until cleanup.
+        cow: Optional CowCloner for copy-on-write worktree creation.
+        registry: WorktreeRegistry recording the worktrees created.
     """
 
     def __init__(
         self,
         repo_path: str,
-        worktree_base: str = "/tmp",
+        worktree_base: str = DEFAULT_WORKTREE_BASE,
         disk_threshold: float = 80.0,
+        pool: Optional["WorktreePool"] = None,
+        sparse: bool = False,
+        sparse_paths: Optional[list[str]] = None,
+        scratch_base: Optional[str] = None,
+        scratch_budget: Optional[int] = None,
+        reaper: Optional["WorktreeReaper"] = None,
+        disk_budget: Optional[DiskBudget] = None,
+        cow: Optional["CowCloner"] = None,
+        registry: Optional[WorktreeRegistry] = None,
     ) -> None:
         """Initialize WorktreeManager.
 
@@ -92,38 +194,162 @@ class WorktreeManager:
             repo_path: Path to the main git repository.
             worktree_base: Base path for worktree directories.
             disk_threshold: Maximum disk usage percentage before failing.
+            pool: Optional WorktreePool to take worktrees from.
+            sparse: Check out only the task's files when they are known.
+            sparse_paths: Always-needed patterns for sparse worktrees
+                (default: DEFAULT_SPARSE_PATHS).
+            scratch_base: Optional RAM-backed or fast local directory to
+                place worktrees in first.
+            scratch_budget: Byte budget for live scratch worktrees.
+            reaper: Optional WorktreeReaper for background cleanup.
+            disk_budget: DiskBudget to share with other managers or pools
+                on the same disks (default: a private one at disk_threshold).
+            cow: Optional CowCloner to create full (non-sparse) worktrees.
+            registry: WorktreeRegistry to record worktrees in (default: the
+                repository's registry).
         """
         self.repo_path = Path(repo_path).resolve()
         self.worktree_base = Path(worktree_base)
         self.disk_threshold = disk_threshold
+        self.pool = pool
+        self.sparse = sparse
+        self.sparse_paths = (
+            list(sparse_paths) if sparse_paths is not None else list(DEFAULT_SPARSE_PATHS)
+        )
+        self.scratch_base = Path(scratch_base) if scratch_base else None
+        self.scratch_budget = scratch_budget
+        self.reaper = reaper
+        self.disk_budget = disk_budget or DiskBudget(threshold=disk_threshold)
+        self.cow = cow
+        self.registry = registry or WorktreeRegistry(str(self.repo_path))
+        # Worktrees not at the default path (pooled, scratch or adopted on resume)
+        self._task_paths: dict[str, Path] = {}
+        # Last measured size of each live scratch worktree, by task ID
+        self._scratch_sizes: dict[str, int] = {}
+        # Branch checked out in each task's worktree
+        self._task_branches: dict[str, str] = {}
+        self._git = GitSession(self.repo_path)
+
+    @property
+    def worktree_bases(self) -> list[str]:
+        """Directories this manager may place worktrees in."""
+        bases = [str(self.worktree_base)]
+        if self.scratch_base is not None:
+            bases.insert(0, str(self.scratch_base))
+        if self.pool is not None and str(self.pool.worktree_base) not in bases:
+            bases.append(str(self.pool.worktree_base))
+        return bases
+
+    def scratch_usage(self) -> int:
+        """Re-measure live scratch worktrees and return their total size in bytes."""
+        for task_id in list(self._scratch_sizes):
+            path = self._task_paths.get(task_id)
+            if path is None or not path.exists():
+                self._scratch_sizes.pop(task_id, None)
+                continue
+            self._scratch_sizes[task_id] = directory_size(str(path))
+        return sum(self._scratch_sizes.values())
+
+    def _choose_base(self, estimate: int) -> tuple[Path, bool]:
+        """Pick the directory for a new worktree.
+
+        The scratch base is used if a worktree of average size still fits
+        in the scratch budget and the disk budget admits the estimated size
+        on the scratch filesystem.
+
+        Args:
+            estimate: Estimated size of the new worktree in bytes.
+
+        Returns:
+            Tuple of (base directory, whether it is the scratch base).
+        """
+        if self.scratch_base is None:
+            return self.worktree_base, False
+
+        try:
+            self.disk_budget.check(str(self.scratch_base), estimate)
+        except (DiskSpaceError, OSError) as e:
+            logger.info(f"Scratch base unavailable, using {self.worktree_base}: {e}")
+            return self.worktree_base, False
+
+        if self.scratch_budget is not None:
+            used = self.scratch_usage()
+            sizes = list(self._scratch_sizes.values())
+            expected = sum(sizes) // len(sizes) if sizes else estimate
+            if used + expected > self.scratch_budget:
+                logger.info(
+                    f"Scratch budget exhausted ({used} + {expected} > "
+                    f"{self.scratch_budget} bytes), using {self.worktree_base}"
+                )
+                return self.worktree_base, False
+
+        return self.scratch_base, True
 
     def _get_worktree_path(self, task_id: str) -> Path:
         """Get the worktree path for a task."""
+        if task_id in self._task_paths:
+            return self._task_paths[task_id]
         return self.worktree_base / f"hc_worktree_{task_id}"
 
+    def adopt(self, task_id: str, worktree_path: str) -> None:
+        """Record the worktree of a task created elsewhere (e.g. before a restart).
+
+        Args:
+            task_id: Task identifier.
+            worktree_path: Existing worktree path for the task.
+        """
+        self._task_paths[task_id] = Path(worktree_path)
+        self.registry.claim(str(Path(worktree_path).resolve()), task_id)
+
+    def _branch_prefix(self, task_id: str) -> str:
+        """Get the branch name of a task without its attempt number."""
+        return f"feature/{task_id}_attempt_"
+
     def _get_branch_name(self, task_id: str, attempt: int) -> str:
         """Get the branch name for a task attempt."""
-        return f"feature/{task_id}_attempt_{attempt}"
+        return f"{self._branch_prefix(task_id)}{attempt}"
 
-    def create(self, task_id: str, attempt: int = 1) -> str:
+    def create(
+        self, task_id: str, attempt: int = 1, files: Optional[list[str]] = None
+    ) -> str:
         """Create a new worktree for a task.
 
+        In sparse mode, a task with files gets a sparse worktree (pooled
+        worktrees are full checkouts, so the pool is bypassed).
+
         Args:
             task_id: Unique identifier for the task.
             attempt: Attempt number (default: 1).
+            files: Repository-relative files the task touches (TaskModel.files).
 
         Returns:
             Path to the created worktree as a string.
 
         Raises:
-            DiskSpaceError: If disk usage exceeds threshold.
+            DiskSpaceError: If the worktree's estimated size does not fit in
+                the disk budget.
             WorktreeCreateError: If git worktree creation fails.
         """
-        # Pre-flight disk check
-        worktree_path = self._get_worktree_path(task_id)
-        check_disk_space(str(self.worktree_base), threshold=self.disk_threshold)
-
         branch_name = self._get_branch_name(task_id, attempt)
+        sparse = self.sparse and bool(files)
+        self._task_branches[task_id] = branch_name
+        if self.reaper is not None:
+            # A branch of this name may still be queued for deletion
+            self.reaper.claim_ref(f"refs/heads/{branch_name}")
+
+        if self.pool is not None and not sparse:
+            pooled_path = self.pool.acquire(branch_name)
+            if pooled_path is not None:
+                self._task_paths[task_id] = pooled_path
+                return str(pooled_path)
+
+        # Pre-flight disk check: reserve the estimated checkout size
+        estimate = self.disk_budget.estimate(
+            str(self.repo_path), "HEAD", self._sparse_patterns(files) if sparse else None
+        )
+        base, on_scratch = self._choose_base(estimate)
+        worktree_path = base / f"hc_worktree_{task_id}"
+        self.disk_budget.reserve(task_id, str(base), estimate)
 
         logger.info(
             f"Creating worktree for task '{task_id}' at {worktree_path} "
@@ -131,37 +357,107 @@ class WorktreeManager:
         )
 
         try:
-            # Create the worktree with a new branch
-            result = subprocess.run(
-                [
-                    "git",
-                    "worktree",
-                    "add",
-                    "-b",
-                    branch_name,
-                    str(worktree_path),
-                ],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-            )
+            if (
+                self.cow is not None
+                and not sparse
+                and self.cow.clone(worktree_path, branch_name)
+            ):
+                # Shares the template's data; only the task's writes use space
+                self.disk_budget.reserve(task_id, str(base), 0)
+            else:
+                # Create the worktree with a new branch
+                add_args = ["worktree", "add", "-b", branch_name, str(worktree_path)]
+                if sparse:
+                    add_args.insert(2, "--no-checkout")
+                result = run_git(self.repo_path, add_args, check=False)
+
+                if result.returncode != 0:
+                    raise WorktreeCreateError(
+                        f"Failed to create worktree: {result.stderr}"
+                    )
 
-            if result.returncode != 0:
-                raise WorktreeCreateError(
-                    f"Failed to create worktree: {result.stderr}"
-                )
+                if sparse:
+                    self._checkout_sparse(worktree_path, files)
+
+            if on_scratch:
+                self._task_paths[task_id] = worktree_path
+                self._scratch_sizes[task_id] = directory_size(str(worktree_path))
 
+            self.registry.add(
+                WorktreeRecord(
+                    path=str(worktree_path.resolve()), task_id=task_id, branch=branch_name
+                )
+            )
             logger.info(f"Worktree created successfully at {worktree_path}")
             return str(worktree_path)
 
         except WorktreeCreateError:
             # Cleanup any partial state
+            self.disk_budget.release(task_id)
             self._cleanup_partial_worktree(worktree_path, branch_name)
             raise
         except Exception as e:
+            self.disk_budget.release(task_id)
             self._cleanup_partial_worktree(worktree_path, branch_name)
             raise WorktreeCreateError(f"Unexpected error creating worktree: {e}")
 
+    def _sparse_patterns(self, files: list[str]) -> list[str]:
+        """Build non-cone sparse-checkout patterns for a task's files.
+
+        Includes each file, the test file the TDD cycle derives from it
+        (test_<stem>.py, anywhere), 'tests/' directories at the root and
+        next to each file, and the always-needed paths.
+        """
+        patterns = list(self.sparse_paths)
+        patterns.append("/tests/")
+        for file in files:
+            path = Path(file)
+            patterns.append(f"/{path.as_posix().lstrip('/')}")
+            patterns.append(f"test_{path.stem}.py")
+            for parent in path.parents:
+                if parent != Path("."):
+                    patterns.append(f"/{parent.as_posix()}/tests/")
+        # Keep order, drop duplicates
+        return list(dict.fromkeys(patterns))
+
+    def _checkout_sparse(self, worktree_path: Path, files: list[str]) -> None:
+        """Apply sparse patterns to a --no-checkout worktree and populate it."""
+        patterns = self._sparse_patterns(files)
+        for args in (
+            ["sparse-checkout", "set", "--no-cone", *patterns],
+            ["read-tree", "-mu", "HEAD"],
+        ):
+            result = run_git(worktree_path, args, check=False)
+            if result.returncode != 0:
+                raise WorktreeCreateError(
+                    f"Failed to set up sparse checkout: {result.stderr}"
+                )
+        logger.info(f"Sparse worktree at {worktree_path} ({len(patterns)} patterns)")
+
+    def materialize(self, task_id: str, paths: Optional[list[str]] = None) -> None:
+        """Bring more of the tree into a sparse worktree.
+
+        Args:
+            task_id: Task identifier for the worktree.
+            paths: Patterns to add (e.g. ['/docs/']). If None, the sparse
+                checkout is disabled and the full tree is checked out.
+
+        Raises:
+            WorktreeCreateError: If git fails to update the checkout.
+        """
+        worktree_path = self._get_worktree_path(task_id)
+        if paths is None:
+            args = ["sparse-checkout", "disable"]
+        else:
+            args = ["sparse-checkout", "add", *paths]
+
+        result = run_git(worktree_path, args, check=False)
+        if result.returncode != 0:
+            raise WorktreeCreateError(
+                f"Failed to materialize worktree paths: {result.stderr}"
+            )
+        logger.info(f"Materialized {paths or 'full tree'} in {worktree_path}")
+
     def _cleanup_partial_worktree(
         self, worktree_path: Path, branch_name: str
     ) -> None:
@@ -171,18 +467,10 @@ class WorktreeManager:
             shutil.rmtree(worktree_path, onerror=_rmtree_onerror)
 
         # Try to delete the branch if it was created
-        subprocess.run(
-            ["git", "branch", "-D", branch_name],
-            cwd=self.repo_path,
-            capture_output=True,
-        )
+        run_git(self.repo_path, ["branch", "-D", branch_name], check=False)
 
         # Prune worktree metadata
-        subprocess.run(
-            ["git", "worktree", "prune"],
-            cwd=self.repo_path,
-            capture_output=True,
-        )
+        run_git(self.repo_path, ["worktree", "prune"], check=False)
 
     def cleanup(
         self, task_id: str, delete_branch: bool = True, attempt: Optional[int] = None
@@ -199,47 +487,113 @@ class WorktreeManager:
             worktree will not raise an error.
         """
         worktree_path = self._get_worktree_path(task_id)
+        self._task_paths.pop(task_id, None)
+        self._scratch_sizes.pop(task_id, None)
+        self._task_branches.pop(task_id, None)
+        self.disk_budget.release(task_id)
+        self.registry.remove(str(worktree_path.resolve()))
 
         logger.info(f"Cleaning up worktree for task '{task_id}'")
 
-        # Remove worktree directory via git
-        if worktree_path.exists():
-            result = subprocess.run(
-                ["git", "worktree", "remove", str(worktree_path), "--force"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
+        if self.cow is not None:
+            # Unmount an overlay worktree before removing the directory
+            self.cow.release(worktree_path)
+
+        if self.pool is not None and self.pool.owns(worktree_path):
+            # Hand the worktree back for recycling (detaches its branch)
+            self.pool.release(worktree_path)
+        elif self.reaper is not None and self.reaper.reap(worktree_path):
+            # Moved aside; deleted in the background
+            pass
+        elif worktree_path.exists():
+            # Remove worktree directory via git
+            result = run_git(
+                self.repo_path,
+                ["worktree", "remove", str(worktree_path), "--force"],
+                check=False,
             )
             if result.returncode != 0:
                 # Try manual removal as fallback
                 shutil.rmtree(worktree_path, onerror=_rmtree_onerror)
-                subprocess.run(
-                    ["git", "worktree", "prune"],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                )
+                run_git(self.repo_path, ["worktree", "prune"], check=False)
 
         # Delete branches if requested
         if delete_branch:
-            # Find and delete all matching attempt branches
-            result = subprocess.run(
-                ["git", "branch", "--list", f"feature/{task_id}_attempt_*"],
-                cwd=self.repo_path,
-                capture_output=True,
-                text=True,
-            )
-            for branch in result.stdout.strip().split("\n"):
-                branch = branch.strip()
-                if branch:
-                    subprocess.run(
-                        ["git", "branch", "-D", branch],
-                        cwd=self.repo_path,
-                        capture_output=True,
-                    )
-                    logger.info(f"Deleted branch '{branch}'")
+            self._delete_task_branches(task_id)
 
         logger.info(f"Cleanup completed for task '{task_id}'")
 
+    def _task_branch_refs(self, task_id: str) -> dict[str, str]:
+        """Find all of a task's attempt branches with one for-each-ref.
+
+        Returns:
+            Dict of full ref name -> OID.
+        """
+        prefix = f"refs/heads/{self._branch_prefix(task_id)}"
+        return {
+            ref: oid
+            for ref, oid in self._git.list_refs(f"{prefix}*").items()
+            if ref[len(prefix):].isdigit()
+        }
+
+    def _delete_task_branches(self, task_id: str) -> None:
+        """Delete all attempt branches of a task in one ref transaction."""
+        refs = self._task_branch_refs(task_id)
+        if not refs:
+            return
+        if self.reaper is not None:
+            self.reaper.delete_refs(refs)
+            return
+        if self._git.delete_refs(refs):
+            for ref in refs:
+                logger.info(f"Deleted branch '{ref.removeprefix('refs/heads/')}'")
+        else:
+            logger.warning(f"Failed to delete branches for task '{task_id}'")
+
+    def close(self) -> None:
+        """Stop the long-lived git helper processes."""
+        self._git.close()
+
+    def commit_changes(self, task_id: str, message: str) -> Optional[str]:
+        """Commit all changes in a task's worktree to its branch.
+
+        Args:
+            task_id: Task identifier for the worktree.
+            message: Commit message.
+
+        Returns:
+            OID of the new commit, or None if there was nothing to commit.
+
+        Raises:
+            WorktreeMergeError: If staging or committing fails.
+        """
+        worktree_path = self._get_worktree_path(task_id)
+
+        status = run_git(worktree_path, ["status", "--porcelain"], check=False)
+        if status.returncode != 0:
+            raise WorktreeMergeError(f"Failed to read worktree status: {status.stderr}")
+        if not status.stdout.strip():
+            return None
+
+        # --sparse: new files outside a sparse checkout's patterns are added too
+        for cmd in (["add", "-A", "--sparse"], ["commit", "--quiet", "-m", message]):
+            result = run_git(worktree_path, cmd, check=False)
+            if result.returncode != 0:
+                raise WorktreeMergeError(
+                    f"Failed to commit worktree changes: {result.stderr}"
+                )
+
+        logger.info(f"Committed worktree changes for task '{task_id}'")
+        return self._branch_tip(task_id, worktree_path)
+
+    def _branch_tip(self, task_id: str, worktree_path: Path) -> Optional[str]:
+        """Get the commit checked out in a task's worktree."""
+        branch = self._task_branches.get(task_id)
+        if branch is not None:
+            return self._git.rev_parse(f"refs/heads/{branch}")
+        head = run_git(worktree_path, ["rev-parse", "HEAD"], check=False)
+        return head.stdout.strip() or None
+
     def merge(
         self,
         task_id: str,
@@ -249,7 +603,7 @@ class WorktreeManager:
         northstar_path: Optional[str] = None,
         dna_check: bool = False,
     ) -> MergeResult:
-        """Merge worktree changes into target branch using fast-forward only.
+        """Merge worktree changes into the target branch without a checkout.
 
         Args:
             task_id: Task identifier for the worktree to merge.
@@ -263,9 +617,18 @@ class WorktreeManager:
             MergeResult with success status and message.
 
         Note:
-            Uses --ff-only strategy. If fast-forward is not possible
-            (i.e., there are conflicts), the merge fails and the user
-            must resolve conflicts manually.
+            The merge is computed with plumbing (merge-tree/commit-tree) and
+            landed with an update-ref guarded by the target tip it was
+            computed against, so nothing is checked out in the main repo
+            and concurrent merges cannot overwrite each other. A branch
+            based on the current target tip is fast-forwarded; otherwise a
+            clean three-way merge creates a merge commit. Conflicts fail the
+            merge and the user must resolve them manually.
+
+            If the target branch is checked out in a worktree (e.g. the
+            main repo), that checkout must be clean and is moved to the new
+            tip with the ref (see land_ref()); with uncommitted changes
+            there, the merge is refused.
 
             When dna_check=True, validates that the task traces to a NorthStar
             goal before allowing the merge. This prevents "orphan features"
@@ -305,76 +668,153 @@ class WorktreeManager:
                     message=f"DNA check error: {e}",
                 )
 
-        # First, checkout the target branch
-        checkout_result = subprocess.run(
-            ["git", "checkout", target_branch],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-        )
+        result = self._land(task_id, branch_name, target_branch)
+        if not result.success:
+            # Merge failed - worktree preserved for debugging
+            return result
+
+        # Merge successful - cleanup worktree
+        logger.info(f"Merge successful, cleaning up worktree")
+        self.cleanup(task_id, delete_branch=True)
+        return result
 
-        if checkout_result.returncode != 0:
+    def _land(self, task_id: str, branch_name: str, target_branch: str) -> MergeResult:
+        """Merge a task branch into the target branch with plumbing.
+
+        Returns:
+            MergeResult; on success, commit is the new target tip.
+        """
+        target_ref = f"refs/heads/{target_branch}"
+        branch_tip = self._git.rev_parse(f"refs/heads/{branch_name}")
+        if branch_tip is None:
             return MergeResult(
-                success=False,
-                message=f"Failed to checkout '{target_branch}': {checkout_result.stderr}",
+                success=False, message=f"Branch '{branch_name}' not found"
             )
 
-        # Attempt fast-forward merge
-        merge_result = subprocess.run(
-            ["git", "merge", "--ff-only", branch_name],
-            cwd=self.repo_path,
-            capture_output=True,
-            text=True,
-        )
+        # Compute the merge on trees and move the target ref only if it still
+        # points at the commit the merge was computed against
+        for _ in range(MERGE_REF_RETRIES):
+            target_tip = self._git.rev_parse(target_ref)
+            if target_tip is None:
+                return MergeResult(
+                    success=False,
+                    message=f"Target branch '{target_branch}' not found",
+                )
 
-        if merge_result.returncode != 0:
-            # Merge failed - worktree preserved for debugging
+            try:
+                merged = self._merge_commit(branch_name, branch_tip, target_branch, target_tip)
+            except GitCommandError as e:
+                return MergeResult(success=False, message=f"Merge failed: {e}")
+            if isinstance(merged, MergeResult):
+                return merged
+
+            try:
+                landed = land_ref(
+                    self.repo_path, target_ref, merged, target_tip,
+                    reason=f"hc merge: {task_id}",
+                )
+            except CheckedOutTargetError as e:
+                return MergeResult(success=False, message=f"Merge failed: {e}")
+            if landed:
+                break
+            logger.info(f"Target '{target_branch}' moved, retrying merge")
+        else:
             return MergeResult(
                 success=False,
-                message=f"Fast-forward merge not possible. "
-                f"Please resolve conflicts manually. "
-                f"Error: {merge_result.stderr}",
+                message=f"Target branch '{target_branch}' kept moving; "
+                f"gave up after {MERGE_REF_RETRIES} attempts",
             )
 
-        # Merge successful - cleanup worktree
-        logger.info(f"Merge successful, cleaning up worktree")
-        self.cleanup(task_id, delete_branch=True)
-
         return MergeResult(
             success=True,
             message=f"Successfully merged '{branch_name}' into '{target_branch}'",
+            commit=merged,
         )
 
+    def _merge_commit(
+        self, branch_name: str, branch_tip: str, target_branch: str, target_tip: str
+    ) -> str | MergeResult:
+        """Compute the commit the target branch should move to.
 
-def find_orphaned_worktrees(repo_path: str) -> list[str]:
-    """Find worktrees that are orphaned (stale directories or missing git entries).
+        Returns:
+            The branch tip for a fast-forward, the target tip if the branch
+            adds nothing, a new merge commit for a clean three-way merge, or
+            a failed MergeResult on conflicts.
+
+        Raises:
+            GitCommandError: If a plumbing command fails.
+        """
+        if is_ancestor(self.repo_path, target_tip, branch_tip):
+            return branch_tip
+
+        merged = merge_tree(self.repo_path, target_tip, branch_tip)
+        if not merged.clean:
+            return MergeResult(
+                success=False,
+                message=f"Merge conflict in: {', '.join(merged.conflicts)}. "
+                f"Please resolve conflicts manually.",
+            )
+
+        target_tree = self._git.object_info(f"{target_tip}^{{tree}}")
+        if target_tree is not None and target_tree[0] == merged.tree:
+            return target_tip
+
+        return commit_tree(
+            self.repo_path,
+            merged.tree,
+            [target_tip, branch_tip],
+            f"Merge branch '{branch_name}' into {target_branch}\n",
+        )
+
+
+def find_orphaned_worktrees(
+    repo_path: str, bases: Optional[list[str]] = None, scan: bool = False
+) -> list[str]:
+    """Find worktrees that are orphaned.
+
+    A registered worktree (see WorktreeRegistry) is orphaned when its
+    directory is gone or its owning process has died; this check costs
+    O(registered worktrees). The directory scan of earlier versions (stale
+    hc_worktree_* directories, or git entries whose directory is missing)
+    also runs if requested or if the repository has no registry yet.
 
     Args:
         repo_path: Path to the main git repository.
+        bases: Directories to scan (default: [DEFAULT_WORKTREE_BASE]); see
+            WorktreeManager.worktree_bases.
+        scan: Also scan the bases and `git worktree list`.
 
     Returns:
         List of paths to orphaned worktree directories.
     """
+    registry = WorktreeRegistry(repo_path)
+    orphaned = [record.path for record in registry.orphans()]
+    if scan or not registry.exists():
+        for path in _scan_orphaned_worktrees(repo_path, bases):
+            if path not in orphaned:
+                orphaned.append(path)
+    return orphaned
+
+
+def _scan_orphaned_worktrees(repo_path: str, bases: Optional[list[str]]) -> list[str]:
+    """Find stale hc_worktree_* directories and git entries without a directory."""
     repo_path = Path(repo_path).resolve()
     orphaned = []
 
     # Get list of registered worktrees from git
-    result = subprocess.run(
-        ["git", "worktree", "list", "--porcelain"],
-        cwd=repo_path,
-        capture_output=True,
-        text=True,
-    )
+    result = run_git(repo_path, ["worktree", "list", "--porcelain"], check=False)
 
     registered_paths = set()
     for line in result.stdout.split("\n"):
         if line.startswith("worktree "):
             registered_paths.add(line.split(" ", 1)[1])
 
-    # Find all hc_worktree_* directories in /tmp
-    tmp_path = Path("/tmp")
-    if tmp_path.exists():
-        for path in tmp_path.glob("hc_worktree_*"):
+    # Find all hc_worktree_* directories in the worktree bases
+    for base in dict.fromkeys(bases or [DEFAULT_WORKTREE_BASE]):
+        base_path = Path(base)
+        if not base_path.exists():
+            continue
+        for path in base_path.glob("hc_worktree_*"):
             if path.is_dir():
                 path_str = str(path.resolve())
                 if path_str not in registered_paths:
@@ -388,46 +828,103 @@ def find_orphaned_worktrees(repo_path: str) -> list[str]:
     return orphaned
 
 
-def cleanup_orphaned_worktrees(repo_path: str) -> int:
+def cleanup_orphaned_worktrees(
+    repo_path: str,
+    preserve: Optional[set[str]] = None,
+    bases: Optional[list[str]] = None,
+    reaper: Optional["WorktreeReaper"] = None,
+    scan: bool = False,
+) -> int:
     """Clean up all orphaned worktrees.
 
+    Registered orphans also lose their task branch and registry entry.
+
     Args:
         repo_path: Path to the main git repository.
+        preserve: Resolved worktree paths to keep even if orphaned
+            (e.g. worktrees of checkpointed tasks awaiting resume).
+        bases: Directories worktrees are placed in (see find_orphaned_worktrees).
+        reaper: Optional WorktreeReaper; orphans are moved aside and deleted
+            in the background instead of one after another.
+        scan: Also scan the bases for unregistered worktree directories.
 
     Returns:
-        Number of worktrees cleaned up.
+        Number of worktrees cleaned up (or queued for deletion).
     """
     repo_path = Path(repo_path).resolve()
-    orphaned = find_orphaned_worktrees(str(repo_path))
+    registry = WorktreeRegistry(str(repo_path))
+    branches = {record.path: record.branch for record in registry.records()}
+    orphaned = find_orphaned_worktrees(str(repo_path), bases=bases, scan=scan)
+    preserve = preserve or set()
 
     count = 0
+    removed = []
     for path in orphaned:
         path_obj = Path(path)
+        if path in preserve:
+            logger.info(f"Preserving worktree for resume: {path}")
+            continue
         if path_obj.exists():
             logger.info(f"Removing orphaned worktree directory: {path}")
-            shutil.rmtree(path_obj, onerror=_rmtree_onerror)
+            if reaper is None or not reaper.reap(path_obj, registered=False):
+                shutil.rmtree(path_obj, onerror=_rmtree_onerror)
             count += 1
+        removed.append(path)
 
     # Prune git worktree metadata
-    subprocess.run(
-        ["git", "worktree", "prune"],
-        cwd=repo_path,
-        capture_output=True,
-    )
+    run_git(repo_path, ["worktree", "prune"], check=False)
     logger.info(f"Ran git worktree prune")
 
+    stale_branches = [
+        f"refs/heads/{branches[path]}" for path in removed if branches.get(path)
+    ]
+    if stale_branches:
+        with GitSession(repo_path) as git:
+            git.delete_refs(stale_branches)
+    registry.remove(*removed)
+
     return count
 
 
-def startup_recovery(repo_path: str) -> None:
+def startup_recovery(
+    repo_path: str,
+    checkpoint_store: Optional["CheckpointStore"] = None,
+    bases: Optional[list[str]] = None,
+    reaper: Optional["WorktreeReaper"] = None,
+    scan: bool = False,
+) -> list["PipelineCheckpoint"]:
     """Perform startup recovery by cleaning orphaned worktrees.
 
     Called when the orchestrator starts to clean up any orphaned
-    worktrees from previous crashed sessions.
+    worktrees from previous crashed sessions (registered worktrees whose
+    owner died, see find_orphaned_worktrees). Worktrees that belong to a
+    checkpointed task are kept so the task can be resumed.
 
     Args:
         repo_path: Path to the main git repository.
+        checkpoint_store: Optional CheckpointStore from TaskPipeline.
+        bases: Directories worktrees are placed in (default:
+            [DEFAULT_WORKTREE_BASE]); see WorktreeManager.worktree_bases.
+        reaper: Optional WorktreeReaper to delete orphans in the background.
+        scan: Also scan the bases for unregistered worktree directories.
+
+    Returns:
+        Checkpoints whose worktree survived and can be resumed.
     """
-    count = cleanup_orphaned_worktrees(repo_path)
+    resumable = []
+    preserve: set[str] = set()
+    if checkpoint_store is not None:
+        for checkpoint in checkpoint_store.list():
+            if checkpoint.worktree_path and Path(checkpoint.worktree_path).exists():
+                resumable.append(checkpoint)
+                preserve.add(str(Path(checkpoint.worktree_path).resolve()))
+
+    count = cleanup_orphaned_worktrees(
+        repo_path, preserve=preserve, bases=bases, reaper=reaper, scan=scan
+    )
     if count > 0:
         logger.info(f"Recovered {count} orphaned worktrees")
+    if resumable:
+        logger.info(f"Found {len(resumable)} checkpointed tasks to resume")
+
+    return resumable
@@ -0,0 +1,302 @@
+"""Pre-warmed pool of reusable git worktrees.
+
+This module provides the WorktreePool class which keeps a number of idle
+worktrees checked out at the target head, so that WorktreeManager.create
+does not pay for a full `git worktree add` (and cleanup for a full
+`git worktree remove`) on every task.
+
+Lifecycle of a pooled worktree:
+- warm: `git worktree add --detach` at the base ref (background thread)
+- acquire: `git checkout -f -B <branch> <base>` switches the idle worktree
+  to the task branch and resets it to the current target head; only files
+  that changed since the worktree was last used are rewritten
+- release: HEAD is detached in place (no checkout), so the task branch can
+  be deleted immediately, and the worktree is queued for recycling
+- recycle: `checkout -f --detach <base>` + `clean -ffdx` in the background,
+  after which the worktree is idle again
+
+A worktree that fails to recycle is removed and replaced with a new one.
+
+Pool worktrees live at {worktree_base}/hc_worktree_pool_{n}.
+
+Example:
+    pool = WorktreePool("/path/to/repo", size=4)
+    pool.start()
+    manager = WorktreeManager("/path/to/repo", pool=pool)
+    ...
+    pool.close()
+"""
+
+import logging
+import queue
+import shutil
+import threading
+from pathlib import Path
+from typing import Optional
+
+from orchestrator.disk_check import DiskBudget, check_disk_space
+from orchestrator.git_plumbing import GitCommandError, run_git
+from orchestrator.worktree import DEFAULT_WORKTREE_BASE
+
+logger = logging.getLogger(__name__)
+
+POOL_PREFIX = "hc_worktree_pool_"
+
+# checkout errors caused by the requested branch or base ref rather than
+# by the worktree; the worktree stays usable for other branches (run_git
+# runs git in the C locale, so these messages are never translated)
+_BRANCH_ERRORS = (
+    "already checked out at",
+    "already used by worktree at",
+    "cannot force update the branch",
+    "is not a valid branch name",
+    "is not a commit",
+)
+
+
+class WorktreePool:
+    """Keeps idle worktrees ready for reuse across tasks.
+
+    Attributes:
+        repo_path: Path to the main git repository.
+        size: Number of idle worktrees to keep ready. Released worktrees are
+            kept too, so the pool holds at most size + peak concurrent tasks.
+        base_ref: Ref that idle and acquired worktrees are reset to.
+        worktree_base: Directory holding the pool worktrees.
+        disk_threshold: Maximum disk usage percentage for adding worktrees.
+        disk_budget: Optional DiskBudget shared with WorktreeManager; new
+            pool worktrees must fit in it alongside reserved task worktrees.
+    """
+
+    def __init__(
+        self,
+        repo_path: str,
+        size: int = 2,
+        base_ref: str = "main",
+        worktree_base: str = DEFAULT_WORKTREE_BASE,
+        disk_threshold: float = 80.0,
+        disk_budget: Optional[DiskBudget] = None,
+    ) -> None:
+        """Initialize WorktreePool.
+
+        Args:
+            repo_path: Path to the main git repository.
+            size: Number of idle worktrees to keep ready.
+            base_ref: Ref that worktrees are reset to (e.g. the target branch).
+            worktree_base: Directory holding the pool worktrees.
+            disk_threshold: Maximum disk usage percentage for adding worktrees.
+            disk_budget: Optional DiskBudget to check new worktrees against.
+        """
+        self.repo_path = Path(repo_path).resolve()
+        self.size = size
+        self.base_ref = base_ref
+        self.worktree_base = Path(worktree_base)
+        self.disk_threshold = disk_threshold
+        self.disk_budget = disk_budget
+
+        self._lock = threading.Lock()
+        self._idle: list[Path] = []
+        self._owned: set[Path] = set()
+        self._recycle: queue.Queue[Optional[Path]] = queue.Queue()
+        self._recycling = 0
+        self._next_index = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @property
+    def idle(self) -> int:
+        """Number of worktrees ready to be acquired."""
+        with self._lock:
+            return len(self._idle)
+
+    def owns(self, path: str | Path) -> bool:
+        """Check whether a worktree path belongs to the pool."""
+        with self._lock:
+            return Path(path) in self._owned
+
+    def start(self, preserve: Optional[set[str]] = None) -> None:
+        """Adopt leftover pool worktrees and start the background recycler.
+
+        Pool worktrees left behind by a previous run (still registered with
+        git) are recycled instead of being created again.
+
+        Args:
+            preserve: Resolved worktree paths not to adopt (e.g. worktrees
+                of checkpointed tasks awaiting resume).
+        """
+        preserve = preserve or set()
+        listing = run_git(self.repo_path, ["worktree", "list", "--porcelain"], check=False)
+        for line in listing.stdout.splitlines():
+            if not line.startswith("worktree "):
+                continue
+            path = Path(line.split(" ", 1)[1])
+            if (
+                path.name.startswith(POOL_PREFIX)
+                and path.parent == self.worktree_base.resolve()
+                and path.exists()
+                and str(path) not in preserve
+            ):
+                logger.info(f"Adopting pooled worktree {path}")
+                with self._lock:
+                    self._owned.add(path)
+                self._enqueue_recycle(path)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._recycler, name="hc-worktree-pool", daemon=True
+        )
+        self._thread.start()
+
+    def acquire(self, branch_name: str) -> Optional[Path]:
+        """Take an idle worktree and switch it to a new task branch.
+
+        Args:
+            branch_name: Branch to create (or reset) at the base ref.
+
+        Returns:
+            Path to the worktree, or None if no idle worktree is available
+            or the branch cannot be checked out (the caller should create
+            a worktree the regular way, which reports the error).
+        """
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                path = self._idle.pop(0)
+            self._recycle.put(None)  # wake the recycler to top the pool up
+
+            result = run_git(
+                path, ["checkout", "--quiet", "-f", "-B", branch_name, self.base_ref],
+                check=False,
+            )
+            if result.returncode == 0:
+                logger.info(f"Acquired pooled worktree {path} for '{branch_name}'")
+                return path
+
+            if any(error in result.stderr for error in _BRANCH_ERRORS):
+                logger.warning(
+                    f"Cannot switch pooled worktree to '{branch_name}': "
+                    f"{result.stderr.strip()}"
+                )
+                with self._lock:
+                    self._idle.append(path)
+                return None
+
+            logger.warning(f"Discarding pooled worktree {path}: {result.stderr.strip()}")
+            self._discard(path)
+
+    def release(self, path: str | Path) -> None:
+        """Return a worktree to the pool.
+
+        HEAD is detached in place so the task branch can be deleted right
+        away; resetting the files happens in the background.
+
+        Args:
+            path: Worktree path previously returned by acquire().
+        """
+        path = Path(path)
+        run_git(path, ["update-ref", "--no-deref", "HEAD", "HEAD"], check=False)
+        self._enqueue_recycle(path)
+
+    def close(self) -> None:
+        """Stop the recycler and remove all pool worktrees."""
+        self._stopped.set()
+        self._recycle.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+        with self._lock:
+            paths = list(self._owned)
+            self._owned.clear()
+            self._idle.clear()
+        for path in paths:
+            self._remove(path)
+        run_git(self.repo_path, ["worktree", "prune"], check=False)
+
+    def _enqueue_recycle(self, path: Path) -> None:
+        """Queue a worktree for recycling."""
+        with self._lock:
+            self._recycling += 1
+        self._recycle.put(path)
+
+    def _recycler(self) -> None:
+        """Background loop: recycle released worktrees, keep the pool topped up."""
+        while not self._stopped.is_set():
+            self._top_up()
+            try:
+                path = self._recycle.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if path is None:
+                continue
+
+            try:
+                self._reset(path)
+                with self._lock:
+                    self._idle.append(path)
+            except GitCommandError as e:
+                logger.warning(f"Recycling {path} failed, replacing it: {e}")
+                self._discard(path)
+            finally:
+                with self._lock:
+                    self._recycling -= 1
+
+    def _top_up(self) -> None:
+        """Create worktrees until `size` are idle or being recycled."""
+        while not self._stopped.is_set():
+            with self._lock:
+                if len(self._idle) + self._recycling >= self.size:
+                    return
+            try:
+                path = self._add()
+            except Exception as e:
+                logger.warning(f"Could not add pooled worktree: {e}")
+                return
+            with self._lock:
+                self._idle.append(path)
+
+    def _add(self) -> Path:
+        """Create a new detached pool worktree at the base ref."""
+        if self.disk_budget is not None:
+            self.disk_budget.check(
+                str(self.worktree_base),
+                self.disk_budget.estimate(str(self.repo_path), self.base_ref),
+            )
+        else:
+            check_disk_space(str(self.worktree_base), threshold=self.disk_threshold)
+        with self._lock:
+            while True:
+                path = self.worktree_base / f"{POOL_PREFIX}{self._next_index}"
+                self._next_index += 1
+                if not path.exists():
+                    break
+        run_git(
+            self.repo_path,
+            ["worktree", "add", "--quiet", "--detach", str(path), self.base_ref],
+        )
+        path = path.resolve()
+        with self._lock:
+            self._owned.add(path)
+        logger.debug(f"Added pooled worktree {path}")
+        return path
+
+    def _reset(self, path: Path) -> None:
+        """Reset a worktree to the base ref and drop untracked files."""
+        run_git(path, ["checkout", "--quiet", "-f", "--detach", self.base_ref])
+        run_git(path, ["clean", "-ffdxq"])
+
+    def _discard(self, path: Path) -> None:
+        """Remove a broken worktree from the pool."""
+        with self._lock:
+            self._owned.discard(path)
+        self._remove(path)
+
+    def _remove(self, path: Path) -> None:
+        """Remove a worktree directory and its git registration."""
+        result = run_git(
+            self.repo_path, ["worktree", "remove", "--force", str(path)], check=False
+        )
+        if result.returncode != 0 and path.exists():
+            shutil.rmtree(path, ignore_errors=True)
+            run_git(self.repo_path, ["worktree", "prune"], check=False)
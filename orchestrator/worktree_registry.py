@@ -0,0 +1,249 @@
+"""Registry of the worktrees created for a repository.
+
+This module provides the WorktreeRecord dataclass and the WorktreeRegistry
+which keeps one small JSON file in the repository's git common directory
+(hc_worktrees.json) listing every worktree WorktreeManager created: path,
+task, branch, owning process and creation time.
+
+Startup recovery reads the registry instead of globbing worktree
+directories and parsing `git worktree list`, so it costs O(registered
+worktrees) and never picks up another repository's worktrees. A worktree
+is orphaned when its directory is gone or its owner is dead: the owner
+ran on this host and its pid no longer exists (or now belongs to a
+different process, detected through the process start time).
+
+Writes are serialized with a lock file and atomic (temp file +
+os.replace), so concurrent managers on the same repository do not lose
+each other's records.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import socket
+import tempfile
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from orchestrator.git_plumbing import run_git
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_FILENAME = "hc_worktrees.json"
+
+
+def process_start_time(pid: int) -> Optional[int]:
+    """Start time of a process in clock ticks since boot (Linux /proc only).
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        Start time, or None if unknown.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # Fields after the parenthesised command name; starttime is field 22
+    fields = stat.rsplit(")", 1)[-1].split()
+    try:
+        return int(fields[19])
+    except (IndexError, ValueError):
+        return None
+
+
+def process_alive(pid: int, start_time: Optional[int] = None) -> bool:
+    """Check whether a process exists (and is the same process as recorded).
+
+    Args:
+        pid: Process ID.
+        start_time: Recorded process_start_time(), to detect pid reuse.
+
+    Returns:
+        True if the process is alive.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    if start_time is not None:
+        current = process_start_time(pid)
+        if current is not None and current != start_time:
+            return False
+    return True
+
+
+@dataclass
+class WorktreeRecord:
+    """One worktree created by a WorktreeManager.
+
+    Attributes:
+        path: Absolute worktree path.
+        task_id: Task the worktree belongs to.
+        branch: Branch checked out in the worktree.
+        pid: Process that owns the worktree.
+        host: Host name of the owning process.
+        pid_start: Start time of the owning process (see process_start_time).
+        created_at: ISO timestamp of creation.
+    """
+
+    path: str
+    task_id: str
+    branch: str
+    pid: int = field(default_factory=os.getpid)
+    host: str = field(default_factory=socket.gethostname)
+    pid_start: Optional[int] = field(default_factory=lambda: process_start_time(os.getpid()))
+    created_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat()
+    )
+
+    def owner_alive(self) -> bool:
+        """Whether the owning process is still running.
+
+        Owners on other hosts cannot be checked and count as alive.
+        """
+        if self.host != socket.gethostname():
+            return True
+        return process_alive(self.pid, self.pid_start)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "WorktreeRecord":
+        """Create a record from a dictionary."""
+        return cls(**data)
+
+
+class WorktreeRegistry:
+    """JSON registry of a repository's task worktrees.
+
+    Example:
+        registry = WorktreeRegistry("/path/to/repo")
+        registry.add(WorktreeRecord(path="/tmp/hc_worktree_T001", task_id="T001",
+                                    branch="feature/T001_attempt_1"))
+        for record in registry.orphans():
+            ...
+    """
+
+    def __init__(self, repo_path: str) -> None:
+        """Initialize WorktreeRegistry.
+
+        Args:
+            repo_path: Path to the main git repository (or any worktree of it).
+        """
+        repo_path = Path(repo_path).resolve()
+        common_dir = run_git(repo_path, ["rev-parse", "--git-common-dir"]).stdout.strip()
+        self.path = (repo_path / common_dir).resolve() / REGISTRY_FILENAME
+        self._lock_path = self.path.with_suffix(".lock")
+
+    def exists(self) -> bool:
+        """Whether the registry file has been written yet."""
+        return self.path.exists()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the registry lock."""
+        with open(self._lock_path, "w") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> dict[str, WorktreeRecord]:
+        """Load records by path (empty if missing or unreadable)."""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                entry["path"]: WorktreeRecord.from_dict(entry)
+                for entry in data.get("worktrees", [])
+            }
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable worktree registry {self.path}: {e}")
+            return {}
+
+    def _write(self, records: dict[str, WorktreeRecord]) -> None:
+        """Replace the registry file atomically."""
+        with tempfile.NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            dir=self.path.parent,
+            suffix=".tmp",
+            delete=False,
+        ) as tmp_file:
+            json.dump(
+                {"worktrees": [r.to_dict() for r in records.values()]}, tmp_file, indent=2
+            )
+            tmp_path = tmp_file.name
+        os.replace(tmp_path, self.path)
+
+    def add(self, record: WorktreeRecord) -> None:
+        """Register a worktree (replacing any record for the same path).
+
+        Args:
+            record: Record to store.
+        """
+        with self._locked():
+            records = self._read()
+            records[record.path] = record
+            self._write(records)
+
+    def remove(self, *paths: str) -> None:
+        """Forget worktrees (idempotent).
+
+        Args:
+            paths: Worktree paths to remove from the registry.
+        """
+        with self._locked():
+            records = self._read()
+            dropped = [records.pop(str(path), None) for path in paths]
+            if any(dropped):
+                self._write(records)
+
+    def claim(self, path: str, task_id: str) -> None:
+        """Make the current process the owner of a worktree.
+
+        Used when a restarted orchestrator adopts a task's worktree; a
+        worktree missing from the registry is added.
+
+        Args:
+            path: Worktree path.
+            task_id: Task the worktree belongs to.
+        """
+        with self._locked():
+            records = self._read()
+            previous = records.get(str(path))
+            records[str(path)] = WorktreeRecord(
+                path=str(path),
+                task_id=task_id,
+                branch=previous.branch if previous else "",
+                created_at=previous.created_at if previous else datetime.now(
+                    timezone.utc
+                ).isoformat(),
+            )
+            self._write(records)
+
+    def records(self) -> list[WorktreeRecord]:
+        """All registered worktrees."""
+        with self._locked():
+            return list(self._read().values())
+
+    def orphans(self) -> list[WorktreeRecord]:
+        """Registered worktrees whose directory is gone or whose owner is dead."""
+        return [
+            record
+            for record in self.records()
+            if not Path(record.path).exists() or not record.owner_alive()
+        ]